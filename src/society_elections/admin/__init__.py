@@ -1,5 +1,8 @@
 from .candidate import CandidateAdmin
 from .election import ElectionAdmin
 from .electionposition import ElectionPositionAdmin
+from .electionresults import ElectionResultsAdmin
+from .job import JobAdmin
+from .outboundemail import OutboundEmailAdmin
 from .position import PositionAdmin
 from .voter import RegisteredVoterAdmin
@@ -1,14 +1,17 @@
 from logging import getLogger
 
-from django.contrib import admin, messages
+from django.contrib import admin
+from django.db.models import Sum
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 from django.utils.decorators import method_decorator
 from django.utils.translation import ngettext
 
 from ..forms import CandidateAdminForm
+from ..jobs import queue_job
 from ..models import Candidate
 from .decorators import log_model_admin_action
+from .job import message_job_queued
 
 logger = getLogger(__name__)
 
@@ -27,11 +30,14 @@ class CandidateAdmin(admin.ModelAdmin):
 
     Attributes:
         list_display (tuple): What fields are shown on the tables
+        list_select_related (tuple): Relations joined to show the table in a 
+            single query
         form (django.forms.ModelForm): Which form to use for the model
         actions (list): Actions registered on the admin interface
     """
     form = CandidateAdminForm
     list_display = ('__str__', 'position_election', 'email_verified', 'votes')
+    list_select_related = ('position__position', 'position__election')
     actions = ['resend_verification_email_action']
 
     @admin.action(description='Resend verification emails')
@@ -41,21 +47,21 @@ class CandidateAdmin(admin.ModelAdmin):
     def resend_verification_email_action(
         self, request: HttpRequest, queryset: QuerySet
     ):
-        """Regenerate UUID of selected candidates and resend email
+        """Queue a job regenerating the UUIDs of the selected candidates and
+        resending their verification emails
 
         Args:
             request (HttpRequest): Request to server to perform action
             queryset (QuerySet): Set of objects to perform action on
         """
-        candidate: Candidate
-        for candidate in queryset:
-            candidate.email_uuid = None
-            candidate.save() # Regenerates UUID
-            candidate.send_verification_email()
-        messages.add_message(request, messages.SUCCESS,
-            f'Successfully resent {queryset.count()} verification email'+
-            ngettext('', 's', queryset.count())
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        job = queue_job(
+            'resend_candidate_verification',
+            f'Resend verification emails to {len(pks)} candidate' +
+            ngettext('', 's', len(pks)),
+            {'pks': pks}, len(pks), request.user
         )
+        message_job_queued(request, job)
 
 
     @admin.display(description='Election')
@@ -63,6 +69,13 @@ class CandidateAdmin(admin.ModelAdmin):
         return obj.position.election
 
 
-    @admin.display(description='Votes')
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        """Annotate the candidates with their vote count from the tallies"""
+        return super().get_queryset(request).annotate(
+            vote_count=Sum('tally__votes')
+        )
+
+
+    @admin.display(description='Votes', ordering='vote_count')
     def votes(self, obj: Candidate):
-        return obj.votes.count()
+        return obj.vote_count or 0
@@ -1,17 +1,20 @@
-import csv
-from io import StringIO
 from logging import getLogger
 
 from django.contrib import admin, messages
+from django.db import transaction
 from django.db.models.query import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.translation import ngettext
 
+from ..caching import invalidate_latest_election
 from ..forms import ElectionForm
-from ..models import Election, ElectionPosition, Vote
+from ..jobs import queue_job
+from ..models import Election, Vote, VoteTally
+from ..results import calculate_results, freeze_results, send_result_emails
 from .decorators import log_model_admin_action
+from .job import message_job_queued
 
 logger = getLogger(__name__)
 
@@ -36,7 +39,10 @@ class ElectionAdmin(admin.ModelAdmin):
         'admin_title', 'nominations_start', 'voting_start', 'ended_at'
     )
     form = ElectionForm
-    actions = ['end_election', 'download_csv_of_votes']
+    actions = [
+        'end_election', 'calculate_results_action', 'rebuild_tallies',
+        'export_votes_action'
+    ]
 
 
     @admin.action(description='End election')
@@ -48,6 +54,9 @@ class ElectionAdmin(admin.ModelAdmin):
     ):
         """Marks a given set of elections as finished
 
+        The results of each election are counted and frozen, so that the 
+        results page never needs to count the votes.
+
         Args:
             request (HttpRequest): Request from staff user
             queryset (QuerySet): Queryset of elections to finish
@@ -56,53 +65,105 @@ class ElectionAdmin(admin.ModelAdmin):
             ended_at=timezone.now(),
             ended_by=request.user
         )
+        # update() does not send signals. Invalidated once the change
+        # commits, like the signals, so that a concurrent request cannot
+        # cache the election as it was before
+        transaction.on_commit(invalidate_latest_election)
+        election: Election
+        for election in queryset:
+            freeze_results(election)
         messages.add_message(request, messages.SUCCESS,
             f'Successfully ended {queryset.count()} election'+
             ngettext('', 's', queryset.count())
         )
 
 
-    @admin.action(description='Download CSV of votes')
+    @admin.action(description='Calculate results')
     @method_decorator(log_model_admin_action(
-        'download csv of votes', Election, logger
+        'calculate results', Election, logger
     ))
-    def download_csv_of_votes(
+    def calculate_results_action(
         self, request: HttpRequest, queryset: QuerySet
     ):
-        """Download a CSV of all votes cast in the election
+        """Count the votes of the elections and mark successful candidates
+
+        Results are only calculated once voting has finished. Candidates are 
+        emailed their results if configured in the election.
 
         Args:
-            request (HttpRequest): Request from a staff user
-            queryset (QuerySet): Queryset of the elections to fetch votes for
+            request (HttpRequest): Request from staff user
+            queryset (QuerySet): Queryset of elections to calculate results for
+        """
+        election: Election
+        for election in queryset:
+            if election.current_period not in (
+                Election.POSTVOTING, Election.FINISHED
+            ):
+                messages.add_message(request, messages.WARNING,
+                    f'Voting has not yet finished in "{election}"'
+                )
+                continue
+            results = calculate_results(election)
+            emails_sent = send_result_emails(election, results)
+            ties = sum(len(result.tied) for result in results)
+            messages.add_message(request, messages.SUCCESS,
+                f'Calculated results for "{election}", queued {emails_sent} '
+                'result email' + ngettext('', 's', emails_sent)
+            )
+            if ties:
+                messages.add_message(request, messages.WARNING,
+                    f'{ties} candidates are tied in "{election}", these must '
+                    'be resolved manually'
+                )
+
+
+    @admin.action(description='Rebuild vote tallies')
+    @method_decorator(log_model_admin_action(
+        'rebuild vote tallies', Election, logger
+    ))
+    def rebuild_tallies(
+        self, request: HttpRequest, queryset: QuerySet
+    ):
+        """Recount the vote tallies of the elections from their votes
+
+        Args:
+            request (HttpRequest): Request from staff user
+            queryset (QuerySet): Queryset of elections to rebuild tallies for
         """
-        f = StringIO()
-        writer = csv.writer(f)
-        writer.writerow([
-            'voter_id', 'election_id', 'election_admin_title', 'anonymous',
-            'position', 'candidate', 'candidate_id',
-            'vote_cast_at', 'vote_last_modified'
-        ])
         election: Election
-        position: ElectionPosition
-        vote: Vote
         for election in queryset:
-            for position in election.positions.all():
-                for vote in position.votes.all():
-                    writer.writerow([
-                        vote.voter_pk,
-                        str(election.pk),
-                        election.admin_title, 
-                        election.anonymous,
-                        position.position.title,
-                        vote.candidate.full_name,
-                        str(vote.candidate.pk),
-                        vote.vote_cast_at.isoformat(),
-                        vote.vote_last_modified_at.isoformat()
-                    ])
-        f.seek(0)
-        response = HttpResponse(f, content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=votes.csv'
-        return response
+            VoteTally.rebuild(election)
+        messages.add_message(request, messages.SUCCESS,
+            f'Successfully rebuilt tallies for {queryset.count()} election'+
+            ngettext('', 's', queryset.count())
+        )
+
+
+    @admin.action(description='Export votes as a gzipped CSV')
+    @method_decorator(log_model_admin_action(
+        'export votes', Election, logger
+    ))
+    def export_votes_action(
+        self, request: HttpRequest, queryset: QuerySet
+    ):
+        """Queue a job writing a gzip compressed CSV of all votes cast in the
+        elections, which can be downloaded from the job once it succeeds
+
+        Args:
+            request (HttpRequest): Request from a staff user
+            queryset (QuerySet): Queryset of the elections to fetch votes for
+        """
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        job = queue_job(
+            'export_votes',
+            'Export votes of ' + ', '.join(
+                str(election) for election in queryset
+            ),
+            {'elections': pks},
+            Vote.objects.filter(election__in=pks).count(),
+            request.user
+        )
+        message_job_queued(request, job)
 
 
     def save_model(self, request: HttpRequest, obj: Election, *args, **kwargs):
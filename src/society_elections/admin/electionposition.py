@@ -1,6 +1,8 @@
 from logging import getLogger
 
 from django.contrib import admin
+from django.db.models import Count
+from django.db.models.query import QuerySet
 from django.forms import ModelForm
 from django.http.request import HttpRequest
 from django.shortcuts import get_object_or_404
@@ -25,11 +27,34 @@ logger = getLogger(__name__)
 class ElectionPositionAdmin(admin.ModelAdmin):
     """Defines how the ElectionPosition model is presented on the admin 
     interface
+
+    Attributes:
+        list_display (tuple): What fields are shown on the tables
+        list_select_related (tuple): Relations joined to show the table in a 
+            single query
     """
+    list_display = (
+        '__str__', 'election', 'positions_available', 'voting_system',
+        'candidates'
+    )
+    list_select_related = ('position', 'election')
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        """Annotate the positions with their number of candidates"""
+        return super().get_queryset(request).annotate(
+            candidate_count=Count('candidate')
+        )
+
+
+    @admin.display(description='Candidates', ordering='candidate_count')
+    def candidates(self, obj: ElectionPosition):
+        return obj.candidate_count
+
+
     def save_ron(self, position: ElectionPosition):
         try:
             existing_ron = get_object_or_404(
-                Candidate, position=position, email="RON@example.com"
+                Candidate, position=position, email=Candidate.RON_EMAIL
             )
         except Http404:
             if position.allow_ron:
@@ -37,7 +62,7 @@ class ElectionPositionAdmin(admin.ModelAdmin):
                 new_ron = Candidate(
                     position=position,
                     full_name='RON',
-                    email='RON@example.com',
+                    email=Candidate.RON_EMAIL,
                     manifesto='Re-open nominations',
                     email_verified=True
                 )
@@ -52,7 +77,7 @@ class ElectionPositionAdmin(admin.ModelAdmin):
     def save_abstain(self, position: ElectionPosition):
         try:
             existing_abstain = get_object_or_404(
-                Candidate, position=position, email="abstain@example.com"
+                Candidate, position=position, email=Candidate.ABSTAIN_EMAIL
             )
         except Http404:
             if position.allow_abstain:
@@ -60,7 +85,7 @@ class ElectionPositionAdmin(admin.ModelAdmin):
                 new_abstain = Candidate(
                     position=position,
                     full_name='Abstain',
-                    email='abstain@example.com',
+                    email=Candidate.ABSTAIN_EMAIL,
                     manifesto='Abstain from voting for this position',
                     email_verified=True
                 )
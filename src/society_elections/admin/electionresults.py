@@ -0,0 +1,42 @@
+from logging import getLogger
+
+from django.contrib import admin
+from django.http import HttpRequest
+from django.utils.decorators import method_decorator
+
+from ..models import ElectionResults
+from .decorators import log_model_admin_action
+
+logger = getLogger(__name__)
+
+
+@admin.register(ElectionResults)
+@method_decorator(
+    log_model_admin_action('delete', ElectionResults, logger),
+    name='delete_model'
+)
+class ElectionResultsAdmin(admin.ModelAdmin):
+    """Class defining how frozen results appear on the admin interface
+
+    Results are read-only, as they are frozen when an election is ended. They
+    may be deleted, so that the election can be ended and counted again.
+
+    Attributes:
+        list_display (tuple): What fields are shown on the tables
+        list_select_related (tuple): Relations joined to show the table in a
+            single query
+    """
+    list_display = (
+        '__str__', 'voters', 'voters_voted', 'votes_cast', 'created_at'
+    )
+    list_select_related = ('election',)
+    readonly_fields = (
+        'election', 'results', 'voters', 'voters_voted', 'votes_cast',
+        'version', 'created_at'
+    )
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
@@ -0,0 +1,122 @@
+from logging import getLogger
+
+from django.contrib import admin, messages
+from django.db.models.query import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.decorators import method_decorator
+from django.utils.html import format_html
+from django.utils.translation import ngettext
+
+from ..jobs import iter_output, resume_jobs
+from ..models import Job
+from .decorators import log_model_admin_action
+
+logger = getLogger(__name__)
+
+
+def message_job_queued(request: HttpRequest, job: Job) -> None:
+    """Tell a staff user the job they queued will be run in the background
+
+    Args:
+        request (HttpRequest): Request from the staff user
+        job (Job): Job queued
+    """
+    url = reverse(
+        f'admin:{Job._meta.app_label}_{Job._meta.model_name}_change',
+        args=[job.pk]
+    )
+    messages.add_message(request, messages.SUCCESS, format_html(
+        'Queued <a href="{}">{}</a>, which will be run by the run_jobs command',
+        url, job.description
+    ))
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Class defining how background jobs appear on the admin interface
+
+    Jobs are read-only, as they are queued by the actions of other models.
+    Jobs which produce a file link to download it once they have succeeded.
+
+    Attributes:
+        list_display (tuple): What fields are shown on the tables
+        list_filter (tuple): Fields the jobs can be filtered by
+        actions (list): Actions registered on the admin interface
+    """
+    list_display = (
+        'description', 'status', 'progress_display', 'created_by',
+        'created_at', 'finished_at', 'download'
+    )
+    list_filter = ('status', 'kind')
+    list_select_related = ('created_by',)
+    readonly_fields = (
+        'kind', 'description', 'arguments', 'status', 'total', 'processed',
+        'cursor', 'error', 'created_by', 'created_at', 'started_at',
+        'heartbeat_at', 'finished_at', 'download'
+    )
+    actions = ['resume_action']
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<path:object_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name=f'{Job._meta.app_label}_{Job._meta.model_name}_download'
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description='Progress')
+    def progress_display(self, obj: Job) -> str:
+        return f'{obj.processed}/{obj.total} ({obj.progress:.0%})'
+
+    @admin.display(description='Result')
+    def download(self, obj: Job) -> str:
+        if obj.kind != 'export_votes' or obj.status != Job.SUCCEEDED:
+            return '-'
+        return format_html('<a href="{}">Download</a>', reverse(
+            f'admin:{Job._meta.app_label}_{Job._meta.model_name}_download',
+            args=[obj.pk]
+        ))
+
+    def download_view(self, request: HttpRequest, object_id: str):
+        """Stream the file produced by a job which has succeeded
+
+        Args:
+            request (HttpRequest): Request from a staff user
+            object_id (str): Primary key of the job
+        """
+        if not self.has_view_permission(request):
+            return self.admin_site.login(request)
+        job = get_object_or_404(
+            Job, pk=object_id, kind='export_votes', status=Job.SUCCEEDED
+        )
+        response = StreamingHttpResponse(
+            iter_output(job), content_type='application/gzip'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename=votes-{job.pk}.csv.gz'
+        )
+        return response
+
+    @admin.action(description='Resume failed jobs')
+    @method_decorator(log_model_admin_action('resume', Job, logger))
+    def resume_action(self, request: HttpRequest, queryset: QuerySet):
+        """Queue failed jobs to run again from where they stopped
+
+        Args:
+            request (HttpRequest): Request to server to perform action
+            queryset (QuerySet): Set of objects to perform action on
+        """
+        resumed = resume_jobs(queryset)
+        messages.add_message(request, messages.SUCCESS,
+            f'Queued {resumed} job' + ngettext('', 's', resumed) +
+            ' to be resumed'
+        )
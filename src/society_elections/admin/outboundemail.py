@@ -0,0 +1,78 @@
+from logging import getLogger
+
+from django.contrib import admin, messages
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.translation import ngettext
+
+from ..models import OutboundEmail
+from .decorators import log_model_admin_action
+
+logger = getLogger(__name__)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Class defining how queued emails appear on the admin interface
+
+    Emails are read-only, as they are only created by the package itself.
+    The bodies of sensitive emails are never shown, as anonymous voters'
+    passwords would let staff link voters to their votes.
+
+    Attributes:
+        list_display (tuple): What fields are shown on the tables
+        list_filter (tuple): Fields the emails can be filtered by
+        actions (list): Actions registered on the admin interface
+    """
+    list_display = (
+        'subject', 'recipient', 'status', 'attempts', 'created_at', 'sent_at'
+    )
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+    readonly_fields = (
+        'recipient', 'subject', 'message', 'html_message', 'from_email',
+        'sensitive', 'status', 'attempts', 'next_attempt_at', 'last_error',
+        'created_at', 'sent_at'
+    )
+    actions = ['retry_action']
+
+    def get_readonly_fields(self, request: HttpRequest, obj=None):
+        if obj is not None and obj.sensitive:
+            return tuple(
+                field for field in self.readonly_fields
+                if field not in ('message', 'html_message')
+            )
+        return self.readonly_fields
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
+
+    @admin.action(description='Retry sending failed emails')
+    @method_decorator(log_model_admin_action(
+        'retry', OutboundEmail, logger
+    ))
+    def retry_action(self, request: HttpRequest, queryset: QuerySet):
+        """Queue failed emails to be sent again
+
+        Sensitive emails are erased once they fail, so cannot be sent again.
+
+        Args:
+            request (HttpRequest): Request to server to perform action
+            queryset (QuerySet): Set of objects to perform action on
+        """
+        retried = queryset.filter(
+            status=OutboundEmail.FAILED, sensitive=False
+        ).update(
+            status=OutboundEmail.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now()
+        )
+        messages.add_message(request, messages.SUCCESS,
+            f'Queued {retried} email' + ngettext('', 's', retried) +
+            ' to be sent again'
+        )
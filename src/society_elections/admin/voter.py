@@ -1,13 +1,15 @@
 from logging import getLogger
 
-from django.contrib import admin, messages
+from django.contrib import admin
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 from django.utils.decorators import method_decorator
 from django.utils.translation import ngettext
 
+from ..jobs import queue_job
 from ..models import RegisteredVoter
 from .decorators import log_model_admin_action
+from .job import message_job_queued
 
 logger = getLogger(__name__)
 
@@ -25,10 +27,13 @@ class RegisteredVoterAdmin(admin.ModelAdmin):
 
     Attributes:
         list_display (tuple): How registered voters are grouped by date
+        list_select_related (tuple): Relations joined to show the table in a 
+            single query
         actions (list): Actions available to perform on the models in the admin 
             interface
     """
     list_display = ('email', 'election', 'verified', 'registered_at')
+    list_select_related = ('election',)
     actions = ['resend_verification_email_action']
 
     @admin.action(description='Resend verification emails')
@@ -38,16 +43,19 @@ class RegisteredVoterAdmin(admin.ModelAdmin):
     def resend_verification_email_action(
         self, request: HttpRequest,  queryset: QuerySet
     ):
-        """Set request-specific data on the object before saving to database
+        """Queue a job resending verification emails to the selected voters
 
         Args:
             request (HttpRequest): Request made when saving model
-            obj (Election): Election object to save in database
+            queryset (QuerySet): Set of voters to email
         """
-        voter: RegisteredVoter
-        for voter in queryset:
-            voter.send_verification_email()
-        messages.add_message(request, messages.SUCCESS,
-            f'Successfully sent {queryset.count()} verification email'+
-            ngettext('', 's', queryset.count())
+        pks = [str(pk) for pk in queryset.order_by('pk').values_list(
+            'pk', flat=True
+        )]
+        job = queue_job(
+            'resend_voter_verification',
+            f'Resend verification emails to {len(pks)} voter' +
+            ngettext('', 's', len(pks)),
+            {'pks': pks}, len(pks), request.user
         )
+        message_job_queued(request, job)
@@ -6,4 +6,51 @@ TEMPLATE_PREFIX = getattr(
 )
 ROOT_URL = getattr(
     settings, 'SOCIETY_ELECTIONS_ROOT_URL', 'http://localhost:8000'
-)
\ No newline at end of file
+)
+TALLY_SHARDS = getattr(settings, 'SOCIETY_ELECTIONS_TALLY_SHARDS', 8)
+CACHE_ALIAS = getattr(settings, 'SOCIETY_ELECTIONS_CACHE', 'default')
+ELECTION_CACHE_TIMEOUT = getattr(
+    settings, 'SOCIETY_ELECTIONS_ELECTION_CACHE_TIMEOUT', 3600
+)
+# Seconds a shared cache, such as a reverse proxy, may serve an election page
+# before revalidating it with its ETag. Edits to an election in the admin may
+# be served stale for this long. Browsers always revalidate.
+ELECTION_PAGE_MAX_AGE = getattr(
+    settings, 'SOCIETY_ELECTIONS_ELECTION_PAGE_MAX_AGE', 60
+)
+VOTER_TOKEN_AGE = getattr(settings, 'SOCIETY_ELECTIONS_VOTER_TOKEN_AGE', 3600)
+OUTBOX_BATCH_SIZE = getattr(
+    settings, 'SOCIETY_ELECTIONS_OUTBOX_BATCH_SIZE', 100
+)
+OUTBOX_MAX_ATTEMPTS = getattr(
+    settings, 'SOCIETY_ELECTIONS_OUTBOX_MAX_ATTEMPTS', 5
+)
+OUTBOX_RETRY_DELAY = getattr(
+    settings, 'SOCIETY_ELECTIONS_OUTBOX_RETRY_DELAY', 60
+)
+# Regular expression of recipients which are never sent to, e.g.
+# loadtest.NEVER_SEND_PATTERN while load testing, so that the emails queued
+# for simulated voters stay in the outbox until the load test deletes them.
+# Defaults to sending to every recipient.
+OUTBOX_NEVER_SEND = getattr(
+    settings, 'SOCIETY_ELECTIONS_OUTBOX_NEVER_SEND', None
+)
+JOB_CHUNK_SIZE = getattr(settings, 'SOCIETY_ELECTIONS_JOB_CHUNK_SIZE', 500)
+# Seconds after which a running job which has not saved its progress is
+# assumed to have stopped, and is claimed by another worker
+JOB_TIMEOUT = getattr(settings, 'SOCIETY_ELECTIONS_JOB_TIMEOUT', 600)
+ASYNC_VIEWS = getattr(settings, 'SOCIETY_ELECTIONS_ASYNC_VIEWS', False)
+# Rate of requests allowed to each throttled view, per client IP address and
+# per voter. Set a rate to None to disable it.
+THROTTLE_RATES = {
+    'voter_create': {'ip': '20/min'},
+    'voter_resend_verification': {'ip': '10/hour', 'voter': '3/hour'},
+    'voter_login': {'ip': '60/min', 'voter': '10/min'},
+    'vote_create': {'ip': '300/min', 'voter': '60/min'},
+    'vote_delete': {'ip': '300/min', 'voter': '60/min'},
+    'ballot_submit': {'ip': '120/min', 'voter': '20/min'},
+}
+for _scope, _rates in getattr(
+    settings, 'SOCIETY_ELECTIONS_THROTTLE_RATES', {}
+).items():
+    THROTTLE_RATES[_scope] = {**THROTTLE_RATES.get(_scope, {}), **_rates}
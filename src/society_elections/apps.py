@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SocietyElectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'society_elections'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,279 @@
+"""Archives finished elections to compressed JSON Lines, and restores them
+
+Deleting an election in one go cascades through every vote, voter and
+candidate in a single transaction. Instead, archive_election streams every
+row of the election to a gzipped JSON Lines file with Django's jsonl
+serializer, checks the file can be read back, and then deletes the rows a
+batch at a time, children before their parents, pausing between batches so
+that other requests can use the tables.
+
+restore_election loads an archive back the way loaddata does, saving each
+object raw so that its primary key and timestamps are kept.
+"""
+import gzip
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, NamedTuple, TextIO
+
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.query import QuerySet
+
+from .models import (AnonymousVoter, Candidate, Election, ElectionPosition,
+                     ElectionResults, Position, RegisteredVoter, Vote,
+                     VoteTally)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ArchiveError(Exception):
+    """Raised when an election cannot be archived or restored"""
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping the microseconds of datetimes, which
+    DjangoJSONEncoder rounds to milliseconds
+    """
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchiveResult(NamedTuple):
+    """The result of archiving an election
+
+    Attributes:
+        archived (dict): Number of rows written to the archive, by model label
+        deleted (int): Number of rows deleted from the database
+    """
+    archived: Dict[str, int]
+    deleted: int
+
+
+def election_querysets(election: Election) -> List[QuerySet]:
+    """Get every row belonging to an election, parents before their children
+
+    Positions are shared between elections, so they are archived for
+    restoring, but never deleted.
+
+    Args:
+        election (Election): Election to get the rows of
+
+    Returns:
+        list: Querysets of the rows, in the order they are archived
+    """
+    return [
+        Position.objects.filter(
+            electionposition__election=election
+        ).distinct().order_by('pk'),
+        Election.objects.filter(pk=election.pk),
+        ElectionPosition.objects.filter(election=election).order_by('pk'),
+        Candidate.objects.filter(
+            position__election=election
+        ).order_by('pk'),
+        RegisteredVoter.objects.filter(election=election).order_by('pk'),
+        AnonymousVoter.objects.filter(election=election).order_by('pk'),
+        Vote.objects.filter(election=election).order_by('pk'),
+        VoteTally.objects.filter(
+            position__election=election
+        ).order_by('pk'),
+        ElectionResults.objects.filter(election=election),
+    ]
+
+
+def write_archive(
+    election: Election, stream: TextIO, chunk_size: int=DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """Serialize every row of an election to a stream as JSON Lines
+
+    Args:
+        election (Election): Election to archive
+        stream (TextIO): Stream to write the lines to
+        chunk_size (int, optional): Number of rows fetched at a time.
+            Defaults to DEFAULT_BATCH_SIZE.
+
+    Returns:
+        dict: Number of rows written, by model label
+    """
+    counts = Counter()
+
+    def counted(queryset: QuerySet):
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            counts[obj._meta.label_lower] += 1
+            yield obj
+
+    for queryset in election_querysets(election):
+        serializers.serialize(
+            'jsonl', counted(queryset), stream=stream, cls=ArchiveJSONEncoder
+        )
+    return dict(counts)
+
+
+def count_archive(path: str) -> Dict[str, int]:
+    """Read an archive back, counting its rows
+
+    Reading the whole file checks that it was completely written, as gzip
+    verifies the length and checksum of the data at the end of the file.
+
+    Args:
+        path (str): Path to the gzipped archive
+
+    Returns:
+        dict: Number of rows in the archive, by model label
+    """
+    counts = Counter()
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            if line.strip():
+                counts[json.loads(line)['model']] += 1
+    return dict(counts)
+
+
+def delete_in_batches(
+    queryset: QuerySet, batch_size: int, pause: float
+) -> int:
+    """Delete the rows of a queryset a batch at a time
+
+    Args:
+        queryset (QuerySet): Rows to delete
+        batch_size (int): Number of rows deleted in each transaction
+        pause (float): Seconds to wait between batches
+
+    Returns:
+        int: Number of rows deleted
+    """
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by('pk').values_list(
+            'pk', flat=True
+        )[:batch_size])
+        if not pks:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=pks).delete()[0]
+        if len(pks) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def delete_election(
+    election: Election, batch_size: int=DEFAULT_BATCH_SIZE, pause: float=0
+) -> int:
+    """Delete every row of an election, children before their parents, so
+    that no delete cascades beyond its batch
+
+    Args:
+        election (Election): Election to delete
+        batch_size (int, optional): Number of rows deleted in each
+            transaction. Defaults to DEFAULT_BATCH_SIZE.
+        pause (float, optional): Seconds to wait between batches. Defaults to
+            0.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    # Positions are shared between elections, and are not deleted
+    children = election_querysets(election)[2:]
+    deleted = 0
+    for queryset in reversed(children):
+        deleted += delete_in_batches(queryset, batch_size, pause)
+        logger.debug(
+            f'Deleted {queryset.model.__name__} rows of election {election.pk}'
+        )
+    deleted += election.delete()[0]
+    return deleted
+
+
+def archive_election(
+    election: Election,
+    path: str,
+    batch_size: int=DEFAULT_BATCH_SIZE,
+    pause: float=0,
+    delete: bool=True
+) -> ArchiveResult:
+    """Archive a finished election to a gzipped JSON Lines file, then delete
+    it from the database
+
+    The rows are only deleted once the archive has been read back and holds
+    every row written.
+
+    Args:
+        election (Election): Finished election to archive
+        path (str): Path of the archive to write
+        batch_size (int, optional): Number of rows fetched or deleted at a
+            time. Defaults to DEFAULT_BATCH_SIZE.
+        pause (float, optional): Seconds to wait between batches of deletes.
+            Defaults to 0.
+        delete (bool, optional): Delete the election once archived. Defaults
+            to True.
+
+    Raises:
+        ArchiveError: The election has not finished, or the archive does not
+            match the database
+
+    Returns:
+        ArchiveResult: Number of rows archived and deleted
+    """
+    if election.current_period != Election.FINISHED:
+        raise ArchiveError(f'Election "{election}" has not finished')
+
+    with gzip.open(path, 'wt', encoding='utf-8') as archive:
+        archived = write_archive(election, archive, batch_size)
+    if count_archive(path) != archived:
+        raise ArchiveError(f'Archive {path} does not contain every row')
+    logger.info(
+        f'Archived {sum(archived.values())} rows of "{election}" to {path}'
+    )
+
+    deleted = 0
+    if delete:
+        deleted = delete_election(election, batch_size, pause)
+        logger.info(f'Deleted {deleted} rows of "{election}"')
+    return ArchiveResult(archived, deleted)
+
+
+def restore_election(path: str) -> Dict[str, int]:
+    """Load an election archived by archive_election back into the database
+
+    The archive is restored in a single transaction. Positions which still
+    exist are left as they are.
+
+    Args:
+        path (str): Path to the gzipped archive
+
+    Raises:
+        ArchiveError: The election already exists, or the users who created
+            or ended it have been deleted
+
+    Returns:
+        dict: Number of rows restored, by model label
+    """
+    User = get_user_model()
+    counts = Counter()
+    with gzip.open(path, 'rt', encoding='utf-8') as archive, \
+            transaction.atomic():
+        for deserialized in serializers.deserialize('jsonl', archive):
+            obj = deserialized.object
+            if isinstance(obj, Position):
+                if Position.objects.filter(pk=obj.pk).exists():
+                    continue
+            elif isinstance(obj, Election):
+                if Election.objects.filter(pk=obj.pk).exists():
+                    raise ArchiveError(f'Election {obj.pk} already exists')
+                users = {obj.created_by_id, obj.ended_by_id} - {None}
+                if User.objects.filter(pk__in=users).count() != len(users):
+                    raise ArchiveError(
+                        f'Users who created or ended election {obj.pk} no '
+                        'longer exist'
+                    )
+            deserialized.save()
+            counts[obj._meta.label_lower] += 1
+    logger.info(f'Restored {sum(counts.values())} rows from {path}')
+    return dict(counts)
@@ -0,0 +1,152 @@
+"""Builds and caches the ballot of an election
+
+The ballot, i.e. the positions of an election and the verified candidates
+standing for them, hardly changes once voting starts. Each process keeps a
+snapshot of the ballot of each election, serialized to JSON once, and only
+rebuilds it when the ballot's generation in the shared cache changes. Signal
+receivers start a new generation whenever a candidate, position, or election
+is changed, so every process rebuilds its snapshot on its next request.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, NamedTuple, Tuple
+
+from django.db.models import Prefetch
+
+from .caching import get_cache
+from .models import Candidate, Election, ElectionPosition
+
+logger = logging.getLogger(__name__)
+
+BALLOT_GENERATION_KEY = 'society_elections:ballot_generation:{pk}'
+
+
+class BallotSnapshot(NamedTuple):
+    """Ballot of an election, as served to voters
+
+    Attributes:
+        generation (str): Generation of the ballot the snapshot was built from
+        version (str): Hash of the content, which changes whenever the ballot
+            changes
+        last_modified (float): Timestamp the generation started at
+        content (bytes): The ballot as JSON
+    """
+    generation: str
+    version: str
+    last_modified: float
+    content: bytes
+
+
+_snapshots: Dict[int, BallotSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def build_ballot(election: Election) -> dict:
+    """Build the ballot of an election from the database
+
+    Only verified candidates are included, with the "Re-open Nominations" and
+    "Abstain" candidates marked.
+
+    Args:
+        election (Election): Election to build the ballot of
+
+    Returns:
+        dict: The positions of the election and their candidates
+    """
+    positions = ElectionPosition.objects.filter(
+        election=election
+    ).select_related('position').prefetch_related(Prefetch(
+        'candidates',
+        queryset=Candidate.objects.filter(email_verified=True).order_by('pk'),
+        to_attr='verified_candidates'
+    )).order_by('pk')
+    return {
+        'election': election.pk,
+        'title': election.title,
+        'voting_end': election.voting_end.isoformat(),
+        'positions': [{
+            'id': position.pk,
+            'title': position.position.title,
+            'description': position.position.description,
+            'positions_available': position.positions_available,
+            'ranked': position.is_ranked,
+            'candidates': [{
+                'id': candidate.pk,
+                'full_name': candidate.full_name,
+                'manifesto': candidate.manifesto,
+                'ron': candidate.is_ron,
+                'abstain': candidate.is_abstain,
+            } for candidate in position.verified_candidates]
+        } for position in positions]
+    }
+
+
+def get_ballot_generation(election_pk: int) -> Tuple[str, float]:
+    """Get the current generation of the ballot of an election
+
+    Args:
+        election_pk (int): Primary key of the election
+
+    Returns:
+        tuple: Identifier of the generation, and the timestamp it started at
+    """
+    key = BALLOT_GENERATION_KEY.format(pk=election_pk)
+    generation = get_cache().get(key)
+    if generation is None:
+        # Another process may start the generation first, in which case
+        # theirs is used
+        started = (uuid.uuid4().hex, time.time())
+        get_cache().add(key, started, None)
+        generation = get_cache().get(key)
+        if generation is None:
+            # The cache did not keep the generation, e.g. DummyCache
+            return started
+    return generation
+
+
+def get_ballot(election: Election) -> BallotSnapshot:
+    """Get the snapshot of the ballot of an election
+
+    The snapshot of this process is returned if it is of the current
+    generation, without querying the database.
+
+    Args:
+        election (Election): Election to get the ballot of
+
+    Returns:
+        BallotSnapshot: Snapshot of the ballot
+    """
+    generation, last_modified = get_ballot_generation(election.pk)
+    snapshot = _snapshots.get(election.pk)
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+
+    content = json.dumps(
+        build_ballot(election), separators=(',', ':')
+    ).encode()
+    snapshot = BallotSnapshot(
+        generation=generation,
+        version=hashlib.sha256(content).hexdigest()[:32],
+        last_modified=last_modified,
+        content=content
+    )
+    with _snapshots_lock:
+        _snapshots[election.pk] = snapshot
+    logger.debug(f'Built ballot of "{election}" version {snapshot.version}')
+    return snapshot
+
+
+def invalidate_ballot(election_pk: int) -> None:
+    """Start a new generation of the ballot of an election
+
+    Must be called whenever candidates, positions, or elections are changed
+    without sending signals, e.g. QuerySet.update()
+
+    Args:
+        election_pk (int): Primary key of the election
+    """
+    get_cache().delete(BALLOT_GENERATION_KEY.format(pk=election_pk))
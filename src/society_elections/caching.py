@@ -0,0 +1,138 @@
+"""Caches data shared between requests using Django's cache framework
+
+The latest election is cached so that requests, across all processes sharing
+the cache, do not need to query for it. The cache is invalidated whenever an
+election is saved or deleted, and otherwise expires when the election next
+changes period.
+
+The results page of a finished election is cached whole, as it is rendered
+from the frozen results, which never change.
+"""
+import hashlib
+import logging
+import math
+
+from django.core.cache import BaseCache, caches
+from django.utils import timezone
+
+from . import app_settings
+from .models import Election
+
+logger = logging.getLogger(__name__)
+
+LATEST_ELECTION_KEY = 'society_elections:latest_election'
+RESULTS_PAGE_KEY = 'society_elections:results_page:{pk}'
+
+
+def get_cache() -> BaseCache:
+    """Get the cache used by this package
+
+    Returns:
+        BaseCache: Cache configured with SOCIETY_ELECTIONS_CACHE
+    """
+    return caches[app_settings.CACHE_ALIAS]
+
+
+def election_cache_timeout(election: Election) -> int:
+    """Get how long an election may be cached for
+
+    Args:
+        election (Election): Election to be cached
+
+    Returns:
+        int: Seconds until the election next changes period, at most
+            app_settings.ELECTION_CACHE_TIMEOUT
+    """
+    next_period_change = election.next_period_change
+    if next_period_change is None:
+        return app_settings.ELECTION_CACHE_TIMEOUT
+    seconds = (next_period_change - timezone.now()).total_seconds()
+    return max(1, min(
+        math.ceil(seconds), app_settings.ELECTION_CACHE_TIMEOUT
+    ))
+
+
+def election_etag(election: Election) -> str:
+    """Get an ETag for pages depending only on an election and its period
+
+    Args:
+        election (Election): Election displayed by the page
+
+    Returns:
+        str: Quoted ETag, which changes whenever the election is saved or 
+            changes period
+    """
+    values = [election.current_period] + [
+        getattr(election, field.attname)
+        for field in Election._meta.concrete_fields
+    ]
+    digest = hashlib.sha256(repr(values).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def get_cached_latest_election() -> Election:
+    """Get the latest election, from the cache if possible
+
+    Only the fields of the election are cached, not any related objects.
+
+    Raises:
+        Election.DoesNotExist: No election found
+
+    Returns:
+        Election: The election with the latest nomination start
+    """
+    field_names = [field.attname for field in Election._meta.concrete_fields]
+    values = get_cache().get(LATEST_ELECTION_KEY)
+    if values is not None and len(values) == len(field_names):
+        return Election.from_db(None, field_names, values)
+
+    election: Election = Election.objects.latest()
+    get_cache().set(
+        LATEST_ELECTION_KEY,
+        [getattr(election, field_name) for field_name in field_names],
+        election_cache_timeout(election)
+    )
+    logger.debug(f'Cached latest election "{election}"')
+    return election
+
+
+async def aget_cached_latest_election() -> Election:
+    """Asynchronous version of get_cached_latest_election
+
+    Raises:
+        Election.DoesNotExist: No election found
+
+    Returns:
+        Election: The election with the latest nomination start
+    """
+    field_names = [field.attname for field in Election._meta.concrete_fields]
+    values = await get_cache().aget(LATEST_ELECTION_KEY)
+    if values is not None and len(values) == len(field_names):
+        return Election.from_db(None, field_names, values)
+
+    election: Election = await Election.objects.alatest()
+    await get_cache().aset(
+        LATEST_ELECTION_KEY,
+        [getattr(election, field_name) for field_name in field_names],
+        election_cache_timeout(election)
+    )
+    logger.debug(f'Cached latest election "{election}"')
+    return election
+
+
+def invalidate_latest_election() -> None:
+    """Remove the latest election from the cache
+
+    Must be called whenever elections are changed without sending signals,
+    e.g. QuerySet.update()
+    """
+    get_cache().delete(LATEST_ELECTION_KEY)
+
+
+def invalidate_results_page(election_pk: int) -> None:
+    """Remove the results page of an election from the cache
+
+    Args:
+        election_pk (int): Primary key of the election
+    """
+    get_cache().delete(RESULTS_PAGE_KEY.format(pk=election_pk))
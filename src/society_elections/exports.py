@@ -0,0 +1,58 @@
+"""Formats the votes of elections as rows of a CSV, written a chunk at a time
+by the export_votes job
+"""
+from typing import List
+
+VOTE_CSV_HEADER = [
+    'voter_id', 'election_id', 'election_admin_title', 'anonymous',
+    'position', 'candidate', 'candidate_id',
+    'vote_cast_at', 'vote_last_modified'
+]
+
+
+# Fields of Vote read for each row of the CSV, by format_vote_row
+VOTE_CSV_FIELDS = [
+    'registered_voter_id', 'anonymous_voter_id',
+    'election_id', 'election__admin_title',
+    'election__anonymous', 'position__position__title',
+    'candidate__full_name', 'candidate_id',
+    'vote_cast_at', 'vote_last_modified_at'
+]
+
+
+class Echo:
+    """Pseudo-buffer which returns what is written to it, rather than storing
+    it, for use with csv.writer
+    """
+    def write(self, value: str) -> str:
+        return value
+
+
+def format_vote_row(vote: tuple) -> List[str]:
+    """Format the values of VOTE_CSV_FIELDS of a vote as a row of the CSV
+
+    Args:
+        vote (tuple): Values of VOTE_CSV_FIELDS
+
+    Returns:
+        list: Row of the CSV for the vote
+    """
+    (
+        registered_voter_pk, anonymous_voter_pk, election_pk, admin_title,
+        anonymous, position_title, candidate_name, candidate_pk, cast_at,
+        modified_at
+    ) = vote
+    return [
+        str(
+            anonymous_voter_pk if registered_voter_pk is None
+            else registered_voter_pk
+        ),
+        str(election_pk),
+        admin_title,
+        anonymous,
+        position_title,
+        candidate_name,
+        '' if candidate_pk is None else str(candidate_pk),
+        cast_at.isoformat(),
+        modified_at.isoformat()
+    ]
@@ -25,11 +25,7 @@ class BaseCandidateForm(ModelForm):
             f'Verifying that "{email}" has a valid domain in the whitelist'
         )
 
-        email_whitelist = election.candidate_email_domain_whitelist.split()
-        logger.debug(f'Whitelist: {email_whitelist}')
-        email_domain = email.split('@')[1]
-        logger.debug(f'Email domain to validate: {email_domain}')
-        if email_domain not in email_whitelist:
+        if not election.candidate_whitelist.matches_email(email):
             logger.debug(f'Email "{email}" not in valid domains')
             self.add_error('email', ValidationError(
                 'Email not in whitelisted domains for this election'
@@ -0,0 +1,325 @@
+"""Runs long admin actions in the background, in resumable chunks
+
+Admin actions queue a Job rather than doing the work in the request. The
+run_jobs command claims queued jobs and runs them a chunk at a time: each
+chunk is processed, and the progress of the job saved, in one transaction. A
+job which fails keeps its progress and can be resumed from the admin, and a
+job whose worker stops without finishing is claimed again once its heartbeat
+is older than app_settings.JOB_TIMEOUT.
+
+A worker which was only slow, rather than stopped, may still be running the
+job when it is claimed again. Each claim gives the job a new claim token, and
+a worker only saves a chunk while the token is its own, so the old worker's
+chunk is rolled back and it stops.
+
+Each kind of job is a function registered with job_kind, which processes the
+next chunk of a job, updates its processed count and cursor, and returns
+whether the job is complete.
+"""
+import csv
+import gzip
+import logging
+import uuid
+from datetime import timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from . import app_settings
+from .exports import VOTE_CSV_FIELDS, VOTE_CSV_HEADER, Echo, format_vote_row
+from .models import (Candidate, Job, JobOutput, OutboundEmail, RegisteredVoter,
+                     Vote)
+
+logger = logging.getLogger(__name__)
+
+JobFunction = Callable[[Job, int], bool]
+
+JOB_KINDS: Dict[str, JobFunction] = {}
+
+
+class JobClaimLost(Exception):
+    """Raised when a running job has been claimed by another worker"""
+
+
+def job_kind(name: str) -> Callable[[JobFunction], JobFunction]:
+    """Register a function running a chunk of a kind of job
+
+    Args:
+        name (str): Kind of the job, stored in Job.kind
+
+    Returns:
+        Callable: Decorator registering the function
+    """
+    def register(func: JobFunction) -> JobFunction:
+        JOB_KINDS[name] = func
+        return func
+    return register
+
+
+def queue_job(
+    kind: str,
+    description: str,
+    arguments: dict,
+    total: int,
+    created_by=None
+) -> Job:
+    """Queue a job to be run by the run_jobs command
+
+    Args:
+        kind (str): Kind of the job, a key of JOB_KINDS
+        description (str): Description of the job shown in the admin
+        arguments (dict): JSON serializable arguments of the job
+        total (int): Number of items the job processes
+        created_by (User, optional): Who queued the job. Defaults to None.
+
+    Raises:
+        ValueError: The kind of job is not registered
+
+    Returns:
+        Job: The job queued
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f'Unknown job kind "{kind}"')
+    return Job.objects.create(
+        kind=kind,
+        description=description,
+        arguments=arguments,
+        total=total,
+        created_by=created_by
+    )
+
+
+def claim_job() -> Optional[Job]:
+    """Claim the oldest job which is pending, or whose worker has stopped
+
+    The job is locked with SELECT ... FOR UPDATE SKIP LOCKED where the
+    database supports it, so several workers never claim the same job.
+
+    Returns:
+        Job: The job claimed, now running, or None if there are no jobs
+    """
+    stale = timezone.now() - timedelta(seconds=app_settings.JOB_TIMEOUT)
+    with transaction.atomic():
+        job = Job.objects.select_for_update(skip_locked=True).filter(
+            Q(status=Job.PENDING) |
+            Q(status=Job.RUNNING, heartbeat_at__lt=stale)
+        ).order_by('created_at', 'pk').first()
+        if job is None:
+            return None
+        job.status = Job.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.error = ''
+        job.claim_token = uuid.uuid4()
+        job.save(update_fields=[
+            'status', 'started_at', 'heartbeat_at', 'error', 'claim_token'
+        ])
+    return job
+
+
+def save_claimed_job(job: Job, fields: List[str]) -> None:
+    """Save fields of a job, unless it has been claimed by another worker
+
+    Args:
+        job (Job): Job claimed by this worker
+        fields (list): Names of the fields to save
+
+    Raises:
+        JobClaimLost: The job has been claimed by another worker since
+    """
+    updated = Job.objects.filter(
+        pk=job.pk, claim_token=job.claim_token
+    ).update(**{field: getattr(job, field) for field in fields})
+    if not updated:
+        raise JobClaimLost(f'Job {job.pk} was claimed by another worker')
+
+
+def run_job(job: Job, chunk_size: int=None) -> bool:
+    """Run a claimed job to completion, a chunk at a time
+
+    Args:
+        job (Job): Running job
+        chunk_size (int, optional): Number of items to process in each
+            chunk. Defaults to app_settings.JOB_CHUNK_SIZE.
+
+    Returns:
+        bool: True if the job succeeded, False if it failed or was claimed by
+            another worker
+    """
+    if chunk_size is None:
+        chunk_size = app_settings.JOB_CHUNK_SIZE
+    progress_fields = ['processed', 'cursor', 'heartbeat_at']
+    try:
+        func = JOB_KINDS[job.kind]
+        done = False
+        while not done:
+            with transaction.atomic():
+                done = func(job, chunk_size)
+                job.heartbeat_at = timezone.now()
+                # Rolls the chunk back if another worker has claimed the job
+                save_claimed_job(job, progress_fields)
+        job.status = Job.SUCCEEDED
+        job.finished_at = timezone.now()
+        save_claimed_job(job, ['status', 'finished_at'])
+    except JobClaimLost as e:
+        logger.warning(f'Stopped job "{job.description}": {e}')
+        return False
+    except Exception as e:
+        logger.exception(f'Job {job.pk} "{job.description}" failed')
+        # The chunk which failed was rolled back, so reload its progress
+        job.refresh_from_db(fields=['processed', 'cursor'])
+        job.status = Job.FAILED
+        job.error = f'{type(e).__name__}: {e}'
+        job.finished_at = timezone.now()
+        try:
+            save_claimed_job(job, ['status', 'error', 'finished_at'])
+        except JobClaimLost as e:
+            logger.warning(f'Stopped job "{job.description}": {e}')
+        return False
+
+    logger.info(
+        f'Job {job.pk} "{job.description}" processed {job.processed} items'
+    )
+    return True
+
+
+def run_jobs(chunk_size: int=None, limit: int=None) -> Dict[str, int]:
+    """Run queued jobs until there are none left
+
+    Args:
+        chunk_size (int, optional): Number of items to process in each
+            chunk. Defaults to app_settings.JOB_CHUNK_SIZE.
+        limit (int, optional): Maximum number of jobs to run. Defaults to no
+            limit.
+
+    Returns:
+        dict: Number of jobs 'succeeded' and 'failed'
+    """
+    counts = {'succeeded': 0, 'failed': 0}
+    while limit is None or sum(counts.values()) < limit:
+        job = claim_job()
+        if job is None:
+            break
+        if run_job(job, chunk_size):
+            counts['succeeded'] += 1
+        else:
+            counts['failed'] += 1
+    return counts
+
+
+def resume_jobs(jobs: QuerySet) -> int:
+    """Queue failed jobs to run again from where they stopped
+
+    Args:
+        jobs (QuerySet): Jobs to resume
+
+    Returns:
+        int: Number of jobs queued again
+    """
+    return jobs.filter(status=Job.FAILED).update(
+        status=Job.PENDING, finished_at=None
+    )
+
+
+def write_output(job: Job, data: bytes) -> None:
+    """Append a chunk to the file produced by a job
+
+    Args:
+        job (Job): Running job
+        data (bytes): Content to append
+    """
+    JobOutput.objects.create(job=job, sequence=job.processed, data=data)
+
+
+def iter_output(job: Job) -> Iterator[bytes]:
+    """Iterate over the file produced by a job
+
+    Args:
+        job (Job): Job which has written output
+
+    Yields:
+        bytes: Chunks of the file, in order
+    """
+    chunks = JobOutput.objects.filter(job=job).order_by(
+        'sequence'
+    ).values_list('data', flat=True)
+    for data in chunks.iterator(chunk_size=10):
+        yield bytes(data)
+
+
+def next_pks(job: Job, chunk_size: int) -> List:
+    """Get the next chunk of the PKs in a job's arguments"""
+    return job.arguments['pks'][job.processed:job.processed + chunk_size]
+
+
+@job_kind('export_votes')
+def export_votes(job: Job, chunk_size: int) -> bool:
+    """Write the next chunk of the votes of the elections in
+    job.arguments['elections'] to a gzipped CSV
+
+    Each chunk is compressed as a separate gzip member, which concatenated
+    form a single valid gzip file.
+    """
+    votes = Vote.objects.filter(
+        election__in=job.arguments['elections']
+    ).order_by('pk')
+    if job.cursor:
+        votes = votes.filter(pk__gt=int(job.cursor))
+    writer = csv.writer(Echo())
+    lines = [] if job.cursor else [writer.writerow(VOTE_CSV_HEADER)]
+    last_pk = None
+    count = 0
+    for last_pk, *vote in votes.values_list(
+        'pk', *VOTE_CSV_FIELDS
+    )[:chunk_size].iterator(chunk_size=chunk_size):
+        lines.append(writer.writerow(format_vote_row(vote)))
+        count += 1
+    if lines:
+        write_output(job, gzip.compress(''.join(lines).encode('utf-8')))
+    if last_pk is not None:
+        job.cursor = str(last_pk)
+    job.processed += count
+    return count < chunk_size
+
+
+@job_kind('resend_voter_verification')
+def resend_voter_verification(job: Job, chunk_size: int) -> bool:
+    """Queue verification emails to the next chunk of the unverified voters
+    in job.arguments['pks']
+    """
+    pks = next_pks(job, chunk_size)
+    voters = RegisteredVoter.objects.filter(
+        pk__in=pks, verified_at__isnull=True
+    ).select_related('election')
+    # Created in the transaction of the chunk, rather than once it commits,
+    # so that the emails are queued exactly once
+    OutboundEmail.objects.bulk_create([
+        voter.build_verification_email()
+        for voter in voters.iterator(chunk_size=chunk_size)
+    ])
+    job.processed += len(pks)
+    return job.processed >= len(job.arguments['pks'])
+
+
+@job_kind('resend_candidate_verification')
+def resend_candidate_verification(job: Job, chunk_size: int) -> bool:
+    """Regenerate the verification UUIDs of the next chunk of the candidates
+    in job.arguments['pks'], and queue them verification emails
+    """
+    pks = next_pks(job, chunk_size)
+    candidates = list(Candidate.objects.filter(pk__in=pks).select_related(
+        'position__election', 'position__position'
+    ).iterator(chunk_size=chunk_size))
+    emails = []
+    for candidate in candidates:
+        if candidate.position.election.verify_candidate_emails:
+            candidate.email_uuid = uuid.uuid4()
+            emails.append(candidate.build_verification_email())
+        else:
+            candidate.email_uuid = None
+    Candidate.objects.bulk_update(candidates, ['email_uuid'])
+    OutboundEmail.objects.bulk_create(emails)
+    job.processed += len(pks)
+    return job.processed >= len(job.arguments['pks'])
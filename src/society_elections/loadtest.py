@@ -0,0 +1,537 @@
+"""Simulates voters on election day, to size deployments before an election
+
+Each simulated voter goes through the real voting flow: registering,
+verifying their email, opening the voting page, logging in for a token,
+casting a vote in every position, changing a vote, and submitting. Requests
+are either made in-process through Django's test client, or to a local server
+over HTTP. Like a browser, each voter fetches the registration form first
+for a CSRF cookie, and sends its token with every POST.
+
+No outside service is contacted. The simulated voters register with
+addresses matching NEVER_SEND_PATTERN, and load tests only run once
+SOCIETY_ELECTIONS_OUTBOX_NEVER_SEND is set to it, so the emails queued for
+them are never sent, and are deleted once the load test finishes.
+"""
+import http.cookiejar
+import json
+import logging
+import math
+import random
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import Client
+from django.urls import reverse
+
+from . import app_settings
+from .models import (AnonymousVoter, Election, ElectionPosition, OutboundEmail,
+                     RegisteredVoter, Vote, VoteTally)
+
+logger = logging.getLogger(__name__)
+
+# Passwords generated by AnonymousVoter.generate_voter_password
+PASSWORD_PATTERN = re.compile(r'(?<![\w-])[\w-]{16}(?![\w-])')
+# Email of each simulated voter, and the pattern app_settings.OUTBOX_NEVER_SEND
+# must match them with while load testing
+EMAIL_FORMAT = 'loadtest-{run}-{i}@{domain}'
+NEVER_SEND_PATTERN = r'^loadtest-[0-9a-f]{8}-[0-9]+@'
+
+
+class Response(NamedTuple):
+    """A response to a simulated request"""
+    status: int
+    body: bytes
+
+
+class ClientTransport:
+    """Sends requests in-process through Django's test client, checking CSRF
+    tokens as a server would
+
+    Args:
+        host (str): Host header to send, which must be in ALLOWED_HOSTS
+        remote_addr (str, optional): IP address the requests come from.
+            Defaults to '127.0.0.1'.
+    """
+    def __init__(self, host: str, remote_addr: str='127.0.0.1'):
+        self.client = Client(
+            SERVER_NAME=host, REMOTE_ADDR=remote_addr,
+            enforce_csrf_checks=True, raise_request_exception=False
+        )
+
+    def request(self, method: str, path: str, data: dict) -> Response:
+        headers = {}
+        if settings.CSRF_COOKIE_NAME in self.client.cookies:
+            headers['X-CSRFToken'] = self.client.cookies[
+                settings.CSRF_COOKIE_NAME
+            ].value
+        res = getattr(self.client, method)(path, data, headers=headers)
+        return Response(res.status_code, res.content)
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Returns redirects as responses, rather than following them"""
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTransport:
+    """Sends requests to a running server over HTTP, keeping cookies
+
+    Args:
+        base_url (str): URL the society_elections URLs are included under,
+            e.g. http://localhost:8000
+    """
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies),
+            NoRedirectHandler()
+        )
+
+    def request(self, method: str, path: str, data: dict) -> Response:
+        query = urllib.parse.urlencode(data, doseq=True)
+        headers = {}
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                headers['X-CSRFToken'] = cookie.value
+        if method == 'get':
+            request = urllib.request.Request(
+                f'{self.base_url}{path}?{query}', headers=headers
+            )
+        else:
+            request = urllib.request.Request(
+                f'{self.base_url}{path}', data=query.encode(), headers=headers
+            )
+        try:
+            with self.opener.open(request) as res:
+                return Response(res.status, res.read())
+        except urllib.error.HTTPError as e:
+            return Response(e.code, e.read())
+
+
+class EndpointStats(NamedTuple):
+    """Latency and errors of one endpoint
+
+    Attributes:
+        endpoint (str): URL name of the endpoint
+        requests (int): Number of requests made
+        errors (int): Number of requests which failed
+        throughput (float): Requests per second over the whole load test
+        p50 (float): Median latency in seconds
+        p90 (float): 90th percentile latency in seconds
+        p99 (float): 99th percentile latency in seconds
+        max (float): Slowest request in seconds
+    """
+    endpoint: str
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class LoadTestReport(NamedTuple):
+    """The result of a load test
+
+    Attributes:
+        voters (int): Number of voters simulated
+        completed (int): Number of voters who submitted their votes
+        concurrency (int): Number of voters simulated at once
+        duration (float): Seconds the load test took
+        endpoints (list): EndpointStats of every endpoint requested
+        errors (Counter): Number of each error seen
+        violations (list): Descriptions of broken voting invariants
+    """
+    voters: int
+    completed: int
+    concurrency: int
+    duration: float
+    endpoints: List[EndpointStats]
+    errors: Counter
+    violations: List[str]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Get a percentile of some values using the nearest-rank method
+
+    Args:
+        values (list): Values, which must already be sorted
+        percent (float): Percentile to get, from 0 to 100
+
+    Returns:
+        float: The percentile, or 0 if there are no values
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+class VoterSimulation:
+    """Simulates one voter voting in an election
+
+    Args:
+        election (Election): Election being voted in
+        positions (list): Positions of the election, with the PKs of their
+            verified candidates
+        email (str): Email the voter registers with
+        transport: ClientTransport or HttpTransport to send requests with
+        rng (random.Random): Random number generator choosing votes
+    """
+    def __init__(
+        self,
+        election: Election,
+        positions: List[Tuple[ElectionPosition, List[int]]],
+        email: str,
+        transport,
+        rng: random.Random
+    ):
+        self.election = election
+        self.positions = positions
+        self.email = email
+        self.transport = transport
+        self.rng = rng
+        self.timings: List[Tuple[str, float, bool]] = []
+        self.errors: Counter = Counter()
+        self.password: Optional[str] = None
+
+    def request(
+        self, endpoint: str, method: str, data: dict, expected: int=200
+    ) -> Optional[Response]:
+        """Make a request, recording its latency and any error
+
+        Returns:
+            Response: Response, or None if the request failed
+        """
+        start = time.perf_counter()
+        try:
+            res = self.transport.request(
+                method, reverse(f'society_elections:{endpoint}'), data
+            )
+        except Exception as e:
+            res = None
+            error = f'{endpoint}: {type(e).__name__}: {e}'
+        else:
+            error = None
+            if res.status != expected:
+                error = f'{endpoint}: HTTP {res.status}'
+            elif res.body.startswith(b'{') and b'"error"' in res.body:
+                error = f'{endpoint}: {res.body.decode()}'
+        self.timings.append((
+            endpoint, time.perf_counter() - start, error is None
+        ))
+        if error is not None:
+            self.errors[error] += 1
+            return None
+        return res
+
+    def credentials(self, voter_pk) -> dict:
+        if self.election.anonymous:
+            return {'password': self.password}
+        return {'uuid': voter_pk}
+
+    def find_password(self, body: bytes) -> Optional[str]:
+        """Find the password shown to an anonymous voter once verified
+
+        The page may contain other words which look like a password, so the
+        first which belongs to a voter in the election is used.
+
+        Args:
+            body (bytes): Body of the voter_verified_anon_election page
+
+        Returns:
+            str: Password of the voter, or None if none was shown
+        """
+        words = PASSWORD_PATTERN.findall(body.decode(errors='replace'))
+        digests = {AnonymousVoter.hash_password(word): word for word in words}
+        digest = AnonymousVoter.objects.filter(
+            election=self.election, password__in=list(digests)
+        ).values_list('password', flat=True).first()
+        return None if digest is None else digests[bytes(digest)]
+
+    def run(self) -> bool:
+        """Run the voter through the voting flow
+
+        Returns:
+            bool: Whether the voter submitted their votes
+        """
+        # Open the registration form first for the CSRF cookie
+        if self.request('voter_create', 'get', {}) is None:
+            return False
+        if self.request('voter_create', 'post', {'email': self.email}) is None:
+            return False
+        voter_pk = RegisteredVoter.objects.filter(
+            election=self.election, email=self.email
+        ).values_list('pk', flat=True).first()
+        if voter_pk is None:
+            self.errors['voter_create: voter not saved'] += 1
+            return False
+        verified = self.request(
+            'voter_verify', 'get', {'uuid': voter_pk},
+            expected=200 if self.election.anonymous else 302
+        )
+        if verified is None:
+            return False
+        if self.election.anonymous:
+            # Read the password from the verified page, as a voter would
+            self.password = self.find_password(verified.body)
+            if self.password is None:
+                self.errors['voter_verify: no password shown'] += 1
+                return False
+            opened = self.request('vote', 'post', self.credentials(voter_pk))
+        else:
+            opened = self.request('vote', 'get', self.credentials(voter_pk))
+        if opened is None:
+            return False
+
+        login = self.request('voter_login', 'post', self.credentials(voter_pk))
+        if login is None:
+            return False
+        token = json.loads(login.body)['token']
+
+        votes = {}
+        for position, candidates in self.positions:
+            votes[position.pk] = self.rng.sample(
+                candidates, min(position.positions_available, len(candidates))
+            )
+            for candidate_pk in votes[position.pk]:
+                self.request('vote_create', 'post', {
+                    'token': token,
+                    'position': position.pk,
+                    'candidate': candidate_pk
+                })
+
+        # Change one vote to a candidate not yet voted for
+        position, candidates = self.rng.choice(self.positions)
+        unvoted = [pk for pk in candidates if pk not in votes[position.pk]]
+        if unvoted and votes[position.pk]:
+            if position.positions_available > 1:
+                self.request('vote_delete', 'post', {
+                    'token': token,
+                    'position': position.pk,
+                    'candidate': self.rng.choice(votes[position.pk])
+                })
+            self.request('vote_create', 'post', {
+                'token': token,
+                'position': position.pk,
+                'candidate': self.rng.choice(unvoted)
+            })
+
+        submitted = self.request(
+            'vote', 'post', dict(self.credentials(voter_pk), submit='1'),
+            expected=302
+        )
+        return submitted is not None
+
+
+def check_invariants(election: Election, emails: List[str]) -> List[str]:
+    """Check the votes of an election are consistent
+
+    Args:
+        election (Election): Election voted in
+        emails (list): Emails of the simulated voters
+
+    Returns:
+        list: Description of every invariant broken
+    """
+    violations = []
+    votes = Vote.objects.filter(election=election)
+    over_seats = votes.exclude(
+        position__voting_system=ElectionPosition.STV
+    ).values(
+        'position', 'registered_voter', 'anonymous_voter',
+        'position__positions_available'
+    ).annotate(count=Count('pk')).order_by()
+    for row in over_seats:
+        if row['count'] > row['position__positions_available']:
+            violations.append(
+                f'Voter cast {row["count"]} votes in position '
+                f'{row["position"]} with {row["position__positions_available"]}'
+                ' seats'
+            )
+    duplicates = votes.values(
+        'position', 'registered_voter', 'anonymous_voter', 'candidate'
+    ).annotate(count=Count('pk')).filter(count__gt=1).order_by()
+    for row in duplicates:
+        violations.append(
+            f'Voter voted for candidate {row["candidate"]} {row["count"]} times'
+        )
+    counted = dict(votes.filter(candidate__isnull=False).values_list(
+        'candidate'
+    ).annotate(count=Count('pk')).order_by())
+    tallied = dict(VoteTally.objects.filter(
+        position__election=election
+    ).values_list('candidate').annotate(count=Sum('votes')).order_by())
+    for candidate_pk in set(counted) | set(tallied):
+        if counted.get(candidate_pk, 0) != tallied.get(candidate_pk, 0):
+            violations.append(
+                f'Candidate {candidate_pk} has {counted.get(candidate_pk, 0)} '
+                f'votes but a tally of {tallied.get(candidate_pk, 0)}'
+            )
+    registered = RegisteredVoter.objects.filter(
+        election=election, email__in=emails
+    ).values('email').annotate(count=Count('pk')).filter(count__gt=1)
+    for row in registered:
+        violations.append(f'{row["email"]} registered {row["count"]} times')
+    return violations
+
+
+def cleanup(election: Election, emails: List[str], passwords: List[str]):
+    """Remove the voters and votes created by a load test
+
+    Args:
+        election (Election): Election voted in
+        emails (list): Emails of the simulated voters
+        passwords (list): Passwords of the simulated anonymous voters
+    """
+    RegisteredVoter.objects.filter(
+        election=election, email__in=emails
+    ).delete()
+    AnonymousVoter.objects.filter(
+        election=election,
+        password__in=[AnonymousVoter.hash_password(p) for p in passwords]
+    ).delete()
+    VoteTally.rebuild(election)
+
+
+def run_load_test(
+    election: Election,
+    voters: int,
+    concurrency: int,
+    base_url: str=None,
+    host: str='localhost',
+    seed: int=None,
+    keep: bool=False
+) -> LoadTestReport:
+    """Simulate voters voting in an election at the same time
+
+    The election must be in its voting period, and have a voter email domain
+    whitelist for the simulated voters to register with. The emails queued
+    for the simulated voters are deleted afterwards, even when the voters are
+    kept.
+
+    Every request sent to a server over HTTP comes from the same address, so
+    the per-IP rates of app_settings.THROTTLE_RATES on the server must allow
+    the whole load test, or requests are throttled with a 429.
+
+    Args:
+        election (Election): Election to vote in
+        voters (int): Number of voters to simulate
+        concurrency (int): Number of voters to simulate at once. With 1,
+            voters are simulated in the calling thread.
+        base_url (str, optional): URL of a local server to send requests to.
+            Defaults to sending requests in-process.
+        host (str, optional): Host header of in-process requests. Defaults to
+            'localhost'.
+        seed (int, optional): Seed choosing the votes cast. Defaults to None.
+        keep (bool, optional): Keep the voters and votes created, rather than
+            deleting them afterwards. Defaults to False.
+
+    Returns:
+        LoadTestReport: Latencies, errors, and invariants broken
+
+    Raises:
+        ValueError: The emails of simulated voters would be sent, as
+            app_settings.OUTBOX_NEVER_SEND does not match them
+    """
+    whitelist = election.voter_whitelist
+    if whitelist.domains:
+        domain = min(whitelist.domains)
+    else:
+        domain = f'loadtest.{min(whitelist.suffixes)}'
+    run = uuid.uuid4().hex[:8]
+    emails = [
+        EMAIL_FORMAT.format(run=run, i=i, domain=domain)
+        for i in range(voters)
+    ]
+    if not app_settings.OUTBOX_NEVER_SEND or not re.search(
+        app_settings.OUTBOX_NEVER_SEND, emails[0]
+    ):
+        raise ValueError(
+            'SOCIETY_ELECTIONS_OUTBOX_NEVER_SEND must match the emails of '
+            f'simulated voters, such as {emails[0]}, so that they are never '
+            f"sent. Set it to r'{NEVER_SEND_PATTERN}' while load testing"
+        )
+    positions = [
+        (position, [
+            candidate.pk for candidate in position.candidates.all()
+            if candidate.email_verified
+        ]) for position in ElectionPosition.objects.filter(
+            election=election
+        ).prefetch_related('candidates')
+    ]
+    rng = random.Random(seed)
+    # In-process voters each send requests from their own address, as they
+    # would in an election, so they are throttled separately
+    simulations = [
+        VoterSimulation(
+            election, positions, email,
+            HttpTransport(base_url) if base_url else ClientTransport(
+                host, f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+            ),
+            random.Random(rng.random())
+        ) for i, email in enumerate(emails)
+    ]
+
+    def simulate(simulation: VoterSimulation) -> bool:
+        try:
+            return simulation.run()
+        finally:
+            if concurrency > 1:
+                connection.close()
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            completed = sum(executor.map(simulate, simulations))
+    else:
+        completed = sum(map(simulate, simulations))
+    duration = time.perf_counter() - start
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    failures: Counter = Counter()
+    errors: Counter = Counter()
+    for simulation in simulations:
+        errors.update(simulation.errors)
+        for endpoint, latency, ok in simulation.timings:
+            latencies[endpoint].append(latency)
+            if not ok:
+                failures[endpoint] += 1
+    endpoints = []
+    for endpoint, values in latencies.items():
+        values.sort()
+        endpoints.append(EndpointStats(
+            endpoint, len(values), failures[endpoint],
+            len(values) / duration if duration else 0.0,
+            percentile(values, 50), percentile(values, 90),
+            percentile(values, 99), values[-1]
+        ))
+
+    violations = check_invariants(election, emails)
+    OutboundEmail.objects.filter(recipient__in=emails).delete()
+    if not keep:
+        cleanup(election, emails, [
+            s.password for s in simulations if s.password is not None
+        ])
+    logger.info(
+        f'Load tested "{election}" with {voters} voters: {completed} '
+        f'completed, {sum(errors.values())} errors, {len(violations)} '
+        'violations'
+    )
+    return LoadTestReport(
+        voters, completed, concurrency, duration, endpoints, errors,
+        violations
+    )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import DEFAULT_BATCH_SIZE, ArchiveError, archive_election
+from ...models import Election
+
+
+class Command(BaseCommand):
+    help = (
+        'Archive a finished election to a gzipped JSON Lines file, then '
+        'delete it in batches'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('election', type=int, help='PK of the election')
+        parser.add_argument(
+            '--output',
+            help='Path of the archive, defaults to election-<pk>.jsonl.gz'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows to fetch or delete at a time'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.1,
+            help='Seconds to wait between batches of deletes'
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Write the archive without deleting the election'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            election = Election.objects.get(pk=options['election'])
+        except Election.DoesNotExist:
+            raise CommandError('Election does not exist')
+        path = options['output'] or f'election-{election.pk}.jsonl.gz'
+
+        try:
+            result = archive_election(
+                election, path,
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                delete=not options['keep']
+            )
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f'Archived {sum(result.archived.values())} rows of "{election}" '
+            f'to {path}, deleted {result.deleted} rows'
+        )
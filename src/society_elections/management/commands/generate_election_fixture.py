@@ -0,0 +1,111 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Election
+from ...synthetic import (DEFAULT_BATCH_SIZE, DISTRIBUTIONS, ZIPF,
+                          generate_election)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a large election with voters who have voted, for '
+        'benchmarks and load tests'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--positions', type=int, default=5,
+            help='Number of positions in the election'
+        )
+        parser.add_argument(
+            '--candidates', type=int, default=5,
+            help='Number of candidates standing for each position'
+        )
+        parser.add_argument(
+            '--voters', type=int, default=1000,
+            help='Number of registered voters'
+        )
+        parser.add_argument(
+            '--seats', type=int, default=1,
+            help='Number of seats available in each position'
+        )
+        parser.add_argument(
+            '--ranked', action='store_true',
+            help='Voters rank the candidates, which are counted with STV'
+        )
+        parser.add_argument(
+            '--anonymous', action='store_true',
+            help='Generate an anonymous election'
+        )
+        parser.add_argument(
+            '--turnout', type=float, default=1.0,
+            help='Fraction of the voters who vote'
+        )
+        parser.add_argument(
+            '--distribution', choices=DISTRIBUTIONS, default=ZIPF,
+            help='Popularity of the candidates of each position'
+        )
+        parser.add_argument(
+            '--zipf-exponent', type=float, default=1.0,
+            help='Exponent of the Zipf distribution, higher is more skewed'
+        )
+        parser.add_argument(
+            '--period', default=Election.VOTING,
+            choices=(Election.NOMINATIONS, Election.VOTING, Election.POSTVOTING),
+            help='Period the election is in'
+        )
+        parser.add_argument(
+            '--seed', type=int,
+            help='Seed of the votes cast, to generate repeatable elections'
+        )
+        parser.add_argument(
+            '--user',
+            help='Username of the user creating the election, defaults to '
+                 'the first superuser'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows to insert at a time'
+        )
+
+    def handle(self, *args, **options):
+        created_by = None
+        if options['user'] is not None:
+            User = get_user_model()
+            try:
+                created_by = User.objects.get(
+                    **{User.USERNAME_FIELD: options['user']}
+                )
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["user"]}" does not exist')
+        if not 0 <= options['turnout'] <= 1:
+            raise CommandError('Turnout must be between 0 and 1')
+
+        start = time.perf_counter()
+        try:
+            generated = generate_election(
+                positions=options['positions'],
+                candidates=options['candidates'],
+                voters=options['voters'],
+                seats=options['seats'],
+                ranked=options['ranked'],
+                anonymous=options['anonymous'],
+                turnout=options['turnout'],
+                distribution=options['distribution'],
+                exponent=options['zipf_exponent'],
+                period=options['period'],
+                seed=options['seed'],
+                created_by=created_by,
+                batch_size=options['batch_size']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f'Generated "{generated.election.admin_title}" '
+            f'(pk {generated.election.pk}) with {len(generated.positions)} '
+            f'positions, {len(generated.candidates)} candidates, '
+            f'{generated.voters} voters, and {generated.votes} votes in '
+            f'{time.perf_counter() - start:.1f}s'
+        )
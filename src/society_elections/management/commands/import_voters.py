@@ -0,0 +1,93 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Election
+from ...roll import DEFAULT_BATCH_SIZE, import_voters
+
+
+class Command(BaseCommand):
+    help = 'Register the voters of an election from a CSV of emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_file', help='Path to the CSV file, or - to read from stdin'
+        )
+        parser.add_argument(
+            '--election', type=int,
+            help='PK of the election, defaults to the latest election'
+        )
+        parser.add_argument(
+            '--column', default='email',
+            help='Header of the column containing the emails'
+        )
+        parser.add_argument(
+            '--no-header', action='store_true',
+            help='The CSV has no header, emails are in the first column'
+        )
+        parser.add_argument(
+            '--verified', action='store_true',
+            help='Verify the voters instead of emailing them a verification '
+                 'link. Voters in anonymous elections are emailed their '
+                 'password.'
+        )
+        parser.add_argument(
+            '--no-email', action='store_true',
+            help='Do not queue any emails to the voters. Not allowed with '
+                 '--verified in anonymous elections'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of voters to insert at a time'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['election'] is None:
+                election = Election.objects.latest()
+            else:
+                election = Election.objects.get(pk=options['election'])
+        except Election.DoesNotExist:
+            raise CommandError('Election does not exist')
+        if (
+            options['verified'] and options['no_email'] and
+            election.anonymous
+        ):
+            raise CommandError(
+                '--verified --no-email cannot be used with anonymous '
+                'elections, as voters would never receive their passwords'
+            )
+
+        if options['csv_file'] == '-':
+            result = self.import_file(sys.stdin, election, options)
+        else:
+            with open(options['csv_file'], newline='') as csv_file:
+                result = self.import_file(csv_file, election, options)
+
+        # Line numbers of the file, rather than of the emails
+        offset = 0 if options['no_header'] else 1
+        for line, email, reason in result.invalid:
+            self.stderr.write(f'Line {line + offset}: "{email}" {reason}')
+        self.stdout.write(
+            f'Created {result.created} voters in "{election}", skipped '
+            f'{result.duplicates} duplicates and {len(result.invalid)} '
+            'invalid emails'
+        )
+
+    def import_file(self, csv_file, election, options):
+        reader = csv.reader(csv_file)
+        column = 0
+        if not options['no_header']:
+            header = next(reader, [])
+            try:
+                column = header.index(options['column'])
+            except ValueError:
+                raise CommandError(f'No column "{options["column"]}" in CSV')
+        return import_voters(
+            election,
+            (row[column] if len(row) > column else '' for row in reader),
+            verified=options['verified'],
+            send_emails=not options['no_email'],
+            batch_size=options['batch_size']
+        )
@@ -0,0 +1,114 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...loadtest import NEVER_SEND_PATTERN, run_load_test
+from ...models import Election
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate voters registering and voting in an election at the same '
+        'time, reporting latency, errors, and broken invariants. Set '
+        f"SOCIETY_ELECTIONS_OUTBOX_NEVER_SEND = r'{NEVER_SEND_PATTERN}' in "
+        'the settings of this command, the server, and the outbox worker '
+        'first, so that the emails of the simulated voters are never sent.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--election', type=int,
+            help='PK of the election, defaults to the latest election'
+        )
+        parser.add_argument(
+            '--voters', type=int, default=50,
+            help='Number of voters to simulate'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=10,
+            help='Number of voters to simulate at once'
+        )
+        parser.add_argument(
+            '--url',
+            help='URL of a local server to load test, e.g. '
+                 'http://localhost:8000. Every request comes from the same '
+                 'address, so raise the per-IP rates of '
+                 'SOCIETY_ELECTIONS_THROTTLE_RATES on the server first. '
+                 'Defaults to handling requests in-process.'
+        )
+        parser.add_argument(
+            '--host', default='localhost',
+            help='Host header of in-process requests, which must be in '
+                 'ALLOWED_HOSTS'
+        )
+        parser.add_argument(
+            '--seed', type=int, help='Seed choosing the votes cast'
+        )
+        parser.add_argument(
+            '--keep', action='store_true',
+            help='Keep the voters and votes created instead of deleting them'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['election'] is None:
+                election = Election.objects.latest()
+            else:
+                election = Election.objects.get(pk=options['election'])
+        except Election.DoesNotExist:
+            raise CommandError('Election does not exist')
+        if election.current_period != Election.VOTING:
+            raise CommandError(f'"{election}" is not in its voting period')
+        if not any(election.voter_whitelist):
+            raise CommandError(
+                f'"{election}" has no voter email domain whitelist to '
+                'register voters with'
+            )
+        if options['voters'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--voters and --concurrency must be positive')
+
+        try:
+            report = run_load_test(
+                election,
+                options['voters'],
+                options['concurrency'],
+                base_url=options['url'],
+                host=options['host'],
+                seed=options['seed'],
+                keep=options['keep']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f'{report.completed}/{report.voters} voters completed in '
+            f'{report.duration:.2f}s at concurrency {report.concurrency}'
+        )
+        self.stdout.write(
+            f'{"endpoint":<20} {"requests":>8} {"errors":>6} {"req/s":>8} '
+            f'{"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8}'
+        )
+        for stats in sorted(report.endpoints):
+            self.stdout.write(
+                f'{stats.endpoint:<20} {stats.requests:>8} {stats.errors:>6} '
+                f'{stats.throughput:>8.1f} {stats.p50 * 1000:>8.1f} '
+                f'{stats.p90 * 1000:>8.1f} {stats.p99 * 1000:>8.1f} '
+                f'{stats.max * 1000:>8.1f}'
+            )
+        for error, count in report.errors.most_common():
+            self.stderr.write(f'{count} x {error}')
+        throttled = sum(
+            count for error, count in report.errors.items()
+            if error.endswith('HTTP 429')
+        )
+        if throttled and options['url']:
+            self.stderr.write(self.style.WARNING(
+                f'{throttled} requests were throttled, as every request came '
+                'from the same address. Raise the per-IP rates of '
+                'SOCIETY_ELECTIONS_THROTTLE_RATES on the server, or set them '
+                'to None, before load testing it.'
+            ))
+        for violation in report.violations:
+            self.stderr.write(self.style.ERROR(f'Violation: {violation}'))
+        if report.violations:
+            raise CommandError(
+                f'{len(report.violations)} voting invariants were broken'
+            )
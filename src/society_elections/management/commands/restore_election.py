@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...archive import ArchiveError, restore_election
+
+
+class Command(BaseCommand):
+    help = 'Restore an election archived by archive_election'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help='Path to the archive')
+
+    def handle(self, *args, **options):
+        try:
+            restored = restore_election(options['archive'])
+        except ArchiveError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f'Restored {sum(restored.values())} rows from {options["archive"]}'
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ... import app_settings
+from ...jobs import run_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run the background jobs queued by society_elections admin actions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=app_settings.JOB_CHUNK_SIZE,
+            help='Number of items to process in each transaction'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new jobs instead of exiting once the '
+                 'queue is empty'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait between polls when the queue is empty'
+        )
+
+    def handle(self, *args, **options):
+        total_succeeded = total_failed = 0
+        while True:
+            counts = run_jobs(options['chunk_size'])
+            total_succeeded += counts['succeeded']
+            total_failed += counts['failed']
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(
+            f'Ran {total_succeeded + total_failed} jobs, {total_failed} failed'
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ... import app_settings
+from ...outbox import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Send the emails queued by society_elections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=app_settings.OUTBOX_BATCH_SIZE,
+            help='Number of emails to send over each connection'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new emails instead of exiting once the '
+                 'queue is empty'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to wait between polls when the queue is empty'
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued_mail(options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+            if sent + failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(f'Sent {total_sent} emails, {total_failed} failed')
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:36
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate_tallies(apps, schema_editor):
+    """Count the existing votes of every candidate into shard 0"""
+    Vote = apps.get_model('society_elections', 'Vote')
+    VoteTally = apps.get_model('society_elections', 'VoteTally')
+    counts = Vote.objects.filter(candidate__isnull=False).values_list(
+        'position_id', 'candidate_id'
+    ).annotate(votes=Count('pk')).order_by()
+    VoteTally.objects.bulk_create([
+        VoteTally(
+            position_id=position_pk,
+            candidate_id=candidate_pk,
+            shard=0,
+            votes=votes
+        ) for position_pk, candidate_pk, votes in counts
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0008_auto_20211113_1111'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(editable=False)),
+                ('votes', models.IntegerField(default=0, editable=False)),
+                ('candidate', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tallies', related_query_name='tally', to='society_elections.candidate')),
+                ('position', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tallies', related_query_name='tally', to='society_elections.electionposition')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='votetally',
+            constraint=models.UniqueConstraint(fields=('position', 'candidate', 'shard'), name='unique_vote_tally_shard'),
+        ),
+        migrations.RunPython(populate_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:44
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def assign_seats(apps, schema_editor):
+    """Number the votes of each voter in each position from 0, removing any 
+    duplicate votes for the same candidate, and recounting the tallies of the 
+    positions they were removed from
+    """
+    Vote = apps.get_model('society_elections', 'Vote')
+    VoteTally = apps.get_model('society_elections', 'VoteTally')
+    votes = Vote.objects.order_by(
+        'position_id', 'registered_voter_id', 'anonymous_voter_id', 'pk'
+    ).values_list(
+        'pk', 'position_id', 'registered_voter_id', 'anonymous_voter_id',
+        'candidate_id'
+    )
+    group = None
+    candidates = set()
+    seats = {}
+    duplicates = []
+    affected_positions = set()
+    for pk, position_pk, reg_voter_pk, anon_voter_pk, candidate_pk in (
+        votes.iterator(chunk_size=2000)
+    ):
+        if (position_pk, reg_voter_pk, anon_voter_pk) != group:
+            group = (position_pk, reg_voter_pk, anon_voter_pk)
+            candidates = set()
+            seat = 0
+        if candidate_pk is not None and candidate_pk in candidates:
+            duplicates.append(pk)
+            affected_positions.add(position_pk)
+            continue
+        candidates.add(candidate_pk)
+        if seat:
+            seats.setdefault(seat, []).append(pk)
+        seat += 1
+
+    for i in range(0, len(duplicates), 500):
+        Vote.objects.filter(pk__in=duplicates[i:i+500]).delete()
+    # The tallies populated by 0009 still count the duplicates
+    affected_positions = sorted(affected_positions)
+    for i in range(0, len(affected_positions), 500):
+        positions = affected_positions[i:i+500]
+        VoteTally.objects.filter(position_id__in=positions).delete()
+        counts = Vote.objects.filter(
+            position_id__in=positions, candidate__isnull=False
+        ).values_list('position_id', 'candidate_id').annotate(
+            votes=Count('pk')
+        ).order_by()
+        VoteTally.objects.bulk_create([
+            VoteTally(
+                position_id=position_pk,
+                candidate_id=candidate_pk,
+                shard=0,
+                votes=votes
+            ) for position_pk, candidate_pk, votes in counts
+        ], batch_size=1000)
+    for seat, pks in seats.items():
+        for i in range(0, len(pks), 500):
+            Vote.objects.filter(pk__in=pks[i:i+500]).update(seat=seat)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0009_votetally'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='seat',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(assign_seats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('position', 'registered_voter', 'seat'), name='unique_registered_voter_seat'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('position', 'anonymous_voter', 'seat'), name='unique_anonymous_voter_seat'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('position', 'registered_voter', 'candidate'), name='unique_registered_voter_candidate'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('position', 'anonymous_voter', 'candidate'), name='unique_anonymous_voter_candidate'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('anonymous_voter__isnull', True), ('registered_voter__isnull', False)), models.Q(('anonymous_voter__isnull', False), ('registered_voter__isnull', True)), _connector='OR'), name='vote_has_one_voter'),
+        ),
+    ]
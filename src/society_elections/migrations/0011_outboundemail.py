@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-16 22:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0010_vote_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(editable=False, max_length=254)),
+                ('subject', models.CharField(editable=False, max_length=998)),
+                ('message', models.TextField(editable=False)),
+                ('html_message', models.TextField(blank=True, editable=False)),
+                ('from_email', models.CharField(blank=True, editable=False, max_length=254)),
+                ('sensitive', models.BooleanField(default=False, editable=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', editable=False, max_length=8)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('last_error', models.TextField(blank=True, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:10
+
+from django.db import migrations, models
+import society_elections.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0011_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='election',
+            name='candidate_email_domain_whitelist',
+            field=models.TextField(help_text='Newline-delimited list of email domains to accept when candidates nominate themselves in the election. Use *.example.com to accept any subdomain of example.com', validators=[society_elections.validators.domain_whitelist_validator]),
+        ),
+        migrations.AlterField(
+            model_name='election',
+            name='voter_email_domain_whitelist',
+            field=models.TextField(blank=True, help_text='Newline-delimited list of email domains to accept when voters sign up to vote in the election. Use *.example.com to accept any subdomain of example.com', null=True, validators=[society_elections.validators.domain_whitelist_validator]),
+        ),
+    ]
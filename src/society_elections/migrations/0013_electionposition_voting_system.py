@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0012_whitelist_wildcards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='electionposition',
+            name='voting_system',
+            field=models.CharField(choices=[('fptp', 'First-past-the-post'), ('stv', 'Single transferable vote (ranked)')], default='fptp', help_text='Whether voters vote for their choice(s), or rank the candidates in order of preference', max_length=4),
+        ),
+    ]
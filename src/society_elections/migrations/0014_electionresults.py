@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0013_electionposition_voting_system'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElectionResults',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('results', models.JSONField(editable=False)),
+                ('voters', models.PositiveIntegerField(editable=False)),
+                ('voters_voted', models.PositiveIntegerField(editable=False)),
+                ('votes_cast', models.PositiveIntegerField(editable=False)),
+                ('version', models.CharField(editable=False, max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('election', models.OneToOneField(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='frozen_results', to='society_elections.election')),
+            ],
+            options={
+                'verbose_name_plural': 'election results',
+            },
+        ),
+    ]
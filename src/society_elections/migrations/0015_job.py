@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('society_elections', '0014_electionresults'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(editable=False, max_length=64)),
+                ('description', models.CharField(editable=False, max_length=255)),
+                ('arguments', models.JSONField(default=dict, editable=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', editable=False, max_length=9)),
+                ('total', models.PositiveIntegerField(default=0, editable=False)),
+                ('processed', models.PositiveIntegerField(default=0, editable=False)),
+                ('cursor', models.CharField(blank=True, editable=False, max_length=64)),
+                ('error', models.TextField(blank=True, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(editable=False, null=True)),
+                ('heartbeat_at', models.DateTimeField(editable=False, null=True)),
+                ('finished_at', models.DateTimeField(editable=False, null=True)),
+                ('created_by', models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobOutput',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField(editable=False)),
+                ('data', models.BinaryField()),
+                ('job', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='outputs', to='society_elections.job')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='joboutput',
+            constraint=models.UniqueConstraint(fields=('job', 'sequence'), name='unique_job_output_sequence'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'created_at'], name='job_status_idx'),
+        ),
+    ]
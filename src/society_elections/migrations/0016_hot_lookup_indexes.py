@@ -0,0 +1,90 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:26
+
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def merge_duplicate_voters(apps, schema_editor):
+    """Merge the voters who registered with the same email in an election
+    more than once, so that the email can be made unique
+
+    The voter kept is the one with the most votes, then one who verified
+    their email, then the first to register. The votes of the others are
+    moved to it in positions it has not voted in, and deleted in the rest,
+    recounting the tallies of the positions they were deleted from.
+    """
+    RegisteredVoter = apps.get_model('society_elections', 'RegisteredVoter')
+    Vote = apps.get_model('society_elections', 'Vote')
+    VoteTally = apps.get_model('society_elections', 'VoteTally')
+    duplicated = RegisteredVoter.objects.values_list(
+        'election_id', 'email'
+    ).annotate(count=Count('pk')).filter(count__gt=1).order_by()
+    affected_positions = set()
+    for election_pk, email, _ in list(duplicated):
+        keep, *duplicates = RegisteredVoter.objects.filter(
+            election_id=election_pk, email=email
+        ).annotate(vote_count=Count('vote')).order_by(
+            '-vote_count', F('verified_at').asc(nulls_last=True),
+            'registered_at', 'pk'
+        )
+        voted_positions = set(Vote.objects.filter(
+            registered_voter=keep
+        ).values_list('position_id', flat=True))
+        for voter in duplicates:
+            positions = set(Vote.objects.filter(
+                registered_voter=voter
+            ).values_list('position_id', flat=True))
+            for position_pk in positions:
+                votes = Vote.objects.filter(
+                    registered_voter=voter, position_id=position_pk
+                )
+                if position_pk in voted_positions:
+                    votes.delete()
+                    affected_positions.add(position_pk)
+                else:
+                    votes.update(registered_voter=keep)
+                    voted_positions.add(position_pk)
+            voter.delete()
+
+    affected_positions = sorted(affected_positions)
+    for i in range(0, len(affected_positions), 500):
+        positions = affected_positions[i:i+500]
+        VoteTally.objects.filter(position_id__in=positions).delete()
+        counts = Vote.objects.filter(
+            position_id__in=positions, candidate__isnull=False
+        ).values_list('position_id', 'candidate_id').annotate(
+            votes=Count('pk')
+        ).order_by()
+        VoteTally.objects.bulk_create([
+            VoteTally(
+                position_id=position_pk,
+                candidate_id=candidate_pk,
+                shard=0,
+                votes=votes
+            ) for position_pk, candidate_pk, votes in counts
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0015_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['position', 'email'], name='candidate_position_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['email_uuid'], name='candidate_email_uuid_idx'),
+        ),
+        migrations.RunPython(
+            merge_duplicate_voters, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='registeredvoter',
+            constraint=models.UniqueConstraint(fields=('election', 'email'), name='unique_election_voter_email'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0016_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='votes', related_query_name='vote', to='society_elections.election'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'registered_voter'], name='vote_election_registered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'anonymous_voter'], name='vote_election_anonymous_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:30
+
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def backfill_vote_election(apps, schema_editor):
+    """Copy the election of each vote's position to the vote, a range of 
+    primary keys at a time. Each batch is committed on its own, so a large 
+    table is not locked for the whole backfill, and an interrupted backfill 
+    continues from the votes it has not reached
+    """
+    Vote = apps.get_model('society_elections', 'Vote')
+    ElectionPosition = apps.get_model('society_elections', 'ElectionPosition')
+    election = Subquery(ElectionPosition.objects.filter(
+        pk=OuterRef('position_id')
+    ).values('election_id')[:1])
+    votes = Vote.objects.filter(election__isnull=True)
+    start = votes.order_by('pk').values_list('pk', flat=True).first()
+    last = votes.order_by('-pk').values_list('pk', flat=True).first()
+    if start is None:
+        return
+    while start <= last:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            votes.filter(
+                pk__gte=start, pk__lt=start + BATCH_SIZE
+            ).update(election=election)
+        start += BATCH_SIZE
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('society_elections', '0017_vote_election'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vote_election, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0018_backfill_vote_election'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vote',
+            name='election',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', related_query_name='vote', to='society_elections.election'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+def erase_failed_sensitive_emails(apps, schema_editor):
+    """Erase the bodies of sensitive emails which failed before failed emails
+    were erased, as they still hold voters' passwords
+    """
+    OutboundEmail = apps.get_model('society_elections', 'OutboundEmail')
+    OutboundEmail.objects.filter(status='failed', sensitive=True).update(
+        message='', html_message=''
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0019_vote_election_not_null'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            erase_failed_sensitive_emails, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('society_elections', '0020_erase_failed_sensitive_emails'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='claim_token',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from .candidate import Candidate
 from .election import Election
 from .electionposition import ElectionPosition
+from .electionresults import ElectionResults
+from .job import Job, JobOutput
+from .outboundemail import OutboundEmail
 from .position import Position
+from .tally import VoteTally
 from .vote import Vote
 from .voter import AnonymousVoter, RegisteredVoter
@@ -1,6 +1,6 @@
 import uuid
+from typing import Optional
 
-from django.core.mail import send_mail
 from django.db import models
 from django.urls import reverse
 
@@ -8,6 +8,7 @@ from .. import app_settings
 from ..apps import SocietyElectionsConfig
 from .election import Election
 from .electionposition import ElectionPosition
+from .outboundemail import OutboundEmail
 
 
 class Candidate(models.Model):
@@ -23,6 +24,10 @@ class Candidate(models.Model):
             nomination. Added so that results can be overridden in the case 
             where a candidate can only hold one position but won two
         nominated_at (datetime): When the candidate was nominated
+        RON_EMAIL (str): Email used to identify the "Re-open Nominations" 
+            candidate of a position
+        ABSTAIN_EMAIL (str): Email used to identify the "Abstain" candidate of 
+            a position
     """
     position = models.ForeignKey(
         to=f'{SocietyElectionsConfig.name}.{ElectionPosition.__name__}',
@@ -54,29 +59,58 @@ class Candidate(models.Model):
         default=False
     )
 
+    RON_EMAIL = 'RON@example.com'
+    ABSTAIN_EMAIL = 'abstain@example.com'
+
+
+    def build_verification_email(self) -> Optional[OutboundEmail]:
+        """Build the verification email to the candidate, without queueing it
+
+        Returns:
+            OutboundEmail: Unsaved email asking the candidate to verify their
+                email, or None if the election does not verify candidates
+        """
+        election: Election = self.position.election
+        if not election.verify_candidate_emails:
+            return None
+        if self.email_uuid is None:
+            raise ValueError(
+                'UUID has not yet been set, cannot send verification email'
+            )
+        message = election.candidate_verification_email.format(
+            name=self.full_name,
+            position=self.position.position.title,
+            verify_url=self.verify_url
+        )
+        return OutboundEmail(
+            subject=f'Verify Email for Nomination in {election}',
+            message=message,
+            recipient=self.email,
+            html_message=message
+        )
+
 
     def send_verification_email(self):
-        """Send a verification email to the candidate
+        """Queue a verification email to the candidate
         
         Only send a verification email if this has been configured in the 
         election settings.
         """
-        if self.position.election.verify_candidate_emails:
-            if self.email_uuid is None:
-                raise ValueError(
-                    'UUID has not yet been set, cannot send verification email'
-                )
-            election: Election = self.position.election
-            message = election.candidate_verification_email.format(
-                name=self.full_name,
-                position=self.position.position.title,
-                verify_url=self.verify_url
-            )
-            send_mail(
-                f'Verify Email for Nomination in {self.position.election}',
-                message, None, [self.email,], 
-                html_message=message
-            )
+        email = self.build_verification_email()
+        if email is not None:
+            OutboundEmail.queue_many([email])
+
+
+    @property
+    def is_ron(self) -> bool:
+        """bool: True if this candidate represents re-opening nominations"""
+        return self.email == self.RON_EMAIL
+
+
+    @property
+    def is_abstain(self) -> bool:
+        """bool: True if this candidate represents abstaining from the vote"""
+        return self.email == self.ABSTAIN_EMAIL
 
 
     @property
@@ -103,3 +137,16 @@ class Candidate(models.Model):
 
     def __str__(self):
         return f'{self.full_name} for {self.position.position}'
+
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['position', 'email'],
+                name='candidate_position_email_idx'
+            ),
+            models.Index(
+                fields=['email_uuid'],
+                name='candidate_email_uuid_idx'
+            ),
+        ]
@@ -1,7 +1,13 @@
+from datetime import datetime
+from typing import Optional
+
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from ..validators import domain_whitelist_validator
+from ..whitelist import DomainWhitelist, compile_whitelist
+
 
 class Election(models.Model):
     f"""A first-past-the-post election
@@ -82,13 +88,17 @@ class Election(models.Model):
     )
     voter_email_domain_whitelist = models.TextField(
         help_text='Newline-delimited list of email domains to accept when '
-        'voters sign up to vote in the election',
+        'voters sign up to vote in the election. Use *.example.com to accept '
+        'any subdomain of example.com',
         blank=True,
-        null=True
+        null=True,
+        validators=[domain_whitelist_validator]
     )
     candidate_email_domain_whitelist = models.TextField(
         help_text='Newline-delimited list of email domains to accept when '
-        'candidates nominate themselves in the election'
+        'candidates nominate themselves in the election. Use *.example.com '
+        'to accept any subdomain of example.com',
+        validators=[domain_whitelist_validator]
     )
     email_winners = models.BooleanField(
         default=False
@@ -163,7 +173,7 @@ class Election(models.Model):
     def current_period(self) -> str:
         """str: Returns the period the election is currently in"""
         now = timezone.now()
-        if self.ended_by is not None:
+        if self.ended_by_id is not None:
             return self.FINISHED
         elif self.nominations_start <= now and self.nominations_end > now:
             return self.NOMINATIONS
@@ -175,6 +185,32 @@ class Election(models.Model):
             return self.PRENOMINATION
         else:
             return self.POSTVOTING
+
+    @property
+    def voter_whitelist(self) -> DomainWhitelist:
+        """DomainWhitelist: Compiled voter_email_domain_whitelist"""
+        return compile_whitelist(self.voter_email_domain_whitelist)
+
+    @property
+    def candidate_whitelist(self) -> DomainWhitelist:
+        """DomainWhitelist: Compiled candidate_email_domain_whitelist"""
+        return compile_whitelist(self.candidate_email_domain_whitelist)
+
+    @property
+    def next_period_change(self) -> Optional[datetime]:
+        """datetime: When the election next changes period, or None if it 
+        will not change period again
+        """
+        if self.ended_by_id is not None:
+            return None
+        now = timezone.now()
+        boundaries = [
+            boundary for boundary in (
+                self.nominations_start, self.nominations_end,
+                self.voting_start, self.voting_end
+            ) if boundary > now
+        ]
+        return min(boundaries, default=None)
         
 
     class Meta:
@@ -21,7 +21,20 @@ class ElectionPosition(models.Model):
             candidate for this position
         positions_available (int): How many nominees can be successful in 
             applying for this position 
+        voting_system (str): Whether voters vote for up to 
+            positions_available candidates, counted first-past-the-post, or 
+            rank the candidates in order of preference, counted with STV
+        FPTP (str): Represents first-past-the-post voting
+        STV (str): Represents ranked voting counted with the single 
+            transferable vote
     """
+    FPTP = 'fptp'
+    STV = 'stv'
+    VOTING_SYSTEM_CHOICES = [
+        (FPTP, 'First-past-the-post'),
+        (STV, 'Single transferable vote (ranked)'),
+    ]
+
     position = models.ForeignKey(
         to=f'{SocietyElectionsConfig.name}.{Position.__name__}',
         on_delete=models.CASCADE
@@ -51,6 +64,18 @@ class ElectionPosition(models.Model):
         default=1,
         help_text='Number of available positions for this role'
     )
+    voting_system = models.CharField(
+        max_length=4,
+        choices=VOTING_SYSTEM_CHOICES,
+        default=FPTP,
+        help_text='Whether voters vote for their choice(s), or rank the '
+        'candidates in order of preference'
+    )
+
+    @property
+    def is_ranked(self) -> bool:
+        """bool: True if voters rank the candidates for this position"""
+        return self.voting_system == self.STV
 
     def __str__(self):
         return f'{self.position.title} in {self.election.admin_title}'
@@ -0,0 +1,73 @@
+from django.db import models
+
+from ..apps import SocietyElectionsConfig
+from .election import Election
+
+
+class ElectionResults(models.Model):
+    f"""The final results of an election, frozen when the election ends
+
+    The results are counted once, by results.freeze_results, and stored as
+    JSON so that they can be displayed without reading the votes. A snapshot
+    cannot be changed once created. To count an election again, delete its
+    snapshot and end it again.
+
+    Attributes:
+        election ({Election.__name__}): The election the results are of
+        results (dict): Vote totals, winners, and seats reopened of every
+            position of the election
+        voters (int): Number of voters eligible to vote
+        voters_voted (int): Number of voters who cast at least one vote
+        votes_cast (int): Number of votes cast in the election
+        version (str): Hash of the results, which identifies the snapshot
+        created_at (datetime): When the results were frozen
+    """
+    election = models.OneToOneField(
+        to=f'{SocietyElectionsConfig.name}.{Election.__name__}',
+        on_delete=models.CASCADE,
+        related_name='frozen_results',
+        editable=False
+    )
+    results = models.JSONField(
+        editable=False
+    )
+    voters = models.PositiveIntegerField(
+        editable=False
+    )
+    voters_voted = models.PositiveIntegerField(
+        editable=False
+    )
+    votes_cast = models.PositiveIntegerField(
+        editable=False
+    )
+    version = models.CharField(
+        max_length=32,
+        editable=False
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False
+    )
+
+    @property
+    def turnout(self) -> float:
+        """float: Fraction of the eligible voters who voted"""
+        if not self.voters:
+            return 0.0
+        return self.voters_voted / self.voters
+
+    def save(self, *args, **kwargs):
+        """Save a new snapshot
+
+        Raises:
+            ValueError: The snapshot already exists
+        """
+        if not self._state.adding:
+            raise ValueError('Frozen election results cannot be changed')
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'Results of {self.election}'
+
+    class Meta:
+        verbose_name_plural = 'election results'
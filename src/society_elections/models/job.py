@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.db import models
+
+from ..apps import SocietyElectionsConfig
+
+
+class Job(models.Model):
+    f"""A long running task, queued by an admin action and run in chunks by
+    the run_jobs command
+
+    Each chunk is processed in its own transaction, which also saves the
+    progress of the job. A job which fails, or whose worker stops, resumes
+    from the end of the last chunk processed. Each worker claiming the job
+    gives it a new claim token, and only saves its progress while the token
+    is still its own.
+
+    Attributes:
+        kind (str): Name of the function in jobs.JOB_KINDS which runs the job
+        description (str): Description of the job shown in the admin
+        arguments (dict): Arguments of the job, e.g. the PKs to process
+        status (str): Whether the job is pending, running, has succeeded, or
+            has failed
+        total (int): Number of items the job processes
+        processed (int): Number of items processed so far
+        cursor (str): Key of the last item processed, for jobs which page
+            through a query
+        error (str): Error raised by the last failed attempt
+        created_by ({settings.AUTH_USER_MODEL}): Who queued the job
+        created_at (datetime): When the job was queued
+        started_at (datetime): When the job was last started or resumed
+        heartbeat_at (datetime): When the running job last saved its progress
+        claim_token (UUID): Token of the worker which last claimed the job
+        finished_at (datetime): When the job succeeded or failed
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(
+        max_length=64,
+        editable=False
+    )
+    description = models.CharField(
+        max_length=255,
+        editable=False
+    )
+    arguments = models.JSONField(
+        default=dict,
+        editable=False
+    )
+    status = models.CharField(
+        max_length=9,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        editable=False
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    cursor = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False
+    )
+    error = models.TextField(
+        blank=True,
+        editable=False
+    )
+    created_by = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        editable=False
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        editable=False
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        editable=False
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        editable=False
+    )
+    claim_token = models.UUIDField(
+        null=True,
+        editable=False
+    )
+
+    @property
+    def progress(self) -> float:
+        """float: Fraction of the items which have been processed"""
+        if not self.total:
+            return 1.0 if self.status == self.SUCCEEDED else 0.0
+        return min(1.0, self.processed / self.total)
+
+    def __str__(self):
+        return f'{self.description} ({self.status})'
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'created_at'],
+                name='job_status_idx'
+            ),
+        ]
+
+
+class JobOutput(models.Model):
+    f"""A chunk of the file produced by a job
+
+    The chunks of a job are concatenated, in order, to download its result.
+
+    Attributes:
+        job ({Job.__name__}): The job which produced the chunk
+        sequence (int): Position of the chunk in the file
+        data (bytes): Content of the chunk
+    """
+    job = models.ForeignKey(
+        to=f'{SocietyElectionsConfig.name}.{Job.__name__}',
+        on_delete=models.CASCADE,
+        related_name='outputs',
+        editable=False
+    )
+    sequence = models.PositiveIntegerField(
+        editable=False
+    )
+    data = models.BinaryField(
+        editable=False
+    )
+
+    def __str__(self):
+        return f'Chunk {self.sequence} of {self.job}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'sequence'],
+                name='unique_job_output_sequence'
+            ),
+        ]
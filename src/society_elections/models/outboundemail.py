@@ -0,0 +1,189 @@
+from datetime import timedelta
+from typing import List
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .. import app_settings
+
+
+class OutboundEmail(models.Model):
+    """An email waiting to be sent, or which has been sent, by the
+    send_queued_mail command
+
+    Views queue emails rather than sending them during the request, so slow or
+    unavailable mail servers do not affect response times. Emails which fail
+    to send are retried with an exponentially increasing delay.
+
+    Attributes:
+        recipient (str): Email address the email is sent to
+        subject (str): Subject of the email
+        message (str): Plain text body of the email
+        html_message (str): Optional HTML body of the email
+        from_email (str): Optional sender, DEFAULT_FROM_EMAIL if empty
+        sensitive (bool): Whether the body contains a secret, such as a voting
+            password, and should be erased once the email is sent or has
+            failed, and hidden from the admin
+        status (str): Whether the email is pending, sent, or has failed to
+            send too many times
+        attempts (int): Number of times sending the email has been attempted
+        next_attempt_at (datetime): Earliest time to next try to send the
+            email
+        last_error (str): Error raised by the last failed attempt
+        created_at (datetime): When the email was queued
+        sent_at (datetime): When the email was sent
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    recipient = models.EmailField(
+        editable=False
+    )
+    subject = models.CharField(
+        max_length=998,
+        editable=False
+    )
+    message = models.TextField(
+        editable=False
+    )
+    html_message = models.TextField(
+        blank=True,
+        editable=False
+    )
+    from_email = models.CharField(
+        max_length=254,
+        blank=True,
+        editable=False
+    )
+    sensitive = models.BooleanField(
+        default=False,
+        editable=False
+    )
+    status = models.CharField(
+        max_length=8,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        editable=False
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False
+    )
+    last_error = models.TextField(
+        blank=True,
+        editable=False
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        editable=False
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False
+    )
+
+    @classmethod
+    def queue(
+        cls,
+        subject: str,
+        message: str,
+        recipient: str,
+        html_message: str='',
+        from_email: str='',
+        sensitive: bool=False
+    ) -> None:
+        """Queue an email to be sent once the current transaction commits
+
+        If there is no transaction, the email is queued immediately. Emails
+        are not queued if the transaction is rolled back, e.g. because the
+        voter or candidate being emailed could not be saved.
+
+        Args:
+            subject (str): Subject of the email
+            message (str): Plain text body of the email
+            recipient (str): Email address to send the email to
+            html_message (str, optional): HTML body of the email. Defaults to
+                ''.
+            from_email (str, optional): Sender of the email. Defaults to
+                DEFAULT_FROM_EMAIL.
+            sensitive (bool, optional): Whether to erase the body of the email
+                once it is sent. Defaults to False.
+        """
+        cls.queue_many([cls(
+            subject=subject,
+            message=message,
+            recipient=recipient,
+            html_message=html_message,
+            from_email=from_email,
+            sensitive=sensitive
+        )])
+
+    @classmethod
+    def queue_many(cls, emails: List['OutboundEmail']) -> None:
+        """Queue unsaved emails with a single query once the current
+        transaction commits
+
+        Args:
+            emails (list): Unsaved OutboundEmails to queue
+        """
+        if emails:
+            transaction.on_commit(lambda: cls.objects.bulk_create(emails))
+
+    def erase_if_sensitive(self) -> None:
+        """Erase the body of the email if it contains a secret"""
+        if self.sensitive:
+            self.message = ''
+            self.html_message = ''
+
+    def mark_sent(self) -> None:
+        """Record that the email was sent, erasing it if sensitive"""
+        self.attempts += 1
+        self.status = self.SENT
+        self.sent_at = timezone.now()
+        self.last_error = ''
+        self.erase_if_sensitive()
+
+    def mark_failed(self, error: Exception) -> None:
+        """Record a failed attempt to send the email
+
+        The email is retried after app_settings.OUTBOX_RETRY_DELAY seconds,
+        doubling after every attempt, until it has been attempted
+        app_settings.OUTBOX_MAX_ATTEMPTS times. Sensitive emails are erased
+        once they have failed, as they will not be sent.
+
+        Args:
+            error (Exception): Error raised while sending the email
+        """
+        self.attempts += 1
+        self.last_error = f'{type(error).__name__}: {error}'
+        if self.attempts >= app_settings.OUTBOX_MAX_ATTEMPTS:
+            self.status = self.FAILED
+            self.erase_if_sensitive()
+        else:
+            self.next_attempt_at = timezone.now() + timedelta(
+                seconds=app_settings.OUTBOX_RETRY_DELAY * 2 ** (
+                    self.attempts - 1
+                )
+            )
+
+    def __str__(self):
+        return f'{self.subject} to {self.recipient} ({self.status})'
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbound_email_due_idx'
+            )
+        ]
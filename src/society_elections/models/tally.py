@@ -0,0 +1,175 @@
+import random
+from typing import Dict, Tuple
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, F, Q, When
+
+from .. import app_settings
+from ..apps import SocietyElectionsConfig
+from .candidate import Candidate
+from .election import Election
+from .electionposition import ElectionPosition
+from .vote import Vote
+
+
+class VoteTally(models.Model):
+    f"""Denormalized count of the votes for a candidate in a position
+
+    Counts are split over a number of shards, so that voters voting for the
+    same candidate at the same time do not all wait to update the same row.
+    The number of votes for a candidate is the sum of the votes of all its
+    shards, and an individual shard may be negative if a vote was added to
+    one shard and removed from another.
+
+    Attributes:
+        position ({ElectionPosition.__name__}): The position being voted for
+        candidate ({Candidate.__name__}): The candidate being counted
+        shard (int): Which shard of the candidate's count this row holds
+        votes (int): Number of votes counted in this shard
+    """
+    position = models.ForeignKey(
+        to=f'{SocietyElectionsConfig.name}.{ElectionPosition.__name__}',
+        on_delete=models.CASCADE,
+        related_name='tallies',
+        related_query_name='tally',
+        editable=False
+    )
+    candidate = models.ForeignKey(
+        to=f'{SocietyElectionsConfig.name}.{Candidate.__name__}',
+        on_delete=models.CASCADE,
+        related_name='tallies',
+        related_query_name='tally',
+        editable=False
+    )
+    shard = models.PositiveSmallIntegerField(
+        editable=False
+    )
+    votes = models.IntegerField(
+        default=0,
+        editable=False
+    )
+
+    @classmethod
+    def increment(
+        cls, position_pk: int, candidate_pk: int, amount: int=1
+    ) -> None:
+        """Add to the number of votes for a candidate
+
+        A random shard is chosen and updated with an F() expression, creating
+        the shard if it does not yet exist. Should be called in the same
+        transaction as the vote is created, changed, or deleted.
+
+        Args:
+            position_pk (int): PK of the ElectionPosition voted for
+            candidate_pk (int): PK of the Candidate voted for
+            amount (int, optional): Number of votes to add, negative to remove
+                votes. Defaults to 1.
+        """
+        shard = random.randrange(app_settings.TALLY_SHARDS)
+        tally = cls.objects.filter(
+            position_id=position_pk, candidate_id=candidate_pk, shard=shard
+        )
+        if tally.update(votes=F('votes') + amount):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    position_id=position_pk,
+                    candidate_id=candidate_pk,
+                    shard=shard,
+                    votes=amount
+                )
+        except IntegrityError:
+            # Shard was created concurrently
+            tally.update(votes=F('votes') + amount)
+
+    @classmethod
+    def increment_many(cls, amounts: Dict[Tuple[int, int], int]) -> None:
+        """Add to the number of votes for several candidates at once
+
+        All the candidates are counted in the same randomly chosen shard, so 
+        the changes are made with a fixed number of queries however many 
+        candidates there are: the shards which do not exist yet are created 
+        with one bulk_create, and the rest updated with one UPDATE.
+
+        Args:
+            amounts (dict): Number of votes to add, negative to remove votes, 
+                keyed by (ElectionPosition PK, Candidate PK)
+        """
+        amounts = {key: amount for key, amount in amounts.items() if amount}
+        if len(amounts) <= 1:
+            for (position_pk, candidate_pk), amount in amounts.items():
+                cls.increment(position_pk, candidate_pk, amount)
+            return
+
+        shard = random.randrange(app_settings.TALLY_SHARDS)
+        in_amounts = Q()
+        for position_pk, candidate_pk in amounts:
+            in_amounts |= Q(position_id=position_pk, candidate_id=candidate_pk)
+        tallies = cls.objects.filter(in_amounts, shard=shard)
+        existing = set(tallies.values_list('position_id', 'candidate_id'))
+        missing = [key for key in amounts if key not in existing]
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create([
+                    cls(
+                        position_id=position_pk,
+                        candidate_id=candidate_pk,
+                        shard=shard,
+                        votes=amounts[position_pk, candidate_pk]
+                    ) for position_pk, candidate_pk in missing
+                ])
+        except IntegrityError:
+            # Some shards were created concurrently, count these candidates 
+            # one at a time instead
+            for position_pk, candidate_pk in missing:
+                cls.increment(
+                    position_pk, candidate_pk, amounts[position_pk, candidate_pk]
+                )
+        if existing:
+            tallies.filter(
+                candidate_id__in=[key[1] for key in existing]
+            ).update(votes=F('votes') + Case(*[
+                When(
+                    position_id=position_pk,
+                    candidate_id=candidate_pk,
+                    then=amounts[position_pk, candidate_pk]
+                ) for position_pk, candidate_pk in existing
+            ], default=0))
+
+    @classmethod
+    def rebuild(cls, election: Election) -> None:
+        """Recalculate the tallies of an election from its votes
+
+        Use this if votes have been changed outside of the voting views, e.g.
+        in the admin interface.
+
+        Args:
+            election (Election): Election to recalculate the tallies of
+        """
+        with transaction.atomic():
+            cls.objects.filter(position__election=election).delete()
+            counts = Vote.objects.filter(
+                election=election, candidate__isnull=False
+            ).values_list('position_id', 'candidate_id').annotate(
+                votes=Count('pk')
+            ).order_by()
+            cls.objects.bulk_create([
+                cls(
+                    position_id=position_pk,
+                    candidate_id=candidate_pk,
+                    shard=0,
+                    votes=votes
+                ) for position_pk, candidate_pk, votes in counts
+            ])
+
+    def __str__(self):
+        return f'{self.candidate} ({self.shard}): {self.votes}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['position', 'candidate', 'shard'],
+                name='unique_vote_tally_shard'
+            )
+        ]
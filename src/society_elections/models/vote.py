@@ -2,6 +2,7 @@ from django.db import models
 
 from ..apps import SocietyElectionsConfig
 from .candidate import Candidate
+from .election import Election
 from .electionposition import ElectionPosition
 from .voter import AnonymousVoter, RegisteredVoter
 
@@ -17,6 +18,14 @@ class Vote(models.Model):
             election if the election is anonymous
         candidate ({Candidate.__name__}): Candidate in the election
         position ({ElectionPosition.__name__}): The position being voted for
+        election ({Election.__name__}): The election of the position, copied 
+            from it when the vote is saved so that election-wide queries need 
+            not join the positions
+        seat (int): Which of the positions available the vote fills, from 0 
+            to positions_available - 1. Each voter may only fill each seat 
+            once, which limits the number of votes a voter can cast. In 
+            ranked positions, the preference the vote expresses, from 0 for 
+            the voter's first preference
         ron (bool): Whether or not the voter voted to re-open nominations
         abstain (bool): Whether or not the voter voter to abstain
         vote_cast_at (datetime): Time the vote was cast
@@ -50,6 +59,17 @@ class Vote(models.Model):
         related_query_name='vote',
         editable=False
     )
+    election = models.ForeignKey(
+        to=f'{SocietyElectionsConfig.name}.{Election.__name__}',
+        on_delete=models.CASCADE,
+        related_name='votes',
+        related_query_name='vote',
+        editable=False,
+        db_index=False # Leads the composite indexes in Meta
+    )
+    seat = models.PositiveSmallIntegerField(
+        editable=False
+    )
     vote_cast_at = models.DateTimeField(
         auto_now_add=True,
         editable=False
@@ -80,5 +100,64 @@ class Vote(models.Model):
         else:
             return str(self.anonymous_voter.pk)
 
+    def save(self, *args, **kwargs):
+        """Take the voter's first free seat in the position if a seat has 
+        not been given, and copy the election of the position
+        """
+        if self.election_id is None:
+            self.election_id = self.position.election_id
+        if self.seat is None:
+            seats = set(Vote.objects.filter(
+                position_id=self.position_id,
+                registered_voter_id=self.registered_voter_id,
+                anonymous_voter_id=self.anonymous_voter_id
+            ).values_list('seat', flat=True))
+            self.seat = 0
+            while self.seat in seats:
+                self.seat += 1
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.voter_str} voting {self.candidate}'
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['election', 'registered_voter'],
+                name='vote_election_registered_idx'
+            ),
+            models.Index(
+                fields=['election', 'anonymous_voter'],
+                name='vote_election_anonymous_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['position', 'registered_voter', 'seat'],
+                name='unique_registered_voter_seat'
+            ),
+            models.UniqueConstraint(
+                fields=['position', 'anonymous_voter', 'seat'],
+                name='unique_anonymous_voter_seat'
+            ),
+            models.UniqueConstraint(
+                fields=['position', 'registered_voter', 'candidate'],
+                name='unique_registered_voter_candidate'
+            ),
+            models.UniqueConstraint(
+                fields=['position', 'anonymous_voter', 'candidate'],
+                name='unique_anonymous_voter_candidate'
+            ),
+            models.CheckConstraint(
+                check=(
+                    models.Q(
+                        registered_voter__isnull=False,
+                        anonymous_voter__isnull=True
+                    ) | models.Q(
+                        registered_voter__isnull=True,
+                        anonymous_voter__isnull=False
+                    )
+                ),
+                name='vote_has_one_voter'
+            ),
+        ]
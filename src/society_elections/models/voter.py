@@ -2,7 +2,6 @@ import secrets
 import uuid
 from hashlib import sha512
 
-from django.core.mail import send_mail
 from django.db import models
 from django.urls import reverse
 
@@ -10,6 +9,7 @@ from .. import app_settings
 from ..apps import SocietyElectionsConfig
 from ..validators import email_user_validator
 from .election import Election
+from .outboundemail import OutboundEmail
 
 
 class RegisteredVoter(models.Model):
@@ -25,7 +25,7 @@ class RegisteredVoter(models.Model):
         election ({Election.__name__}): The election the voter is signed up to
             vote in
         email (str): Email of the registered voter - required to resend 
-            verification emails
+            verification emails. Unique within an election
         verified (bool): Has the voter verified their email address
         registered_at (datetime): The time the voter registered
         verified_at (datetime): When the voter verified their email
@@ -67,8 +67,25 @@ class RegisteredVoter(models.Model):
             ) + f'?uuid={self.pk}'
         )
 
+    def build_verification_email(self) -> OutboundEmail:
+        """Build the verification email to the voter, without queueing it
+
+        Returns:
+            OutboundEmail: Unsaved email asking the voter to verify their email
+        """
+        message = self.election.voter_verification_email.format(
+            email=self.email,
+            verify_url=self.verify_url
+        )
+        return OutboundEmail(
+            subject=f'Verify Email for Voting in {self.election}',
+            message=message,
+            recipient=self.email,
+            html_message=message
+        )
+
     def send_verification_email(self) -> None:
-        """Sends a verification email to the voter
+        """Queues a verification email to the voter
 
         Raises:
             ValueError: Voter has not yet been saved to the database
@@ -81,18 +98,19 @@ class RegisteredVoter(models.Model):
                 'email until we have a primary key to validate against.'
             )
         else:
-            message = self.election.voter_verification_email.format(
-                email=self.email,
-                verify_url=self.verify_url
-            )
-            send_mail(
-                f'Verify Email for Voting in {self.election}',
-                message, None, [self.email,], html_message=message
-            )
+            OutboundEmail.queue_many([self.build_verification_email()])
 
     def __str__(self):
         return str(self.id)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['election', 'email'],
+                name='unique_election_voter_email'
+            ),
+        ]
+
 
 class AnonymousVoter(models.Model):
     f"""Represents an Anonymized voter in the database
@@ -144,5 +162,34 @@ class AnonymousVoter(models.Model):
         hash.update(password.encode())
         return hash.digest()
 
+    @staticmethod
+    def build_password_email(
+        election: Election, email: str, password: str
+    ) -> OutboundEmail:
+        """Build the email giving a voter their password, without queueing it
+
+        The email is marked as sensitive, so it is erased once sent.
+
+        Args:
+            election (Election): Election the voter is voting in
+            email (str): Email address of the voter
+            password (str): Unhashed password of the voter
+
+        Returns:
+            OutboundEmail: Unsaved email containing the password
+        """
+        vote_url = app_settings.ROOT_URL + reverse('society_elections:vote')
+        message = f'''<p>You have successfully verified your email to vote in the election "{election}"". Your password to vote is shown below. Keep it safe and confidential as it identifies you as a voter.<p>
+        <p><b>{password}<b><p>
+        <p><a href="{vote_url}">Click here</a> to vote, or copy and paste the following link into your browser: <code>{vote_url}</code></p>
+        '''
+        return OutboundEmail(
+            subject=f'Voting password for election {election}',
+            message=message,
+            recipient=email,
+            html_message=message,
+            sensitive=True
+        )
+
     def __str__(self):
         return str(self.pk)
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Sends the emails queued in OutboundEmail
+
+Emails are sent in batches, over a single connection to the mail server per
+batch. Each batch is locked with SELECT ... FOR UPDATE SKIP LOCKED where the
+database supports it, so several workers can drain the queue at once without
+sending an email twice. When app_settings.OUTBOX_NEVER_SEND is set, emails to
+recipients matching it are left in the queue unsent.
+"""
+import logging
+from typing import NamedTuple
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import app_settings
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxResult(NamedTuple):
+    """The result of sending a batch of queued emails
+
+    Attributes:
+        sent (int): Number of emails sent
+        failed (int): Number of emails which could not be sent, and will be
+            retried unless they have been attempted too many times
+    """
+    sent: int
+    failed: int
+
+
+def build_message(
+    email: OutboundEmail, connection=None
+) -> EmailMultiAlternatives:
+    """Build the message to send for a queued email
+
+    Args:
+        email (OutboundEmail): Queued email
+        connection (optional): Email backend to send the message with
+
+    Returns:
+        EmailMultiAlternatives: Message, with the HTML body as an alternative
+    """
+    message = EmailMultiAlternatives(
+        email.subject, email.message, email.from_email or None,
+        [email.recipient,], connection=connection
+    )
+    if email.html_message:
+        message.attach_alternative(email.html_message, 'text/html')
+    return message
+
+
+def send_queued_mail(batch_size: int=None) -> OutboxResult:
+    """Send a batch of the emails which are due to be sent
+
+    Args:
+        batch_size (int, optional): Maximum number of emails to send. Defaults
+            to app_settings.OUTBOX_BATCH_SIZE.
+
+    Returns:
+        OutboxResult: Number of emails sent and failed
+    """
+    if batch_size is None:
+        batch_size = app_settings.OUTBOX_BATCH_SIZE
+    sent = failed = 0
+    due = OutboundEmail.objects.filter(
+        status=OutboundEmail.PENDING, next_attempt_at__lte=timezone.now()
+    )
+    if app_settings.OUTBOX_NEVER_SEND:
+        due = due.exclude(recipient__regex=app_settings.OUTBOX_NEVER_SEND)
+    with transaction.atomic():
+        batch = list(due.select_for_update(skip_locked=True).order_by(
+            'next_attempt_at', 'pk'
+        )[:batch_size])
+        if not batch:
+            return OutboxResult(0, 0)
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.exception('Could not connect to mail server')
+            for email in batch:
+                email.mark_failed(e)
+            failed = len(batch)
+        else:
+            try:
+                for email in batch:
+                    try:
+                        build_message(email, connection).send()
+                    except Exception as e:
+                        logger.warning(f'Failed to send email {email.pk}: {e}')
+                        email.mark_failed(e)
+                        failed += 1
+                    else:
+                        email.mark_sent()
+                        sent += 1
+            finally:
+                connection.close()
+
+        OutboundEmail.objects.bulk_update(batch, [
+            'status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at',
+            'message', 'html_message'
+        ])
+    logger.info(f'Sent {sent} queued emails, {failed} failed')
+    return OutboxResult(sent, failed)
@@ -0,0 +1,474 @@
+"""Calculates the results of an election
+
+Votes are tallied in the database with a single aggregate over every position
+in the election, rather than by iterating over the votes of each position in
+Python. Winners are then selected for each position in memory, and saved back
+to the database with a single bulk update.
+
+Ranked positions are instead counted with STV, from the preferences of every
+voter, streamed from the database in order and packed into arrays.
+
+When an election ends, its results are frozen into an ElectionResults
+snapshot, from which the public results page is served without reading the
+votes again.
+"""
+import hashlib
+import itertools
+import json
+import logging
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+
+from .models import (Candidate, Election, ElectionPosition, ElectionResults,
+                     OutboundEmail, Vote, VoteTally)
+from .stv import StvResult, count_stv, pack_ballots
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateResult(NamedTuple):
+    """The result of a single candidate in a position
+
+    Attributes:
+        candidate (Candidate): The candidate in question
+        votes (int): Number of votes the candidate received
+        successful (bool): Whether or not the candidate won a seat
+    """
+    candidate: Candidate
+    votes: int
+    successful: bool
+
+
+class PositionResult(NamedTuple):
+    """The result of a single position in an election
+
+    Attributes:
+        position (ElectionPosition): The position in question
+        candidates (list): List of CandidateResult, ordered by votes received
+        tied (list): Candidates tied for the last available seat(s). These
+            candidates are not marked as successful, and the tie must be
+            resolved manually
+        seats_reopened (int): Number of seats which no candidate won, either
+            because there were not enough candidates receiving votes, or
+            because too few candidates received more votes than RON
+        count (StvResult): Rounds of the count of a ranked position, None
+            for first-past-the-post positions
+    """
+    position: ElectionPosition
+    candidates: List[CandidateResult]
+    tied: List[Candidate]
+    seats_reopened: int
+    count: Optional[StvResult] = None
+
+    @property
+    def winners(self) -> List[Candidate]:
+        """list: Candidates who were successful in this position"""
+        return [
+            result.candidate for result in self.candidates
+            if result.successful
+        ]
+
+
+def count_votes(election: Election) -> Dict[int, Dict[int, int]]:
+    """Count the votes for every candidate in an election
+
+    This is performed with a single GROUP BY query over the votes of the
+    election.
+
+    Args:
+        election (Election): Election to count the votes of
+
+    Returns:
+        dict: Mapping of ElectionPosition PK to a mapping of Candidate PK to
+            the number of votes the candidate received
+    """
+    counts: Dict[int, Dict[int, int]] = {}
+    rows = Vote.objects.filter(
+        election=election, candidate__isnull=False
+    ).values_list('position_id', 'candidate_id').annotate(
+        votes=Count('pk')
+    ).order_by()
+    for position_pk, candidate_pk, votes in rows:
+        counts.setdefault(position_pk, {})[candidate_pk] = votes
+    return counts
+
+
+def count_live_votes(election: Election) -> Dict[int, Dict[int, int]]:
+    """Count the votes for every candidate in an election from the tallies
+
+    Reads the VoteTally shards rather than the votes, so the cost depends on 
+    the number of candidates rather than the number of votes. Suitable for 
+    live counts while voting is taking place.
+
+    Args:
+        election (Election): Election to count the votes of
+
+    Returns:
+        dict: Mapping of ElectionPosition PK to a mapping of Candidate PK to
+            the number of votes the candidate received
+    """
+    counts: Dict[int, Dict[int, int]] = {}
+    rows = VoteTally.objects.filter(position__election=election).values_list(
+        'position_id', 'candidate_id'
+    ).annotate(votes=Sum('votes')).order_by()
+    for position_pk, candidate_pk, votes in rows:
+        counts.setdefault(position_pk, {})[candidate_pk] = votes
+    return counts
+
+
+def iter_ranked_ballots(
+    election: Election
+) -> Iterator[Tuple[int, List[int]]]:
+    """Iterate over the ballots of the ranked positions of an election
+
+    The votes are streamed in order of position, voter, and preference, so
+    only one ballot is held in memory at a time.
+
+    Args:
+        election (Election): Election to get the ballots of
+
+    Yields:
+        tuple: ElectionPosition PK, and the Candidate PKs of a voter's ballot
+            in order of preference
+    """
+    rows = Vote.objects.filter(
+        election=election,
+        position__voting_system=ElectionPosition.STV,
+        candidate__isnull=False
+    ).order_by(
+        'position_id', 'registered_voter_id', 'anonymous_voter_id', 'seat'
+    ).values_list(
+        'position_id', 'registered_voter_id', 'anonymous_voter_id',
+        'candidate_id'
+    ).iterator(chunk_size=5000)
+    for (position_pk, _, _), ballot in itertools.groupby(
+        rows, key=lambda row: row[:3]
+    ):
+        yield position_pk, [row[3] for row in ballot]
+
+
+def count_ranked_votes(
+    election: Election
+) -> Dict[int, List[List[int]]]:
+    """Get the ballots of every ranked position in an election
+
+    Args:
+        election (Election): Election to get the ballots of
+
+    Returns:
+        dict: Mapping of ElectionPosition PK to a list of ballots, each the
+            Candidate PKs voted for in order of preference
+    """
+    ballots: Dict[int, List[List[int]]] = {}
+    for position_pk, ballot in iter_ranked_ballots(election):
+        ballots.setdefault(position_pk, []).append(ballot)
+    return ballots
+
+
+def select_winners(
+    position: ElectionPosition,
+    candidates: List[Candidate],
+    counts: Dict[int, int]
+) -> PositionResult:
+    """Select the winners of a first-past-the-post position
+
+    The candidates with the most votes win the available seats. Abstentions
+    are never successful, and a candidate must receive more votes than RON
+    (or more than zero votes if RON is not allowed) to be successful. Any
+    seats which cannot be filled are reopened. If candidates are tied for the
+    last seat(s), none of the tied candidates are successful.
+
+    Args:
+        position (ElectionPosition): The position to select winners for
+        candidates (list): All candidates standing for the position
+        counts (dict): Mapping of Candidate PK to the number of votes received
+
+    Returns:
+        PositionResult: Result of the position
+    """
+    ron_votes = 0
+    contenders = []
+    candidate: Candidate
+    for candidate in candidates:
+        if candidate.is_ron:
+            ron_votes = counts.get(candidate.pk, 0)
+        elif not candidate.is_abstain and candidate.email_verified:
+            contenders.append(candidate)
+    contenders.sort(key=lambda c: (-counts.get(c.pk, 0), c.pk))
+
+    seats = position.positions_available
+    eligible = [c for c in contenders if counts.get(c.pk, 0) > ron_votes]
+    tied = []
+    if seats == 0:
+        winners = []
+    elif len(eligible) <= seats:
+        winners = eligible
+    else:
+        cutoff = counts.get(eligible[seats - 1].pk, 0)
+        if counts.get(eligible[seats].pk, 0) == cutoff:
+            winners = [c for c in eligible if counts.get(c.pk, 0) > cutoff]
+            tied = [c for c in eligible if counts.get(c.pk, 0) == cutoff]
+        else:
+            winners = eligible[:seats]
+
+    winner_pks = {c.pk for c in winners}
+    ranked = sorted(candidates, key=lambda c: (-counts.get(c.pk, 0), c.pk))
+    return PositionResult(
+        position=position,
+        candidates=[
+            CandidateResult(c, counts.get(c.pk, 0), c.pk in winner_pks)
+            for c in ranked
+        ],
+        tied=tied,
+        seats_reopened=0 if tied else seats - len(winners)
+    )
+
+
+def select_stv_winners(
+    position: ElectionPosition,
+    candidates: List[Candidate],
+    ballots: List[List[int]]
+) -> PositionResult:
+    """Select the winners of a ranked position with STV
+
+    RON stands as a candidate, and each seat it wins is reopened. Preferences
+    for Abstain and unverified candidates are skipped, so ballots abstaining
+    with their first preference transfer to their next preference, and are
+    otherwise not counted.
+
+    Args:
+        position (ElectionPosition): The position to select winners for
+        candidates (list): All candidates standing for the position
+        ballots (list): Candidate PKs of each ballot, in order of preference
+
+    Returns:
+        PositionResult: Result of the position, with candidates ordered by
+            first preferences
+    """
+    standing = [
+        c.pk for c in candidates
+        if c.is_ron or (not c.is_abstain and c.email_verified)
+    ]
+    seats = position.positions_available
+    count = count_stv(pack_ballots(ballots, standing), seats)
+    ron_pks = {c.pk for c in candidates if c.is_ron}
+    winner_pks = set(count.elected) - ron_pks
+    first_preferences = count.first_preferences
+    ranked = sorted(
+        candidates, key=lambda c: (-first_preferences.get(c.pk, 0), c.pk)
+    )
+    return PositionResult(
+        position=position,
+        candidates=[
+            CandidateResult(
+                c, first_preferences.get(c.pk, 0), c.pk in winner_pks
+            )
+            for c in ranked
+        ],
+        tied=[],
+        seats_reopened=seats - len(winner_pks),
+        count=count
+    )
+
+
+def calculate_results(
+    election: Election, save: bool=True
+) -> List[PositionResult]:
+    """Calculate the results of every position in an election
+
+    Args:
+        election (Election): Election to calculate the results of
+        save (bool, optional): Whether or not to save Candidate.successful for
+            every candidate in the election. Defaults to True.
+
+    Returns:
+        list: PositionResult for every position in the election
+    """
+    positions = list(election.positions.select_related(
+        'position'
+    ).prefetch_related('candidates').order_by('pk'))
+    counts = count_votes(election)
+    ranked_ballots = {}
+    if any(position.is_ranked for position in positions):
+        ranked_ballots = count_ranked_votes(election)
+
+    results = []
+    changed = []
+    position: ElectionPosition
+    for position in positions:
+        if position.is_ranked:
+            result = select_stv_winners(
+                position, list(position.candidates.all()),
+                ranked_ballots.get(position.pk, [])
+            )
+        else:
+            result = select_winners(
+                position, list(position.candidates.all()),
+                counts.get(position.pk, {})
+            )
+        results.append(result)
+        for candidate_result in result.candidates:
+            candidate = candidate_result.candidate
+            if candidate.successful != candidate_result.successful:
+                candidate.successful = candidate_result.successful
+                changed.append(candidate)
+        if result.tied:
+            logger.warning(
+                f'Tie for {position}: {[str(c) for c in result.tied]}'
+            )
+
+    if save and changed:
+        Candidate.objects.bulk_update(changed, ['successful'])
+    logger.info(
+        f'Results calculated for "{election}", {len(changed)} candidates '
+        'updated'
+    )
+    return results
+
+
+def serialize_results(results: List[PositionResult]) -> dict:
+    """Convert the results of an election to JSON serializable data
+
+    Args:
+        results (list): PositionResult for every position in the election
+
+    Returns:
+        dict: The vote totals, winners, and seats reopened of every position
+    """
+    positions = []
+    for result in results:
+        position = {
+            'id': result.position.pk,
+            'title': result.position.position.title,
+            'positions_available': result.position.positions_available,
+            'voting_system': result.position.voting_system,
+            'seats_reopened': result.seats_reopened,
+            'tied': [candidate.pk for candidate in result.tied],
+            'candidates': [{
+                'id': candidate_result.candidate.pk,
+                'full_name': candidate_result.candidate.full_name,
+                'votes': candidate_result.votes,
+                'successful': candidate_result.successful,
+                'ron': candidate_result.candidate.is_ron,
+                'abstain': candidate_result.candidate.is_abstain,
+            } for candidate_result in result.candidates],
+        }
+        if result.count is not None:
+            position['quota'] = result.count.quota
+            position['elected'] = result.count.elected
+        positions.append(position)
+    return {'positions': positions}
+
+
+def count_turnout(election: Election) -> Tuple[int, int]:
+    """Count the voters of an election, and how many of them voted
+
+    Args:
+        election (Election): Election to count the turnout of
+
+    Returns:
+        tuple: Number of eligible voters, and number who cast a vote
+    """
+    if election.anonymous:
+        voters = election.anonymous_voters.count()
+        voter_field = 'anonymous_voter'
+    else:
+        voters = election.registered_voters.filter(
+            verified_at__isnull=False
+        ).count()
+        voter_field = 'registered_voter'
+    voted = Vote.objects.filter(
+        election=election
+    ).values(voter_field).distinct().count()
+    return voters, voted
+
+
+def freeze_results(election: Election) -> ElectionResults:
+    """Calculate the results of an election once, and store them
+
+    Successful candidates are saved, as by calculate_results. If the results
+    have already been frozen, the existing snapshot is returned without
+    counting the votes again.
+
+    Args:
+        election (Election): Election which has ended
+
+    Returns:
+        ElectionResults: Snapshot of the results
+    """
+    existing = ElectionResults.objects.filter(election=election).first()
+    if existing is not None:
+        return existing
+
+    with transaction.atomic():
+        results = calculate_results(election)
+        data = serialize_results(results)
+        voters, voters_voted = count_turnout(election)
+        content = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        try:
+            with transaction.atomic():
+                snapshot = ElectionResults.objects.create(
+                    election=election,
+                    results=data,
+                    voters=voters,
+                    voters_voted=voters_voted,
+                    votes_cast=Vote.objects.filter(
+                        election=election
+                    ).count(),
+                    version=hashlib.sha256(
+                        f'{election.pk}:{content}'.encode()
+                    ).hexdigest()[:32]
+                )
+        except IntegrityError:
+            # Frozen concurrently, e.g. by a second request ending the
+            # election
+            return ElectionResults.objects.get(election=election)
+    logger.info(
+        f'Results of "{election}" frozen, {voters_voted} of {voters} voters '
+        'voted'
+    )
+    return snapshot
+
+
+def send_result_emails(
+    election: Election, results: List[PositionResult]
+) -> int:
+    """Queue emails to the candidates of an election with their results
+
+    Emails are only queued if configured in the election using email_winners
+    and email_losers. RON and Abstain are never emailed.
+
+    Args:
+        election (Election): Election the results belong to
+        results (list): PositionResult for every position in the election
+
+    Returns:
+        int: Number of emails queued
+    """
+    sent = 0
+    for result in results:
+        for candidate_result in result.candidates:
+            candidate = candidate_result.candidate
+            if candidate.is_ron or candidate.is_abstain:
+                continue
+            if candidate_result.successful and election.email_winners:
+                template = election.winner_message
+            elif not candidate_result.successful and election.email_losers:
+                template = election.loser_message
+            else:
+                continue
+            if not template:
+                continue
+            message = template.format(
+                name=candidate.full_name,
+                position=result.position.position.title,
+                votes=candidate_result.votes
+            )
+            OutboundEmail.queue(
+                f'Results of {election.title}', message, candidate.email,
+                html_message=message
+            )
+            sent += 1
+    return sent
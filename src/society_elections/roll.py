@@ -0,0 +1,183 @@
+"""Imports the electoral roll of an election in bulk
+
+Emails are validated in memory, checked against the existing voters of the
+election with a single query, and inserted with bulk_create in batches, rather
+than registering voters one at a time through create_voter_view. Voters who
+register themselves while the import runs are skipped as duplicates.
+"""
+import logging
+from typing import Iterable, List, NamedTuple, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AnonymousVoter, Election, OutboundEmail, RegisteredVoter
+from .validators import email_user_validator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ImportResult(NamedTuple):
+    """The result of importing voters
+
+    Attributes:
+        created (int): Number of voters created
+        duplicates (int): Number of emails which were already registered,
+            were registered while importing, or appeared earlier in the import
+        invalid (list): Line number, email, and reason for every email which
+            was rejected
+    """
+    created: int
+    duplicates: int
+    invalid: List[Tuple[int, str, str]]
+
+
+def validate_voter_email(election: Election, email: str) -> None:
+    """Validate an email the same way as create_voter_view
+
+    Args:
+        election (Election): Election the voter is registering for
+        email (str): Email of the voter
+
+    Raises:
+        ValidationError: Email is not valid for the election
+    """
+    email_user_validator(email)
+    if not election.voter_whitelist.matches_email(email):
+        raise ValidationError('Email domain not valid for this election')
+
+
+def import_voters(
+    election: Election,
+    emails: Iterable[str],
+    verified: bool=False,
+    send_emails: bool=True,
+    batch_size: int=DEFAULT_BATCH_SIZE
+) -> ImportResult:
+    """Register voters in an election from a stream of emails
+
+    Voters are created in batches of batch_size, each in its own transaction.
+
+    If verified is False, each voter is emailed a link to verify their email,
+    as if they had registered themselves. If verified is True, voters are
+    created already verified and, in anonymous elections, an AnonymousVoter
+    is created for each and emailed their password.
+
+    Args:
+        election (Election): Election to register the voters in
+        emails (Iterable[str]): Emails of the voters, in the order of the lines
+            of the input
+        verified (bool, optional): Whether to verify the voters without
+            emailing them a verification link. Defaults to False.
+        send_emails (bool, optional): Whether to queue verification or
+            password emails to the voters. Defaults to True.
+        batch_size (int, optional): Number of voters to insert at a time.
+            Defaults to DEFAULT_BATCH_SIZE.
+
+    Raises:
+        ValueError: Verified voters in an anonymous election would not be
+            sent their passwords, which are not stored anywhere else
+
+    Returns:
+        ImportResult: Number of voters created, duplicates, and invalid emails
+    """
+    if verified and election.anonymous and not send_emails:
+        raise ValueError(
+            'Verified voters in anonymous elections must be emailed their '
+            'passwords'
+        )
+    seen = {
+        email.lower() for email in RegisteredVoter.objects.filter(
+            election=election
+        ).values_list('email', flat=True).iterator()
+    }
+    initial = len(seen)
+    created = duplicates = 0
+    invalid = []
+    batch = []
+    for line, email in enumerate(emails, 1):
+        email = email.strip()
+        try:
+            validate_voter_email(election, email)
+        except ValidationError as e:
+            invalid.append((line, email, ' '.join(e.messages)))
+            continue
+        if email.lower() in seen:
+            duplicates += 1
+            continue
+        seen.add(email.lower())
+        batch.append(email)
+        if len(batch) >= batch_size:
+            created += create_voters(election, batch, verified, send_emails)
+            batch = []
+    if batch:
+        created += create_voters(election, batch, verified, send_emails)
+    # Voters who registered between reading the existing emails and
+    # inserting them were skipped
+    duplicates += len(seen) - initial - created
+    logger.info(
+        f'Imported {created} voters into "{election}", {duplicates} '
+        f'duplicates, {len(invalid)} invalid'
+    )
+    return ImportResult(created, duplicates, invalid)
+
+
+def create_voters(
+    election: Election,
+    emails: List[str],
+    verified: bool,
+    send_emails: bool
+) -> int:
+    """Create a batch of voters which have already been validated
+
+    Emails registered since they were checked are skipped, rather than
+    failing the batch, and are neither verified nor emailed.
+
+    Args:
+        election (Election): Election to register the voters in
+        emails (list): Emails of the voters
+        verified (bool): Whether to verify the voters
+        send_emails (bool): Whether to queue verification or password emails
+
+    Returns:
+        int: Number of voters created
+    """
+    verified_at = timezone.now() if verified else None
+    voters = [
+        RegisteredVoter(
+            election=election, email=email, verified_at=verified_at
+        ) for email in emails
+    ]
+    outbound = []
+    with transaction.atomic():
+        RegisteredVoter.objects.bulk_create(voters, ignore_conflicts=True)
+        # Primary keys are generated here, so find the voters inserted
+        inserted = set(RegisteredVoter.objects.filter(
+            pk__in=[voter.pk for voter in voters]
+        ).values_list('pk', flat=True))
+        voters = [voter for voter in voters if voter.pk in inserted]
+        if len(voters) < len(emails):
+            logger.info(
+                f'Skipped {len(emails) - len(voters)} voters registered in '
+                f'"{election}" while importing'
+            )
+        if verified and election.anonymous:
+            anonymous_voters = []
+            for voter in voters:
+                password = AnonymousVoter.generate_voter_password()
+                anonymous_voters.append(AnonymousVoter(
+                    election=election,
+                    password=AnonymousVoter.hash_password(password)
+                ))
+                outbound.append(AnonymousVoter.build_password_email(
+                    election, voter.email, password
+                ))
+            AnonymousVoter.objects.bulk_create(anonymous_voters)
+        elif not verified:
+            outbound = [voter.build_verification_email() for voter in voters]
+        if send_emails:
+            OutboundEmail.queue_many(outbound)
+    return len(voters)
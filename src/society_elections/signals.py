@@ -0,0 +1,75 @@
+"""Signal receivers keeping the caches of this package up to date
+
+Caches are only invalidated once the change commits. Invalidating them inside
+the transaction would let a concurrent request refill the cache from the rows
+committed before the change, and keep serving them until the next change.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .ballot import invalidate_ballot
+from .caching import invalidate_latest_election, invalidate_results_page
+from .models import (Candidate, Election, ElectionPosition, ElectionResults,
+                     Position)
+
+
+@receiver(post_save, sender=Election)
+@receiver(post_delete, sender=Election)
+def invalidate_election_cache(sender, instance: Election, **kwargs):
+    """Remove the latest election from the cache when any election changes"""
+    transaction.on_commit(invalidate_latest_election)
+    transaction.on_commit(partial(invalidate_ballot, instance.pk))
+
+
+@receiver(post_save, sender=ElectionPosition)
+@receiver(post_delete, sender=ElectionPosition)
+def invalidate_election_position_ballot(
+    sender, instance: ElectionPosition, **kwargs
+):
+    """Start a new generation of the ballot when its positions change"""
+    transaction.on_commit(partial(invalidate_ballot, instance.election_id))
+
+
+@receiver(post_save, sender=Position)
+def invalidate_position_ballots(sender, instance: Position, **kwargs):
+    """Start a new generation of the ballots of every election with the
+    position, when its title or description change
+    """
+    for election_pk in ElectionPosition.objects.filter(
+        position=instance
+    ).values_list('election_id', flat=True).distinct():
+        transaction.on_commit(partial(invalidate_ballot, election_pk))
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def invalidate_candidate_ballot(sender, instance: Candidate, **kwargs):
+    """Start a new generation of the ballot when its candidates change
+
+    Candidates deleted along with their position or election are skipped, as
+    the ballot is invalidated by the receivers of the position or election.
+    """
+    origin = kwargs.get('origin')
+    if (
+        origin is not None and
+        getattr(origin, 'model', type(origin)) is not Candidate
+    ):
+        return
+    transaction.on_commit(
+        partial(invalidate_ballot, instance.position.election_id)
+    )
+
+
+@receiver(post_save, sender=ElectionResults)
+@receiver(post_delete, sender=ElectionResults)
+def invalidate_election_results_page(
+    sender, instance: ElectionResults, **kwargs
+):
+    """Remove the cached results page when the results are frozen or deleted
+    """
+    transaction.on_commit(
+        partial(invalidate_results_page, instance.election_id)
+    )
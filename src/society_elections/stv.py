@@ -0,0 +1,237 @@
+"""Counts ranked ballots with the single transferable vote
+
+Seats are filled by the weighted inclusive Gregory method with a Droop quota.
+Each round, every continuing candidate reaching the quota is elected, and
+their surplus is transferred to the next continuing preference of all of
+their ballots, at a fraction of each ballot's weight. If no candidate reaches
+the quota, the candidate with the fewest votes is excluded and their ballots
+are transferred at full weight. A single seat count is instant-runoff voting.
+
+Ballots are packed into flat arrays of candidate indices, with identical
+ballots stored once alongside their number of copies. Each candidate holds a
+pile of the ballots currently counting for them, so each round only visits
+the ballots being transferred, rather than recounting every ballot.
+"""
+import logging
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Tolerance of comparisons between fractional votes
+EPSILON = 1e-9
+
+HOPEFUL = 0
+ELECTED = 1
+EXCLUDED = 2
+
+
+class PackedBallots(NamedTuple):
+    """Ranked ballots packed into arrays
+
+    Attributes:
+        candidates (list): PK of the candidate each index refers to
+        preferences (array): Candidate indices of every ballot, concatenated
+        offsets (array): Where the preferences of each ballot start, with the
+            end of the last ballot appended
+        copies (array): Number of voters who cast each ballot
+    """
+    candidates: List[int]
+    preferences: array
+    offsets: array
+    copies: array
+
+    def __len__(self) -> int:
+        return len(self.copies)
+
+
+class StvRound(NamedTuple):
+    """A round of an STV count
+
+    Attributes:
+        votes (dict): Votes of each continuing or elected candidate at the
+            start of the round, by candidate PK
+        exhausted (float): Votes of ballots with no continuing preference
+        elected (list): PKs of the candidates elected in the round
+        excluded (int): PK of the candidate excluded in the round, if any
+    """
+    votes: Dict[int, float]
+    exhausted: float
+    elected: List[int]
+    excluded: Optional[int]
+
+
+class StvResult(NamedTuple):
+    """The result of an STV count
+
+    Attributes:
+        elected (list): PKs of the candidates elected, in order of election
+        quota (int): Votes needed to be elected
+        first_preferences (dict): Number of first preferences of each
+            candidate, by PK
+        rounds (list): StvRound of each round of the count
+    """
+    elected: List[int]
+    quota: int
+    first_preferences: Dict[int, int]
+    rounds: List[StvRound]
+
+
+def pack_ballots(
+    ballots: Iterable[Sequence[int]], candidates: Sequence[int]
+) -> PackedBallots:
+    """Pack ranked ballots into arrays
+
+    Preferences for candidates not in candidates, and repeated preferences,
+    are skipped. Ballots left with no preferences are not counted.
+
+    Args:
+        ballots (Iterable): Candidate PKs of each ballot, most preferred first
+        candidates (Sequence): PKs of the candidates standing
+
+    Returns:
+        PackedBallots: The ballots packed
+    """
+    indices = {pk: index for index, pk in enumerate(candidates)}
+    groups: Dict[tuple, int] = {}
+    for ballot in ballots:
+        ranking = []
+        for pk in ballot:
+            index = indices.get(pk)
+            if index is not None and index not in ranking:
+                ranking.append(index)
+        if ranking:
+            key = tuple(ranking)
+            groups[key] = groups.get(key, 0) + 1
+
+    preferences = array('I')
+    offsets = array('I', [0])
+    copies = array('I')
+    for ranking, count in groups.items():
+        preferences.extend(ranking)
+        offsets.append(len(preferences))
+        copies.append(count)
+    return PackedBallots(list(candidates), preferences, offsets, copies)
+
+
+def droop_quota(votes: int, seats: int) -> int:
+    """Get the votes needed to win one of a number of seats
+
+    Args:
+        votes (int): Number of valid ballots
+        seats (int): Seats available
+
+    Returns:
+        int: The Droop quota
+    """
+    return votes // (seats + 1) + 1
+
+
+def count_stv(ballots: PackedBallots, seats: int) -> StvResult:
+    """Count packed ballots with STV
+
+    Ties for exclusion are broken by the votes of the tied candidates in the
+    most recent round in which they differed, and then by excluding the
+    candidate with the greatest index, i.e. nominated last.
+
+    Args:
+        ballots (PackedBallots): Ballots to count
+        seats (int): Number of seats to fill
+
+    Returns:
+        StvResult: Candidates elected and the rounds of the count
+    """
+    candidates = ballots.candidates
+    preferences = ballots.preferences
+    offsets = ballots.offsets
+    count = len(candidates)
+    state = [HOPEFUL] * count
+    votes = [0.0] * count
+    piles: List[List[int]] = [[] for _ in range(count)]
+    # Index into preferences of the candidate each ballot is counting for
+    current = array('I', offsets[:-1])
+    weights = array('d', ballots.copies)
+    for ballot in range(len(ballots)):
+        first = preferences[current[ballot]]
+        piles[first].append(ballot)
+        votes[first] += weights[ballot]
+
+    quota = droop_quota(sum(ballots.copies), seats)
+    first_preferences = {
+        candidates[index]: int(votes[index]) for index in range(count)
+    }
+    history: List[List[float]] = []
+    rounds: List[StvRound] = []
+    elected: List[int] = []
+    exhausted = 0.0
+
+    def transfer(index: int, factor: float) -> None:
+        nonlocal exhausted
+        for ballot in piles[index]:
+            weight = weights[ballot] * factor
+            if weight <= 0:
+                continue
+            position = current[ballot] + 1
+            end = offsets[ballot + 1]
+            while position < end and state[preferences[position]] != HOPEFUL:
+                position += 1
+            if position < end:
+                target = preferences[position]
+                current[ballot] = position
+                weights[ballot] = weight
+                piles[target].append(ballot)
+                votes[target] += weight
+            else:
+                exhausted += weight
+        piles[index] = []
+
+    while len(elected) < seats:
+        hopeful = [index for index in range(count) if state[index] == HOPEFUL]
+        if not hopeful:
+            break
+        history.append(list(votes))
+        round_votes = {
+            candidates[index]: votes[index] for index in range(count)
+            if state[index] != EXCLUDED
+        }
+
+        if len(hopeful) <= seats - len(elected):
+            # Every continuing candidate fills a remaining seat
+            hopeful.sort(key=lambda index: (-votes[index], index))
+            for index in hopeful:
+                state[index] = ELECTED
+                elected.append(candidates[index])
+            rounds.append(StvRound(
+                round_votes, exhausted, [candidates[i] for i in hopeful], None
+            ))
+            break
+
+        reached = sorted(
+            (index for index in hopeful if votes[index] >= quota - EPSILON),
+            key=lambda index: (-votes[index], index)
+        )[:seats - len(elected)]
+        if reached:
+            for index in reached:
+                state[index] = ELECTED
+                elected.append(candidates[index])
+            for index in reached:
+                surplus = votes[index] - quota
+                transfer(index, max(surplus, 0) / votes[index])
+                votes[index] = min(votes[index], quota)
+            rounds.append(StvRound(
+                round_votes, exhausted, [candidates[i] for i in reached], None
+            ))
+            continue
+
+        excluded = min(hopeful, key=lambda index: (
+            [round_votes[index] for round_votes in reversed(history)],
+            -index
+        ))
+        state[excluded] = EXCLUDED
+        transfer(excluded, 1.0)
+        votes[excluded] = 0.0
+        rounds.append(StvRound(
+            round_votes, exhausted, [], candidates[excluded]
+        ))
+
+    return StvResult(elected, quota, first_preferences, rounds)
@@ -0,0 +1,345 @@
+"""Generates large, realistic elections for benchmarks and load tests
+
+Every row is inserted with bulk_create, skipping the per-row queries of
+Candidate.save(), so elections with hundreds of thousands of votes are
+generated in seconds. Generation is driven by a random number generator, so
+the same arguments with the same seed generate the same candidates, voters,
+and votes. Without a seed, every election differs. The UUIDs of voters and
+candidates are always random, so that the same election can be generated more
+than once in a database.
+"""
+import heapq
+import itertools
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator, List, NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (AnonymousVoter, Candidate, Election, ElectionPosition,
+                     Position, RegisteredVoter, Vote, VoteTally)
+
+logger = logging.getLogger(__name__)
+
+ZIPF = 'zipf'
+UNIFORM = 'uniform'
+DISTRIBUTIONS = (ZIPF, UNIFORM)
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class GeneratedElection(NamedTuple):
+    """An election created by generate_election
+
+    Attributes:
+        election (Election): The election
+        positions (list): ElectionPositions of the election
+        candidates (list): Candidates generated, excluding RON and Abstain,
+            with the most popular candidate of each position first
+        voters (int): Number of registered voters
+        votes (int): Number of votes cast
+    """
+    election: Election
+    positions: List[ElectionPosition]
+    candidates: List[Candidate]
+    voters: int
+    votes: int
+
+
+def period_dates(period: str, now: datetime=None) -> dict:
+    """Get the dates of an election which is in the given period
+
+    Args:
+        period (str): Election.NOMINATIONS, VOTING, or POSTVOTING
+        now (datetime, optional): Current time. Defaults to timezone.now().
+
+    Raises:
+        ValueError: Period is not supported
+
+    Returns:
+        dict: nominations_start, nominations_end, voting_start, and voting_end
+    """
+    if now is None:
+        now = timezone.now()
+    offsets = {
+        Election.NOMINATIONS: -1,
+        Election.VOTING: -3,
+        Election.POSTVOTING: -5,
+    }
+    if period not in offsets:
+        raise ValueError(f'Cannot generate an election in period {period}')
+    days = offsets[period]
+    return {
+        'nominations_start': now + timedelta(days=days),
+        'nominations_end': now + timedelta(days=days + 2),
+        'voting_start': now + timedelta(days=days + 2, seconds=1),
+        'voting_end': now + timedelta(days=days + 4),
+    }
+
+
+def popularity(count: int, distribution: str, exponent: float) -> List[float]:
+    """Get the relative popularity of a number of candidates
+
+    Args:
+        count (int): Number of candidates
+        distribution (str): ZIPF, where the kth most popular candidate is
+            1/k^exponent as popular as the first, or UNIFORM
+        exponent (float): Exponent of the Zipf distribution
+
+    Returns:
+        list: Weight of each candidate, most popular first
+    """
+    if distribution == UNIFORM:
+        return [1.0] * count
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def choose_distinct(
+    rng: random.Random, population: List, weights: List[float], k: int
+) -> List:
+    """Choose k distinct items with probability proportional to their weight
+
+    Each item is given the key random() ** (1 / weight), and the items with
+    the k largest keys are chosen, which is the same as choosing items one
+    at a time without replacement (Efraimidis and Spirakis). Unlike
+    redrawing items already chosen, this takes one pass however skewed the
+    weights are.
+
+    Args:
+        rng (random.Random): Random number generator
+        population (list): Items to choose from
+        weights (list): Positive weights of the items
+        k (int): Number of items to choose, at most len(population)
+
+    Returns:
+        list: Items chosen, in the order chosen
+    """
+    keys = [rng.random() ** (1 / weight) for weight in weights]
+    return [
+        population[i]
+        for i in heapq.nlargest(k, range(len(population)), key=keys.__getitem__)
+    ]
+
+
+def batched(iterable: Iterator, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def anonymous_password(election: Election, index: int) -> str:
+    """Get the password of the AnonymousVoter generated for the ith voter of
+    an election
+    """
+    return f'synthetic-{election.pk}-{index}'
+
+
+def generate_election(
+    positions: int=5,
+    candidates: int=5,
+    voters: int=1000,
+    seats: int=1,
+    ranked: bool=False,
+    anonymous: bool=False,
+    turnout: float=1.0,
+    distribution: str=ZIPF,
+    exponent: float=1.0,
+    period: str=Election.VOTING,
+    seed: Optional[int]=None,
+    created_by=None,
+    title: str='Synthetic Election',
+    email_domain: str='example.com',
+    batch_size: int=DEFAULT_BATCH_SIZE
+) -> GeneratedElection:
+    """Generate an election with voters who have voted
+
+    Every position gets RON and Abstain candidates as well as the generated
+    candidates. Each voter who turns out votes in every position, for as many
+    distinct candidates as the position has seats, chosen by popularity.
+    Candidates are ranked by popularity in a random order in each position.
+    In ranked positions, each voter instead ranks between as many candidates
+    as there are seats and every candidate, in the order they are chosen.
+
+    In anonymous elections, each registered voter also gets an
+    AnonymousVoter, with the password given by anonymous_password, which
+    casts their votes.
+
+    Args:
+        positions (int, optional): Number of positions. Defaults to 5.
+        candidates (int, optional): Number of candidates standing for each
+            position. Defaults to 5.
+        voters (int, optional): Number of registered voters. Defaults to 1000.
+        seats (int, optional): Seats available in each position. Defaults to
+            1.
+        ranked (bool, optional): Whether voters rank the candidates of each
+            position, which are counted with STV. Defaults to False.
+        anonymous (bool, optional): Whether the election is anonymous.
+            Defaults to False.
+        turnout (float, optional): Fraction of voters who vote. Defaults to
+            1.0.
+        distribution (str, optional): ZIPF or UNIFORM popularity of the
+            candidates. Defaults to ZIPF.
+        exponent (float, optional): Exponent of the Zipf distribution.
+            Defaults to 1.0.
+        period (str, optional): Period the election is in. Defaults to
+            Election.VOTING.
+        seed (int, optional): Seed of the random number generator, to
+            generate the same election again. Defaults to None, generating a
+            different election every time.
+        created_by (User, optional): User who created the election. Defaults
+            to the first superuser.
+        title (str, optional): Title of the election. Defaults to
+            'Synthetic Election'.
+        email_domain (str, optional): Domain of the voter and candidate
+            emails, which is whitelisted. Defaults to 'example.com'.
+        batch_size (int, optional): Number of rows to insert at a time.
+            Defaults to DEFAULT_BATCH_SIZE.
+
+    Raises:
+        ValueError: Arguments are invalid, or there is no user to create the
+            election
+
+    Returns:
+        GeneratedElection: The election and the rows created
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f'Unknown distribution {distribution}')
+    if not 1 <= seats <= candidates:
+        raise ValueError('Seats must be between 1 and the number of candidates')
+    if created_by is None:
+        created_by = get_user_model().objects.filter(
+            is_superuser=True
+        ).order_by('pk').first()
+        if created_by is None:
+            raise ValueError('No superuser to create the election')
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    with transaction.atomic():
+        election = Election.objects.create(
+            title=title,
+            admin_title=f'{title} ({positions}x{candidates}x{voters}, '
+                        f'seed {seed})',
+            description='Generated election',
+            created_by=created_by,
+            anonymous=anonymous,
+            voter_email_domain_whitelist=email_domain,
+            candidate_email_domain_whitelist=email_domain,
+            **period_dates(period, now)
+        )
+        titles = Position.objects.bulk_create([
+            Position(
+                title=f'Position {i}',
+                admin_title=f'{election.admin_title} Position {i}',
+                description='Generated position'
+            ) for i in range(positions)
+        ])
+        election_positions = ElectionPosition.objects.bulk_create([
+            ElectionPosition(
+                election=election, position=title, positions_available=seats,
+                voting_system=(
+                    ElectionPosition.STV if ranked else ElectionPosition.FPTP
+                )
+            ) for title in titles
+        ])
+
+        position_candidates = []
+        for position in election_positions:
+            standing = [
+                Candidate(
+                    position=position,
+                    full_name=f'Candidate {i} for {position.position.title}',
+                    email=f'candidate{position.pk}-{i}@{email_domain}',
+                    manifesto='Generated manifesto',
+                    email_uuid=uuid.uuid4(),
+                    email_verified=True
+                ) for i in range(candidates)
+            ]
+            rng.shuffle(standing)
+            position_candidates.append(standing)
+        all_candidates = [
+            c for standing in position_candidates for c in standing
+        ]
+        # Created by ElectionPositionAdmin.save_model for real elections
+        special = []
+        for position in election_positions:
+            if position.allow_ron:
+                special.append(Candidate(
+                    position=position, full_name='RON',
+                    email=Candidate.RON_EMAIL,
+                    manifesto='Re-open nominations', email_verified=True
+                ))
+            if position.allow_abstain:
+                special.append(Candidate(
+                    position=position, full_name='Abstain',
+                    email=Candidate.ABSTAIN_EMAIL,
+                    manifesto='Abstain from voting for this position',
+                    email_verified=True
+                ))
+        Candidate.objects.bulk_create(
+            all_candidates + special, batch_size=batch_size
+        )
+
+        verified_at = now if period != Election.NOMINATIONS else None
+        voter_pks = []
+        for batch in batched(range(voters), batch_size):
+            registered = RegisteredVoter.objects.bulk_create([
+                RegisteredVoter(
+                    election=election,
+                    email=f'voter{i}@{email_domain}',
+                    verified_at=verified_at
+                ) for i in batch
+            ])
+            if anonymous:
+                registered = AnonymousVoter.objects.bulk_create([
+                    AnonymousVoter(
+                        election=election,
+                        password=AnonymousVoter.hash_password(
+                            anonymous_password(election, i)
+                        )
+                    ) for i in batch
+                ])
+            voter_pks.extend(voter.pk for voter in registered)
+
+        weights = popularity(candidates, distribution, exponent)
+        voter_field = 'anonymous_voter_id' if anonymous else 'registered_voter_id'
+
+        def votes() -> Iterator[Vote]:
+            for voter_pk in voter_pks:
+                if rng.random() >= turnout:
+                    continue
+                for position, popular in zip(
+                    election_positions, position_candidates
+                ):
+                    count = rng.randint(seats, candidates) if ranked else seats
+                    for seat, candidate in enumerate(choose_distinct(
+                        rng, popular, weights, count
+                    )):
+                        yield Vote(
+                            election=election,
+                            position=position,
+                            candidate=candidate,
+                            seat=seat,
+                            **{voter_field: voter_pk}
+                        )
+
+        vote_count = 0
+        for batch in batched(votes(), batch_size):
+            Vote.objects.bulk_create(batch)
+            vote_count += len(batch)
+        VoteTally.rebuild(election)
+
+    logger.info(
+        f'Generated "{election}" with {voters} voters and {vote_count} votes'
+    )
+    return GeneratedElection(
+        election, election_positions, all_candidates, voters, vote_count
+    )
@@ -1,2 +1,25 @@
-from .views_helper import IsRequestAuthenticatedTestCase
-from .views_vote import VoteViewTestCase, CreateVoteAjaxTestCase
\ No newline at end of file
+from .archive import ArchiveElectionTestCase
+from .admin import ChangelistQueryCountTestCase
+from .ballot import BallotTestCase
+from .benchmarks import ViewBenchmarkTestCase
+from .caching import CachedLatestElectionTestCase
+from .jobs import JobsTestCase
+from .loadtest import (ConcurrentLoadTestTestCase, HttpLoadTestTestCase,
+                       RunLoadTestTestCase)
+from .outbox import SendQueuedMailTestCase
+from .query_plans import QueryPlanTestCase
+from .results import CalculateResultsTestCase, FreezeResultsTestCase
+from .roll import ImportVotersTestCase
+from .stv import CountStvTestCase, RankedVotingTestCase
+from .synthetic import GenerateElectionTestCase
+from .tally import VoteTallyTestCase
+from .throttling import ThrottleTestCase
+from .views_decorators import (AsyncDecoratorsTestCase,
+                               ValidateElectionPeriodTestCase)
+from .views_election import ElectionPageCachingTestCase, ResultsViewTestCase
+from .views_helper import IsRequestAuthenticatedTestCase, VoterTokenTestCase
+from .views_vote import (AsyncVoteViewsTestCase, CreateVoteAjaxTestCase,
+                         SubmitBallotAjaxTestCase, VoteViewTestCase,
+                         VoterLoginAjaxTestCase)
+from .voting import CastVoteTestCase, ConcurrentVotingTestCase
+from .whitelist import DomainWhitelistTestCase
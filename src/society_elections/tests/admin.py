@@ -0,0 +1,129 @@
+"""Module to test the admin module of society_elections"""
+import uuid
+from typing import Callable
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import (Candidate, Election, ElectionPosition, OutboundEmail,
+                      Position, RegisteredVoter)
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position)
+
+
+@override_settings(ROOT_URLCONF='society_elections.tests.urls')
+class ChangelistQueryCountTestCase(TestCase):
+    """Tests the number of queries of each admin changelist does not depend
+    on the number of rows
+    """
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@test.com', 'Test1234!'
+        )
+        cls.election = create_election(created_by=cls.user)
+        cls.position = create_election_position(
+            cls.election, create_position()
+        )
+
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+
+    def assertQueriesConstant(
+        self, model, create_rows: Callable[[int], None]
+    ) -> None:
+        """Check the changelist of a model takes the same number of queries
+        with 10 rows as with 10,000
+
+        Args:
+            model: Model of the changelist
+            create_rows (Callable): Function creating a number of rows
+        """
+        url = reverse(
+            f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'
+        )
+        create_rows(10 - model.objects.count())
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+
+        create_rows(10000 - model.objects.count())
+        with self.assertNumQueries(len(queries)):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+
+
+    def test_election_changelist(self):
+        self.assertQueriesConstant(Election, lambda n: Election.objects.bulk_create([
+            Election(
+                admin_title=f'Election {i}',
+                created_by=self.user,
+                title=self.election.title,
+                description=self.election.description,
+                nominations_start=self.election.nominations_start,
+                nominations_end=self.election.nominations_end,
+                voting_start=self.election.voting_start,
+                voting_end=self.election.voting_end,
+            ) for i in range(n)
+        ]))
+
+
+    def test_position_changelist(self):
+        self.assertQueriesConstant(Position, lambda n: Position.objects.bulk_create([
+            Position(
+                admin_title=f'Position {i}', title='Position',
+                description='Position'
+            ) for i in range(n)
+        ]))
+
+
+    def test_election_position_changelist(self):
+        def create_rows(n):
+            positions = Position.objects.bulk_create([
+                Position(
+                    admin_title=f'Position {i}', title='Position',
+                    description='Position'
+                ) for i in range(n)
+            ])
+            election_positions = ElectionPosition.objects.bulk_create([
+                ElectionPosition(election=self.election, position=position)
+                for position in positions
+            ])
+            Candidate.objects.bulk_create([
+                Candidate(
+                    position=position, full_name='Candidate',
+                    email='candidate@test.com', manifesto='Manifesto'
+                ) for position in election_positions
+            ])
+        self.assertQueriesConstant(ElectionPosition, create_rows)
+
+
+    def test_candidate_changelist(self):
+        create_candidate(self.position)
+        self.assertQueriesConstant(Candidate, lambda n: Candidate.objects.bulk_create([
+            Candidate(
+                position=self.position, full_name=f'Candidate {i}',
+                email='candidate@test.com', manifesto='Manifesto'
+            ) for i in range(n)
+        ]))
+
+
+    def test_registered_voter_changelist(self):
+        self.assertQueriesConstant(RegisteredVoter, lambda n: RegisteredVoter.objects.bulk_create([
+            RegisteredVoter(election=self.election, email=f'{uuid.uuid4()}@test.com')
+            for _ in range(n)
+        ]))
+
+
+    def test_outbound_email_changelist(self):
+        self.assertQueriesConstant(OutboundEmail, lambda n: OutboundEmail.objects.bulk_create([
+            OutboundEmail(
+                subject='Subject', message='Message',
+                recipient=f'voter{i}@test.com'
+            ) for i in range(n)
+        ]))
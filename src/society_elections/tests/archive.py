@@ -0,0 +1,123 @@
+"""Module to test the archive module of society_elections"""
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..archive import ArchiveError, archive_election, restore_election
+from ..models import (Candidate, Election, ElectionPosition, Position,
+                      RegisteredVoter, Vote, VoteTally)
+from ..results import freeze_results
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position, create_user,
+                      create_voter)
+
+
+class ArchiveElectionTestCase(TestCase):
+    """Tests the archive.archive_election and restore_election functions"""
+    def setUp(self) -> None:
+        self.election = create_election(
+            anonymous=False, ended_at=timezone.now(), ended_by=create_user()
+        )
+        self.position = create_election_position(
+            self.election, create_position(title='Chair')
+        )
+        self.candidate = create_candidate(self.position)
+        for _ in range(7):
+            Vote.objects.create(
+                registered_voter=create_voter(self.election),
+                candidate=self.candidate,
+                position=self.position
+            )
+        VoteTally.rebuild(self.election)
+        freeze_results(self.election)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'election.jsonl.gz')
+
+
+    def test_archive_deletes_election_and_restore_loads_it(self):
+        cast_at = sorted(Vote.objects.values_list('vote_cast_at', flat=True))
+        election_pk, candidate_pk = self.election.pk, self.candidate.pk
+        result = archive_election(self.election, self.path)
+        self.assertEqual(result.archived['society_elections.vote'], 7)
+        self.assertFalse(Election.objects.exists())
+        self.assertFalse(Vote.objects.exists())
+        self.assertFalse(RegisteredVoter.objects.exists())
+        # Positions are shared between elections
+        self.assertTrue(Position.objects.exists())
+
+        restored = restore_election(self.path)
+        self.assertEqual(restored, {
+            label: count for label, count in result.archived.items()
+            if label != 'society_elections.position'
+        })
+        self.assertEqual(Vote.objects.filter(
+            election=election_pk, candidate=candidate_pk
+        ).count(), 7)
+        self.assertEqual(
+            sorted(Vote.objects.values_list('vote_cast_at', flat=True)),
+            cast_at
+        )
+        self.assertTrue(Election.objects.get().frozen_results)
+
+
+    def test_deletes_in_batches(self):
+        with patch('society_elections.archive.time.sleep') as sleep:
+            result = archive_election(
+                self.election, self.path, batch_size=3, pause=0.5
+            )
+        # 7 votes and 7 voters are each deleted in 3 batches
+        self.assertEqual(sleep.call_count, 4)
+        sleep.assert_called_with(0.5)
+        self.assertEqual(result.deleted, sum(result.archived.values()) - 1)
+
+
+    def test_keep_writes_archive_without_deleting(self):
+        archive_election(self.election, self.path, delete=False)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(Vote.objects.count(), 7)
+
+
+    def test_unfinished_election_is_not_archived(self):
+        Election.objects.filter(pk=self.election.pk).update(
+            ended_at=None, ended_by=None
+        )
+        self.election.refresh_from_db()
+        with self.assertRaises(ArchiveError):
+            archive_election(self.election, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+    def test_restore_existing_election_raises(self):
+        archive_election(self.election, self.path, delete=False)
+        with self.assertRaises(ArchiveError):
+            restore_election(self.path)
+        self.assertEqual(Candidate.objects.count(), 1)
+
+
+    def test_restore_keeps_existing_positions(self):
+        archive_election(self.election, self.path)
+        Position.objects.update(title='Renamed')
+        restore_election(self.path)
+        self.assertEqual(
+            ElectionPosition.objects.get().position.title, 'Renamed'
+        )
+
+
+    def test_commands(self):
+        out = StringIO()
+        call_command(
+            'archive_election', self.election.pk, output=self.path,
+            pause=0, stdout=out
+        )
+        self.assertIn('to ' + self.path, out.getvalue())
+        call_command('restore_election', self.path, stdout=out)
+        self.assertIn(f'from {self.path}', out.getvalue())
+        self.assertEqual(Vote.objects.count(), 7)
+        with self.assertRaises(CommandError):
+            call_command('restore_election', self.path, stdout=out)
@@ -0,0 +1,25 @@
+"""Mocks a URL conf in a project with this app installed and
+SOCIETY_ELECTIONS_ASYNC_VIEWS enabled
+
+Used with override_settings(ROOT_URLCONF=...) by tests of the async views
+"""
+from django.urls import include, path
+
+from .. import urls
+from ..views import acreate_vote_ajax, adelete_vote_ajax, avote_view
+
+ASYNC_VIEWS = {
+    'vote': avote_view,
+    'vote_create': acreate_vote_ajax,
+    'vote_delete': adelete_vote_ajax,
+}
+
+urlpatterns = [
+    path('', include(([
+        path(
+            str(pattern.pattern),
+            ASYNC_VIEWS.get(pattern.name, pattern.callback),
+            name=pattern.name
+        ) for pattern in urls.urlpatterns
+    ], urls.app_name)))
+]
@@ -0,0 +1,120 @@
+"""Module to test the ballot module and ballot view of society_elections"""
+import json
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..ballot import get_ballot
+from ..caching import invalidate_latest_election
+from ..models import Candidate, Election
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position)
+
+
+class BallotTestCase(TestCase):
+    """Tests the ballot.get_ballot function and views.vote.ballot_view"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        cls.position = create_election_position(
+            cls.election, create_position(title='President'),
+            positions_available=2
+        )
+        cls.candidate = create_candidate(cls.position, full_name='Alice')
+        cls.unverified = create_candidate(
+            cls.position, full_name='Bob', email_verified=False
+        )
+        cls.ron = create_candidate(
+            cls.position, full_name='RON', email=Candidate.RON_EMAIL
+        )
+
+
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    def test_ballot_contains_verified_candidates(self):
+        ballot = json.loads(get_ballot(self.election).content)
+        position, = ballot['positions']
+        self.assertEqual(position['title'], 'President')
+        self.assertEqual(position['positions_available'], 2)
+        self.assertEqual(
+            [(c['full_name'], c['ron']) for c in position['candidates']],
+            [('Alice', False), ('RON', True)]
+        )
+
+
+    def test_snapshot_reused_until_ballot_changes(self):
+        snapshot = get_ballot(self.election)
+        with self.assertNumQueries(0):
+            self.assertIs(get_ballot(self.election), snapshot)
+
+        self.candidate.manifesto = 'New manifesto'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidate.save()
+        changed = get_ballot(self.election)
+        self.assertNotEqual(changed.version, snapshot.version)
+        self.assertIn(b'New manifesto', changed.content)
+
+
+    def test_position_changes_invalidate_snapshot(self):
+        snapshot = get_ballot(self.election)
+        self.position.position.title = 'Chair'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.position.position.save()
+        self.assertNotEqual(get_ballot(self.election).version, snapshot.version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unverified.delete()
+        self.assertIsNot(get_ballot(self.election), snapshot)
+
+
+    def test_view_revalidates_with_etag(self):
+        url = reverse('society_elections:ballot')
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['election'], self.election.pk)
+        self.assertIn('no-cache', res['Cache-Control'])
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+
+
+    def test_view_returns_changed_ballot(self):
+        url = reverse('society_elections:ballot')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            create_candidate(self.position, full_name='Carol')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res['ETag'], etag)
+
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+    }})
+    def test_view_without_cache(self):
+        url = reverse('society_elections:ballot')
+        for _ in range(2):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['election'], self.election.pk)
+
+
+    def test_view_only_during_voting(self):
+        Election.objects.filter(pk=self.election.pk).update(
+            voting_start=timezone.now()+timedelta(days=1),
+            voting_end=timezone.now()+timedelta(days=2)
+        )
+        invalidate_latest_election()
+        res = self.client.get(reverse('society_elections:ballot'))
+        self.assertNotEqual(res.get('Content-Type'), 'application/json')
@@ -0,0 +1,348 @@
+"""Benchmarks every view of society_elections against elections of several
+sizes
+
+Each view is requested once per fixture size, recording the number of queries,
+wall time and peak memory allocated. A view fails the benchmark if its number
+of queries changes with the size of the election, i.e. it has an N+1 query.
+
+Set SOCIETY_ELECTIONS_BENCHMARK_REPORT to a path to write the measurements as
+JSON, e.g. with `make benchmark`, to compare them between releases.
+"""
+import json
+import os
+import platform
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict, List, NamedTuple, Tuple
+from unittest.mock import patch
+
+import django
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from .. import app_settings, urls
+from ..caching import invalidate_latest_election
+from ..models import (Candidate, Election, ElectionPosition, RegisteredVoter,
+                      Vote)
+from ..results import freeze_results
+from ..synthetic import generate_election, period_dates
+from .helpers import create_user
+
+REPORT_ENV = 'SOCIETY_ELECTIONS_BENCHMARK_REPORT'
+
+# Templates standing in for those of a project, which use the relations a
+# real page would display
+BENCHMARK_TEMPLATES = {
+    'society_elections/election_detail.html': (
+        '{{ election.title }} {{ election_period }}'
+    ),
+    'society_elections/election_finished.html': '{{ election.title }}',
+    'society_elections/election_wrong_period.html': '{{ election.title }}',
+    'society_elections/election_results.html': (
+        '{{ election.title }} {{ results.turnout }}'
+        '{% for position in positions %}{{ position.title }}'
+        '{% for candidate in position.candidates %}'
+        '{{ candidate.full_name }} {{ candidate.votes }}'
+        '{% endfor %}{% endfor %}'
+    ),
+    'society_elections/nomination_form.html': '{{ election.title }} {{ form }}',
+    'society_elections/nomination_success.html': '',
+    'society_elections/candidate_verify.html': '{{ verified }}',
+    'society_elections/voter_form.html': '{{ election.title }} {{ form }}',
+    'society_elections/voter_exists.html': '{{ voter.email }}',
+    'society_elections/voter_verification_sent.html': '{{ voter.email }}',
+    'society_elections/voter_verified_anon_election.html': '{{ password }}',
+    'society_elections/voter_404.html': '{{ uuid }}',
+    'society_elections/voter_not_verified.html': '{{ voter.email }}',
+    'society_elections/password_entry.html': '',
+    'society_elections/vote_submitted.html': '',
+    'society_elections/vote.html': (
+        '{{ election.title }}'
+        '{% for position in positions %}'
+        '{{ position.position.title }} {{ position.positions_available }}'
+        '{% endfor %}'
+        '{% for candidate in candidates %}'
+        '{{ candidate.full_name }} {{ candidate.position.position.title }}'
+        '{% endfor %}'
+        '{% for candidate in candidates_voted %}{{ candidate }}{% endfor %}'
+        '{% for vote in votes %}{{ vote.candidate }}{% endfor %}'
+    ),
+}
+
+
+class FixtureSize(NamedTuple):
+    """Size of a benchmark election
+
+    Attributes:
+        positions (int): Number of positions in the election
+        candidates (int): Number of candidates standing for each position
+        voters (int): Number of registered voters, each voting in every
+            position
+    """
+    positions: int
+    candidates: int
+    voters: int
+
+
+SIZES = [
+    FixtureSize(positions=3, candidates=2, voters=5),
+    FixtureSize(positions=8, candidates=6, voters=50),
+]
+
+
+class Fixture(NamedTuple):
+    """An election loaded for the benchmarks, and the rows requests use
+
+    Attributes:
+        votes (dict): PK of the candidate the voter voted for in each
+            position, by position PK
+        others (dict): PK of a candidate the voter did not vote for in each
+            position, by position PK
+    """
+    election: Election
+    positions: List[ElectionPosition]
+    voter: RegisteredVoter
+    unverified_voter: RegisteredVoter
+    unverified_candidate: Candidate
+    votes: Dict[int, int]
+    others: Dict[int, int]
+
+
+def load_fixture(size: FixtureSize) -> Fixture:
+    """Generate an election of the given size
+
+    Args:
+        size (FixtureSize): Size of the election
+
+    Returns:
+        Fixture: The election created
+    """
+    generated = generate_election(
+        positions=size.positions,
+        candidates=size.candidates,
+        voters=size.voters,
+        period=Election.NOMINATIONS,
+        seed=0,
+        created_by=create_user(),
+        title='Benchmark Election',
+        email_domain='test.com'
+    )
+    election, positions = generated.election, generated.positions
+    unverified_candidate = Candidate.objects.create(
+        position=positions[0], full_name='Unverified',
+        email='unverified@test.com', manifesto='Manifesto',
+        email_uuid=uuid.uuid4()
+    )
+    RegisteredVoter.objects.filter(election=election).update(
+        verified_at=timezone.now()
+    )
+    unverified_voter = RegisteredVoter.objects.create(
+        election=election, email='unverified@test.com'
+    )
+    voter = RegisteredVoter.objects.get(
+        election=election, email='voter0@test.com'
+    )
+    votes = dict(Vote.objects.filter(registered_voter=voter).values_list(
+        'position', 'candidate'
+    ))
+    others = {}
+    for candidate in generated.candidates:
+        if votes[candidate.position_id] != candidate.pk:
+            others.setdefault(candidate.position_id, candidate.pk)
+    return Fixture(
+        election, positions, voter, unverified_voter, unverified_candidate,
+        votes, others
+    )
+
+
+def set_period(election: Election, period: str) -> None:
+    """Move the dates of an election so it is in the given period
+
+    Args:
+        election (Election): Election to move
+        period (str): Election.NOMINATIONS, VOTING, or FINISHED, in which
+            case the election is ended and its results frozen
+    """
+    elections = Election.objects.filter(pk=election.pk)
+    if period == Election.FINISHED:
+        elections.update(
+            ended_at=timezone.now(), ended_by=election.created_by,
+            **period_dates(Election.POSTVOTING)
+        )
+        freeze_results(election)
+    else:
+        elections.update(
+            ended_at=None, ended_by=None, **period_dates(period)
+        )
+    invalidate_latest_election()
+
+
+class Scenario(NamedTuple):
+    """A request to benchmark
+
+    Attributes:
+        period (str): Period the election must be in
+        method (str): 'get' or 'post'
+        data (Callable): Function returning the data to send from a Fixture
+    """
+    period: str
+    method: str
+    data: Callable[[Fixture], dict]
+
+
+def ballot(fixture: Fixture) -> dict:
+    """Change the vote of the voter in every position"""
+    return {
+        'uuid': fixture.voter.pk,
+        'candidate': list(fixture.others.values())
+    }
+
+
+# Every view in society_elections.urls, by URL name
+SCENARIOS: Dict[str, Scenario] = {
+    'index': Scenario(Election.VOTING, 'get', lambda f: {}),
+    'nomination_create': Scenario(Election.NOMINATIONS, 'get', lambda f: {}),
+    'nomination_success': Scenario(Election.NOMINATIONS, 'get', lambda f: {}),
+    'candidate_verify': Scenario(Election.NOMINATIONS, 'get', lambda f: {
+        'uuid': f.unverified_candidate.email_uuid
+    }),
+    'voter_create': Scenario(Election.VOTING, 'post', lambda f: {
+        'email': 'new@test.com'
+    }),
+    'voter_verify': Scenario(Election.VOTING, 'get', lambda f: {
+        'uuid': f.unverified_voter.pk
+    }),
+    'voter_resend_verification': Scenario(
+        Election.VOTING, 'post', lambda f: {'uuid': f.unverified_voter.pk}
+    ),
+    'vote': Scenario(Election.VOTING, 'get', lambda f: {'uuid': f.voter.pk}),
+    'vote_submitted': Scenario(Election.VOTING, 'get', lambda f: {}),
+    'ballot': Scenario(Election.VOTING, 'get', lambda f: {}),
+    'voter_login': Scenario(Election.VOTING, 'post', lambda f: {
+        'uuid': f.voter.pk
+    }),
+    'vote_create': Scenario(Election.VOTING, 'post', lambda f: {
+        'uuid': f.voter.pk,
+        'position': f.positions[0].pk,
+        'candidate': f.others[f.positions[0].pk]
+    }),
+    'vote_delete': Scenario(Election.VOTING, 'post', lambda f: {
+        'uuid': f.voter.pk,
+        'position': f.positions[-1].pk,
+        'candidate': f.votes[f.positions[-1].pk]
+    }),
+    'ballot_submit': Scenario(Election.VOTING, 'post', ballot),
+    'results': Scenario(Election.FINISHED, 'get', lambda f: {}),
+}
+
+
+class Measurement(NamedTuple):
+    """Measurements of a single request"""
+    view: str
+    size: FixtureSize
+    status_code: int
+    queries: int
+    wall_time: float
+    peak_memory: int
+
+
+@override_settings(TEMPLATES=[{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', BENCHMARK_TEMPLATES),
+        ],
+        'context_processors': [
+            'django.template.context_processors.request',
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}])
+class ViewBenchmarkTestCase(TestCase):
+    """Benchmarks the query count, time, and memory of every view"""
+    def measure(
+        self, name: str, fixture: Fixture, size: FixtureSize
+    ) -> Measurement:
+        """Request a view once, measuring the request"""
+        scenario = SCENARIOS[name]
+        set_period(fixture.election, scenario.period)
+        url = reverse(f'society_elections:{name}')
+        data = scenario.data(fixture)
+        request = getattr(self.client, scenario.method)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                res = request(url, data)
+                wall_time = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return Measurement(
+            name, size, res.status_code, len(queries), wall_time, peak_memory
+        )
+
+
+    # A single shard makes the queries counting votes deterministic
+    @patch.object(app_settings, 'TALLY_SHARDS', 1)
+    def run_benchmarks(self) -> List[Measurement]:
+        """Measure every view at every size"""
+        measurements = []
+        for size in SIZES:
+            # Run the cache invalidations which would follow the commit
+            with self.captureOnCommitCallbacks(execute=True):
+                Election.objects.all().delete()
+                fixture = load_fixture(size)
+            for name in SCENARIOS:
+                measurements.append(self.measure(name, fixture, size))
+        return measurements
+
+
+    def write_report(self, measurements: List[Measurement]) -> None:
+        """Write the measurements to REPORT_ENV as JSON, if set"""
+        path = os.environ.get(REPORT_ENV)
+        if not path:
+            return
+        with open(path, 'w') as report:
+            json.dump({
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'measurements': [
+                    dict(measurement._asdict(), size=measurement.size._asdict())
+                    for measurement in measurements
+                ]
+            }, report, indent=2)
+
+
+    def test_every_url_has_scenario(self):
+        names = {
+            pattern.name for pattern in urls.urlpatterns
+            if isinstance(pattern, URLPattern)
+        }
+        self.assertEqual(names, set(SCENARIOS))
+
+
+    def test_query_counts_do_not_grow_with_election_size(self):
+        measurements = self.run_benchmarks()
+        self.write_report(measurements)
+        by_view: Dict[str, List[Tuple[FixtureSize, Measurement]]] = {}
+        for measurement in measurements:
+            self.assertLess(
+                measurement.status_code, 500,
+                f'{measurement.view} failed at {measurement.size}'
+            )
+            by_view.setdefault(measurement.view, []).append(measurement)
+        for view, view_measurements in by_view.items():
+            with self.subTest(view=view):
+                self.assertEqual(
+                    len({m.queries for m in view_measurements}), 1,
+                    f'Queries of {view} grow with election size: ' + ', '.join(
+                        f'{m.queries} at {tuple(m.size)}'
+                        for m in view_measurements
+                    )
+                )
@@ -0,0 +1,104 @@
+"""Module to test the caching module of society_elections"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..caching import (election_cache_timeout, get_cached_latest_election,
+                       invalidate_latest_election)
+from ..models import Election
+from .helpers import create_election, create_user
+
+
+class CachedLatestElectionTestCase(TestCase):
+    """Tests the caching.get_cached_latest_election function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now()-timedelta(hours=1),
+            voting_end=timezone.now()+timedelta(minutes=10),
+        )
+
+
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    def test_cached_election_needs_no_queries(self):
+        get_cached_latest_election()
+        with self.assertNumQueries(0):
+            election = get_cached_latest_election()
+            period = election.current_period
+        self.assertEqual(election, self.election)
+        self.assertEqual(election.title, self.election.title)
+        self.assertEqual(period, Election.VOTING)
+
+
+    def test_saving_election_invalidates_cache(self):
+        get_cached_latest_election()
+        self.election.title = 'New Title'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election.save()
+        self.assertEqual(get_cached_latest_election().title, 'New Title')
+
+
+    def test_new_election_invalidates_cache(self):
+        get_cached_latest_election()
+        with self.captureOnCommitCallbacks(execute=True):
+            new_election = create_election(
+                admin_title='New Election',
+                nominations_start=timezone.now()
+            )
+        self.assertEqual(get_cached_latest_election(), new_election)
+
+
+    def test_cache_invalidated_once_change_commits(self):
+        cached = get_cached_latest_election()
+        self.election.title = 'New Title'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election.save()
+            # A request before the change commits still sees the old title
+            self.assertEqual(get_cached_latest_election().title, cached.title)
+        self.assertEqual(get_cached_latest_election().title, 'New Title')
+
+
+    @override_settings(ROOT_URLCONF='society_elections.tests.urls')
+    def test_admin_ends_election_once_change_commits(self):
+        get_cached_latest_election()
+        self.client.force_login(User.objects.create_superuser(
+            'admin', 'admin@test.com', 'Test1234!'
+        ))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('admin:society_elections_election_changelist'), {
+                    'action': 'end_election',
+                    '_selected_action': [self.election.pk]
+                }
+            )
+            self.assertEqual(
+                get_cached_latest_election().current_period, Election.VOTING
+            )
+        self.assertEqual(
+            get_cached_latest_election().current_period, Election.FINISHED
+        )
+
+
+    def test_ending_election_with_update_is_visible(self):
+        get_cached_latest_election()
+        Election.objects.filter(pk=self.election.pk).update(
+            ended_at=timezone.now(), ended_by=create_user()
+        )
+        invalidate_latest_election()
+        self.assertEqual(
+            get_cached_latest_election().current_period, Election.FINISHED
+        )
+
+
+    def test_timeout_expires_at_next_period_change(self):
+        timeout = election_cache_timeout(self.election)
+        self.assertGreater(timeout, 9 * 60)
+        self.assertLessEqual(timeout, 10 * 60)
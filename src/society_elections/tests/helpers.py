@@ -41,10 +41,12 @@ def create_election(
     )
 
 
-def create_voter(election: Election) -> RegisteredVoter:
+def create_voter(election: Election, email: str=None) -> RegisteredVoter:
+    if email is None:
+        email = f'{uuid.uuid4()}@test.com'
     return RegisteredVoter.objects.create(
         election=election,
-        email=EMAIL,
+        email=email,
         verified_at=timezone.now()
     )
 
@@ -0,0 +1,207 @@
+"""Module to test the jobs module of society_elections"""
+import csv
+import gzip
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import jobs
+from ..exports import VOTE_CSV_HEADER
+from ..jobs import (claim_job, iter_output, queue_job, resume_jobs, run_job,
+                    run_jobs)
+from ..models import Candidate, Job, JobOutput, OutboundEmail, Vote
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position, create_voter)
+
+
+class JobsTestCase(TestCase):
+    """Tests the jobs module and the run_jobs command"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=False, verify_candidate_emails=True,
+            candidate_verification_email='Verify {name}: {verify_url}'
+        )
+        cls.position = create_election_position(
+            cls.election, create_position(title='Chair')
+        )
+        cls.candidate = create_candidate(cls.position, full_name='Candidate')
+
+
+    def create_votes(self, count: int) -> None:
+        for _ in range(count):
+            Vote.objects.create(
+                registered_voter=create_voter(self.election),
+                candidate=self.candidate,
+                position=self.position
+            )
+
+
+    def expected_csv(self) -> str:
+        """Get the CSV of every vote, which the export should match"""
+        out = StringIO()
+        writer = csv.writer(out)
+        writer.writerow(VOTE_CSV_HEADER)
+        for vote in Vote.objects.order_by('pk'):
+            writer.writerow([
+                vote.registered_voter_id, self.election.pk,
+                self.election.admin_title, self.election.anonymous, 'Chair',
+                'Candidate', self.candidate.pk, vote.vote_cast_at.isoformat(),
+                vote.vote_last_modified_at.isoformat()
+            ])
+        return out.getvalue()
+
+
+    def queue_export(self) -> Job:
+        return queue_job(
+            'export_votes', 'Export votes', {'elections': [self.election.pk]},
+            Vote.objects.count()
+        )
+
+
+    def test_export_matches_csv_in_chunks(self):
+        self.create_votes(25)
+        job = self.queue_export()
+        self.assertEqual(run_jobs(chunk_size=10), {'succeeded': 1, 'failed': 0})
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.processed, 25)
+        self.assertEqual(job.outputs.count(), 3)
+        self.assertEqual(
+            gzip.decompress(b''.join(iter_output(job))).decode(),
+            self.expected_csv()
+        )
+
+
+    def test_failed_job_resumes_from_cursor(self):
+        self.create_votes(25)
+        job = self.queue_export()
+        export_votes = jobs.JOB_KINDS['export_votes']
+        calls = []
+
+        def fail_third_chunk(job, chunk_size):
+            calls.append(job.processed)
+            if len(calls) == 3:
+                raise RuntimeError('Worker stopped')
+            return export_votes(job, chunk_size)
+
+        with patch.dict(jobs.JOB_KINDS, export_votes=fail_third_chunk):
+            self.assertEqual(run_jobs(chunk_size=10)['failed'], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.processed, 20)
+        self.assertIn('Worker stopped', job.error)
+
+        self.assertEqual(resume_jobs(Job.objects.all()), 1)
+        self.assertEqual(run_jobs(chunk_size=10)['succeeded'], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.processed, 25)
+        self.assertEqual(
+            gzip.decompress(b''.join(iter_output(job))).decode(),
+            self.expected_csv()
+        )
+
+
+    def test_stale_running_job_is_claimed_again(self):
+        job = self.queue_export()
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, heartbeat_at=timezone.now()
+        )
+        self.assertEqual(run_jobs(), {'succeeded': 0, 'failed': 0})
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now()-timedelta(hours=1)
+        )
+        self.assertEqual(run_jobs(), {'succeeded': 1, 'failed': 0})
+
+
+    def test_slow_worker_stops_once_job_claimed_again(self):
+        self.create_votes(25)
+        job = self.queue_export()
+        slow = claim_job()
+        Job.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now()-timedelta(hours=1)
+        )
+        fast = claim_job()
+        self.assertNotEqual(slow.claim_token, fast.claim_token)
+
+        self.assertFalse(run_job(slow, chunk_size=10))
+        self.assertFalse(JobOutput.objects.exists())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (Job.RUNNING, 0))
+
+        self.assertTrue(run_job(fast, chunk_size=10))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(
+            gzip.decompress(b''.join(iter_output(job))).decode(),
+            self.expected_csv()
+        )
+
+
+    def test_voter_resend_emails_unverified_voters(self):
+        verified = create_voter(self.election)
+        unverified = [create_voter(self.election) for _ in range(3)]
+        for voter in unverified:
+            voter.verified_at = None
+            voter.save()
+        pks = [str(voter.pk) for voter in [verified, *unverified]]
+        queue_job(
+            'resend_voter_verification', 'Resend', {'pks': pks}, len(pks)
+        )
+        run_jobs(chunk_size=2)
+        self.assertEqual(OutboundEmail.objects.count(), 3)
+        self.assertEqual(Job.objects.get().processed, 4)
+
+
+    def test_candidate_resend_regenerates_uuid(self):
+        old_uuid = self.candidate.email_uuid
+        queue_job(
+            'resend_candidate_verification', 'Resend',
+            {'pks': [self.candidate.pk]}, 1
+        )
+        run_jobs()
+        self.assertNotEqual(
+            Candidate.objects.get(pk=self.candidate.pk).email_uuid, old_uuid
+        )
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.recipient, self.candidate.email)
+
+
+    def test_command_runs_jobs(self):
+        self.create_votes(2)
+        self.queue_export()
+        out = StringIO()
+        call_command('run_jobs', stdout=out)
+        self.assertIn('Ran 1 jobs, 0 failed', out.getvalue())
+
+
+    @override_settings(ROOT_URLCONF='society_elections.tests.urls')
+    def test_admin_action_queues_job_and_downloads_result(self):
+        self.create_votes(3)
+        user = User.objects.create_superuser(
+            'admin', 'admin@test.com', 'Test1234!'
+        )
+        self.client.force_login(user)
+        self.client.post(
+            reverse('admin:society_elections_election_changelist'), {
+                'action': 'export_votes_action',
+                '_selected_action': [self.election.pk]
+            }
+        )
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.total), ('export_votes', 3))
+        run_jobs()
+        res = self.client.get(
+            reverse('admin:society_elections_job_download', args=[job.pk])
+        )
+        self.assertEqual(res['Content-Type'], 'application/gzip')
+        self.assertEqual(
+            gzip.decompress(b''.join(res.streaming_content)).decode(),
+            self.expected_csv()
+        )
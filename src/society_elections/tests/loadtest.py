@@ -0,0 +1,189 @@
+"""Module to test the loadtest module of society_elections"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import (LiveServerTestCase, TestCase, TransactionTestCase,
+                         override_settings)
+from django.utils import timezone
+
+from .. import app_settings
+from ..caching import invalidate_latest_election
+from ..loadtest import NEVER_SEND_PATTERN, percentile, run_load_test
+from ..models import OutboundEmail, RegisteredVoter, Vote
+from .benchmarks import BENCHMARK_TEMPLATES
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position)
+
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', BENCHMARK_TEMPLATES),
+        ],
+        'context_processors': [
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}]
+# Templates rendering the CSRF token in the registration form, as a site's
+# own templates would
+CSRF_TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', {
+                **BENCHMARK_TEMPLATES,
+                'society_elections/voter_form.html':
+                    '{% csrf_token %} {{ election.title }} {{ form }}',
+            }),
+        ],
+    },
+}]
+CSRF_MIDDLEWARE = (
+    *settings.MIDDLEWARE, 'django.middleware.csrf.CsrfViewMiddleware'
+)
+
+
+def create_voting_election(anonymous: bool):
+    """Create an election in its voting period with two positions"""
+    election = create_election(
+        anonymous=anonymous,
+        nominations_start=timezone.now() - timedelta(days=3),
+        nominations_end=timezone.now() - timedelta(days=2),
+        voting_start=timezone.now() - timedelta(days=1),
+        voting_end=timezone.now() + timedelta(days=1),
+        voter_email_domain_whitelist='test.com'
+    )
+    single = create_election_position(
+        election, create_position(admin_title='Single')
+    )
+    multiple = create_election_position(
+        election, create_position(admin_title='Multiple'),
+        positions_available=2
+    )
+    for position in (single, multiple):
+        for i in range(3):
+            create_candidate(position, full_name=f'Candidate {i}')
+    return election
+
+
+@patch.object(app_settings, 'OUTBOX_NEVER_SEND', NEVER_SEND_PATTERN)
+@override_settings(TEMPLATES=TEMPLATES)
+class RunLoadTestTestCase(TestCase):
+    """Tests the loadtest.run_load_test function"""
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 50), 0)
+
+
+    def test_registered_voters_complete_flow(self):
+        election = create_voting_election(anonymous=False)
+        report = run_load_test(election, voters=3, concurrency=1, seed=1)
+        self.assertEqual(report.completed, 3, report.errors)
+        self.assertEqual(report.violations, [])
+        self.assertLessEqual(
+            {'voter_create', 'voter_verify', 'vote', 'voter_login',
+             'vote_create'},
+            {stats.endpoint for stats in report.endpoints}
+        )
+
+
+    def test_simulated_voters_are_removed(self):
+        election = create_voting_election(anonymous=False)
+        run_load_test(election, voters=2, concurrency=1)
+        self.assertFalse(RegisteredVoter.objects.exists())
+        self.assertFalse(Vote.objects.exists())
+        self.assertFalse(OutboundEmail.objects.exists())
+
+
+    @override_settings(TEMPLATES=CSRF_TEMPLATES, MIDDLEWARE=CSRF_MIDDLEWARE)
+    def test_voters_send_csrf_tokens(self):
+        election = create_voting_election(anonymous=False)
+        report = run_load_test(election, voters=2, concurrency=1, seed=1)
+        self.assertEqual(report.completed, 2, report.errors)
+
+
+    def test_emails_must_never_be_sent(self):
+        election = create_voting_election(anonymous=False)
+        with patch.object(app_settings, 'OUTBOX_NEVER_SEND', None):
+            with self.assertRaises(ValueError):
+                run_load_test(election, voters=1, concurrency=1)
+            with self.assertRaises(CommandError):
+                call_command(
+                    'loadtest_election', voters=1, concurrency=1,
+                    stdout=StringIO(), stderr=StringIO()
+                )
+        self.assertFalse(RegisteredVoter.objects.exists())
+
+
+    def test_command_reports_endpoints(self):
+        create_voting_election(anonymous=False)
+        stdout = StringIO()
+        call_command(
+            'loadtest_election', voters=2, concurrency=1, stdout=stdout,
+            stderr=StringIO()
+        )
+        self.assertIn('2/2 voters completed', stdout.getvalue())
+        self.assertIn('vote_create', stdout.getvalue())
+
+
+@patch.object(app_settings, 'OUTBOX_NEVER_SEND', NEVER_SEND_PATTERN)
+@override_settings(TEMPLATES=TEMPLATES)
+class ConcurrentLoadTestTestCase(TransactionTestCase):
+    """Tests loadtest.run_load_test with transactions committed, so emails
+    are queued and voters can be simulated concurrently
+    """
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    def test_anonymous_voters_complete_flow(self):
+        election = create_voting_election(anonymous=True)
+        report = run_load_test(election, voters=3, concurrency=1, seed=1)
+        self.assertEqual(report.completed, 3, report.errors)
+        self.assertEqual(report.violations, [])
+
+
+    def test_concurrent_voters_keep_invariants(self):
+        election = create_voting_election(anonymous=False)
+        report = run_load_test(
+            election, voters=8, concurrency=4, seed=1, keep=True
+        )
+        self.assertEqual(report.violations, [])
+
+
+# The live server serves static files from STATIC_URL
+@override_settings(
+    TEMPLATES=CSRF_TEMPLATES, MIDDLEWARE=CSRF_MIDDLEWARE, STATIC_URL='/static/'
+)
+class HttpLoadTestTestCase(LiveServerTestCase):
+    """Tests loadtest.run_load_test sending requests to a server over HTTP"""
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    # Every request comes from the same address
+    @patch.dict(app_settings.THROTTLE_RATES, {
+        scope: {'ip': None} for scope in app_settings.THROTTLE_RATES
+    })
+    @patch.object(app_settings, 'OUTBOX_NEVER_SEND', NEVER_SEND_PATTERN)
+    def test_registered_voters_complete_flow(self):
+        election = create_voting_election(anonymous=False)
+        report = run_load_test(
+            election, voters=2, concurrency=1, base_url=self.live_server_url,
+            seed=1
+        )
+        self.assertEqual(report.completed, 2, report.errors)
+        self.assertEqual(report.violations, [])
+        self.assertFalse(OutboundEmail.objects.exists())
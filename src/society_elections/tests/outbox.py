@@ -0,0 +1,164 @@
+"""Module to test the outbox module of society_elections"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import app_settings
+from ..loadtest import NEVER_SEND_PATTERN
+from ..models import OutboundEmail
+from ..outbox import send_queued_mail
+from .helpers import create_election, create_voter
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+)
+class SendQueuedMailTestCase(TestCase):
+    """Tests the outbox.send_queued_mail function"""
+    def queue(self, **kwargs) -> OutboundEmail:
+        """Queue an email, committing it immediately"""
+        with self.captureOnCommitCallbacks(execute=True):
+            OutboundEmail.queue(
+                kwargs.pop('subject', 'Subject'),
+                kwargs.pop('message', 'Message'),
+                kwargs.pop('recipient', 'voter@test.com'),
+                **kwargs
+            )
+        return OutboundEmail.objects.latest('pk')
+
+
+    def test_queue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            OutboundEmail.queue('Subject', 'Message', 'voter@test.com')
+            self.assertFalse(OutboundEmail.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+
+
+    def test_voter_verification_email_is_queued(self):
+        election = create_election(anonymous=False)
+        voter = create_voter(election)
+        voter.verified_at = None
+        with self.captureOnCommitCallbacks(execute=True):
+            voter.send_verification_email()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            OutboundEmail.objects.get().recipient, voter.email
+        )
+
+
+    def test_sends_pending_emails(self):
+        email = self.queue(html_message='<p>Message</p>')
+        result = send_queued_mail()
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['voter@test.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.SENT)
+        self.assertEqual(email.attempts, 1)
+
+
+    def test_sends_in_batches(self):
+        for i in range(3):
+            self.queue(recipient=f'voter{i}@test.com')
+        self.assertEqual(send_queued_mail(batch_size=2).sent, 2)
+        self.assertEqual(send_queued_mail(batch_size=2).sent, 1)
+        self.assertEqual(send_queued_mail(batch_size=2).sent, 0)
+
+
+    def test_never_send_recipients_stay_queued(self):
+        email = self.queue(recipient='loadtest-0123abcd-0@test.com')
+        with patch.object(
+            app_settings, 'OUTBOX_NEVER_SEND', NEVER_SEND_PATTERN
+        ):
+            self.assertEqual(send_queued_mail(), (0, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertEqual(len(mail.outbox), 0)
+        # Sent to by default
+        self.assertEqual(send_queued_mail().sent, 1)
+
+
+    def test_sensitive_email_is_erased_once_sent(self):
+        email = self.queue(message='Password', sensitive=True)
+        send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.message, '')
+        self.assertEqual(mail.outbox[0].body, 'Password')
+
+
+    def test_failed_email_is_retried_later(self):
+        email = self.queue()
+        with patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError('Server unavailable')
+        ):
+            result = send_queued_mail()
+        self.assertEqual(result.failed, 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.PENDING)
+        self.assertIn('Server unavailable', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(send_queued_mail(), (0, 0))
+
+        OutboundEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(send_queued_mail().sent, 1)
+
+
+    def test_email_fails_after_max_attempts(self):
+        email = self.queue()
+        OutboundEmail.objects.update(
+            attempts=app_settings.OUTBOX_MAX_ATTEMPTS - 1
+        )
+        with patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError('Server unavailable')
+        ):
+            send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+
+
+    def test_sensitive_email_is_erased_once_failed(self):
+        email = self.queue(message='Password', sensitive=True)
+        OutboundEmail.objects.update(
+            attempts=app_settings.OUTBOX_MAX_ATTEMPTS - 1
+        )
+        with patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError('Server unavailable')
+        ):
+            send_queued_mail()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
+        self.assertEqual((email.message, email.html_message), ('', ''))
+
+
+    @override_settings(ROOT_URLCONF='society_elections.tests.urls')
+    def test_admin_hides_sensitive_body(self):
+        self.client.force_login(User.objects.create_superuser(
+            'admin', 'admin@test.com', 'Test1234!'
+        ))
+        email = self.queue(message='SecretPassword', sensitive=True)
+        res = self.client.get(reverse(
+            'admin:society_elections_outboundemail_change', args=[email.pk]
+        ))
+        self.assertEqual(res.status_code, 200)
+        self.assertNotContains(res, 'SecretPassword')
+
+        OutboundEmail.objects.update(status=OutboundEmail.FAILED)
+        self.client.post(
+            reverse('admin:society_elections_outboundemail_changelist'), {
+                'action': 'retry_action', '_selected_action': [email.pk]
+            }
+        )
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.FAILED)
@@ -0,0 +1,95 @@
+"""Module to test that the hot lookups of society_elections are served by
+indexes, by checking the query plans SQLite chooses"""
+import re
+import uuid
+
+from django.db import IntegrityError, connection
+from django.db.models.query import QuerySet
+from django.test import TestCase, skipUnlessDBFeature
+
+from ..models import AnonymousVoter, Candidate, RegisteredVoter, Vote
+from .helpers import (create_anon_voter, create_candidate, create_election,
+                      create_election_position, create_position, create_voter)
+
+
+@skipUnlessDBFeature('supports_explaining_query_execution')
+class QueryPlanTestCase(TestCase):
+    """Tests that the queries of the voting, registration and nomination
+    views, and of ElectionPositionAdmin, search an index rather than scanning
+    their table
+    """
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(anonymous=False)
+        cls.position = create_election_position(
+            cls.election, create_position()
+        )
+        cls.candidate = create_candidate(cls.position)
+        cls.voter = create_voter(cls.election)
+        cls.anon_voter = create_anon_voter(cls.election)
+
+
+    def assertNoTableScan(self, queryset: QuerySet) -> None:
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are only checked on SQLite')
+        plan = queryset.explain()
+        table = queryset.model._meta.db_table
+        # SQLite reports "SEARCH <table> USING INDEX ..." when it looks rows
+        # up in an index, and "SCAN <table> ..." when it reads every row
+        self.assertIsNone(
+            re.search(rf'\bSCAN {table}\b', plan),
+            f'Full scan of {table}:\n{plan}'
+        )
+
+
+    def test_vote_lookups(self):
+        for queryset in (
+            Vote.objects.filter(
+                position=self.position, registered_voter=self.voter
+            ),
+            Vote.objects.filter(
+                position=self.position, anonymous_voter=self.anon_voter
+            ),
+            Vote.objects.filter(registered_voter=self.voter),
+            Vote.objects.filter(anonymous_voter=self.anon_voter),
+            Vote.objects.filter(election=self.election),
+            Vote.objects.filter(
+                election=self.election
+            ).values('registered_voter').distinct(),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertNoTableScan(queryset)
+
+
+    def test_voter_lookups(self):
+        for queryset in (
+            RegisteredVoter.objects.filter(
+                election=self.election, email=self.voter.email
+            ),
+            RegisteredVoter.objects.filter(
+                election=self.election, pk=self.voter.pk
+            ),
+            AnonymousVoter.objects.filter(
+                election=self.election,
+                password=AnonymousVoter.hash_password('password')
+            ),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertNoTableScan(queryset)
+
+
+    def test_candidate_lookups(self):
+        for queryset in (
+            Candidate.objects.filter(email_uuid=uuid.uuid4()),
+            Candidate.objects.filter(
+                position=self.position, email=Candidate.RON_EMAIL
+            ),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertNoTableScan(queryset)
+
+
+    def test_voter_email_unique_in_election(self):
+        create_voter(create_election(), email=self.voter.email)
+        with self.assertRaises(IntegrityError):
+            create_voter(self.election, email=self.voter.email)
@@ -0,0 +1,177 @@
+"""Module to test the results module of society_elections"""
+from django.test import TestCase
+
+from ..models import Candidate, ElectionResults, Vote
+from ..results import calculate_results, freeze_results
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position)
+
+
+class CalculateResultsTestCase(TestCase):
+    """Tests the results.calculate_results function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(anonymous=True)
+        cls.single_position = create_election_position(
+            cls.election, create_position(admin_title='Single Position')
+        )
+        cls.multiple_position = create_election_position(
+            cls.election, create_position(admin_title='Multiple Position'),
+            positions_available=2
+        )
+
+
+    def vote(self, candidate: Candidate, count: int) -> None:
+        """Cast a number of votes for a candidate, each from a new voter"""
+        for _ in range(count):
+            voter = self.election.anonymous_voters.create(
+                password=str(Vote.objects.count()).encode()
+            )
+            Vote.objects.create(
+                anonymous_voter=voter,
+                candidate=candidate,
+                position=candidate.position
+            )
+
+
+    def test_most_votes_wins_single_position(self):
+        winner = create_candidate(self.single_position, full_name='Winner')
+        loser = create_candidate(self.single_position, full_name='Loser')
+        self.vote(winner, 3)
+        self.vote(loser, 1)
+        calculate_results(self.election)
+        winner.refresh_from_db()
+        loser.refresh_from_db()
+        self.assertTrue(winner.successful)
+        self.assertFalse(loser.successful)
+
+
+    def test_top_candidates_win_multiple_position(self):
+        first = create_candidate(self.multiple_position, full_name='First')
+        second = create_candidate(self.multiple_position, full_name='Second')
+        third = create_candidate(self.multiple_position, full_name='Third')
+        self.vote(first, 5)
+        self.vote(second, 4)
+        self.vote(third, 1)
+        results = calculate_results(self.election)
+        result = [r for r in results if r.position == self.multiple_position][0]
+        self.assertEqual(result.winners, [first, second])
+        self.assertEqual(result.seats_reopened, 0)
+
+
+    def test_candidate_must_beat_ron(self):
+        candidate = create_candidate(self.single_position)
+        ron = create_candidate(
+            self.single_position, full_name='RON', email=Candidate.RON_EMAIL
+        )
+        self.vote(candidate, 2)
+        self.vote(ron, 3)
+        results = calculate_results(self.election)
+        result = [r for r in results if r.position == self.single_position][0]
+        self.assertEqual(result.winners, [])
+        self.assertEqual(result.seats_reopened, 1)
+
+
+    def test_abstain_never_wins(self):
+        candidate = create_candidate(self.single_position)
+        abstain = create_candidate(
+            self.single_position, full_name='Abstain',
+            email=Candidate.ABSTAIN_EMAIL
+        )
+        self.vote(candidate, 1)
+        self.vote(abstain, 5)
+        results = calculate_results(self.election)
+        result = [r for r in results if r.position == self.single_position][0]
+        self.assertEqual(result.winners, [candidate])
+
+
+    def test_tie_for_last_seat_is_not_awarded(self):
+        first = create_candidate(self.multiple_position, full_name='First')
+        second = create_candidate(self.multiple_position, full_name='Second')
+        third = create_candidate(self.multiple_position, full_name='Third')
+        self.vote(first, 3)
+        self.vote(second, 2)
+        self.vote(third, 2)
+        results = calculate_results(self.election)
+        result = [r for r in results if r.position == self.multiple_position][0]
+        self.assertEqual(result.winners, [first])
+        self.assertEqual(set(result.tied), {second, third})
+        self.assertEqual(result.seats_reopened, 0)
+
+
+    def test_recalculating_clears_previous_winners(self):
+        first = create_candidate(self.single_position, full_name='First')
+        second = create_candidate(self.single_position, full_name='Second')
+        self.vote(first, 2)
+        calculate_results(self.election)
+        self.vote(second, 3)
+        calculate_results(self.election)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertFalse(first.successful)
+        self.assertTrue(second.successful)
+
+
+    def test_query_count_does_not_depend_on_votes(self):
+        candidates = [
+            create_candidate(self.single_position, full_name=f'Candidate {i}')
+            for i in range(5)
+        ]
+        for i, candidate in enumerate(candidates):
+            self.vote(candidate, i + 1)
+        # Positions, candidates, vote counts, and bulk update
+        with self.assertNumQueries(4):
+            calculate_results(self.election)
+
+
+class FreezeResultsTestCase(TestCase):
+    """Tests the results.freeze_results function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(anonymous=True)
+        cls.position = create_election_position(
+            cls.election, create_position(admin_title='Position')
+        )
+        cls.winner = create_candidate(cls.position, full_name='Winner')
+        cls.loser = create_candidate(cls.position, full_name='Loser')
+        for candidate in (cls.winner, cls.winner, cls.loser):
+            voter = cls.election.anonymous_voters.create(
+                password=str(Vote.objects.count()).encode()
+            )
+            Vote.objects.create(
+                anonymous_voter=voter, candidate=candidate,
+                position=cls.position
+            )
+        cls.election.anonymous_voters.create(password=b'abstained')
+
+
+    def test_snapshot_holds_totals_winners_and_turnout(self):
+        snapshot = freeze_results(self.election)
+        position, = snapshot.results['positions']
+        self.assertEqual(position['id'], self.position.pk)
+        self.assertEqual(
+            [(c['full_name'], c['votes'], c['successful'])
+             for c in position['candidates']],
+            [('Winner', 2, True), ('Loser', 1, False)]
+        )
+        self.assertEqual(snapshot.voters, 4)
+        self.assertEqual(snapshot.voters_voted, 3)
+        self.assertEqual(snapshot.votes_cast, 3)
+        self.assertEqual(snapshot.turnout, 0.75)
+        self.winner.refresh_from_db()
+        self.assertTrue(self.winner.successful)
+
+
+    def test_results_are_frozen_once(self):
+        snapshot = freeze_results(self.election)
+        Vote.objects.filter(candidate=self.winner).delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(freeze_results(self.election), snapshot)
+        self.assertEqual(ElectionResults.objects.count(), 1)
+
+
+    def test_snapshot_cannot_be_changed(self):
+        snapshot = freeze_results(self.election)
+        snapshot.votes_cast = 0
+        with self.assertRaises(ValueError):
+            snapshot.save()
@@ -0,0 +1,145 @@
+"""Module to test the roll module and import_voters command of
+society_elections"""
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..models import AnonymousVoter, OutboundEmail, RegisteredVoter
+from ..roll import import_voters
+from .helpers import create_election
+
+
+class ImportVotersTestCase(TestCase):
+    """Tests the roll.import_voters function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=False, voter_email_domain_whitelist='test.com'
+        )
+        cls.anon_election = create_election(
+            admin_title='Anonymous Test Election',
+            voter_email_domain_whitelist='test.com'
+        )
+
+
+    def test_creates_voters_in_batches(self):
+        emails = [f'voter{i}@test.com' for i in range(5)]
+        # Existing emails, then a savepoint, insert, and check of the voters
+        # inserted for each of 3 batches
+        with self.assertNumQueries(1 + 3 * 4):
+            result = import_voters(
+                self.election, emails, send_emails=False, batch_size=2
+            )
+        self.assertEqual(result.created, 5)
+        self.assertEqual(
+            set(self.election.registered_voters.values_list(
+                'email', flat=True
+            )), set(emails)
+        )
+
+
+    def test_duplicates_are_skipped(self):
+        RegisteredVoter.objects.create(
+            election=self.election, email='existing@test.com'
+        )
+        result = import_voters(self.election, [
+            'Existing@test.com', 'new@test.com', 'new@test.com'
+        ])
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.duplicates, 2)
+
+
+    def test_voters_registered_while_importing_are_skipped(self):
+        def emails():
+            yield 'new@test.com'
+            # Registers after the existing emails were read
+            RegisteredVoter.objects.create(
+                election=self.anon_election, email='late@test.com'
+            )
+            yield 'late@test.com'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = import_voters(self.anon_election, emails(), verified=True)
+        self.assertEqual((result.created, result.duplicates), (1, 1))
+        self.assertEqual(
+            self.anon_election.registered_voters.filter(
+                email='late@test.com'
+            ).count(), 1
+        )
+        self.assertEqual(AnonymousVoter.objects.count(), 1)
+        self.assertEqual(
+            list(OutboundEmail.objects.values_list('recipient', flat=True)),
+            ['new@test.com']
+        )
+
+
+    def test_invalid_emails_are_reported(self):
+        result = import_voters(self.election, [
+            'valid@test.com', 'plus+trick@test.com', 'voter@other.com',
+            'no-domain'
+        ])
+        self.assertEqual(result.created, 1)
+        self.assertEqual(
+            [line for line, _, _ in result.invalid], [2, 3, 4]
+        )
+
+
+    def test_unverified_voters_are_emailed_verification(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            import_voters(self.election, ['voter@test.com'])
+        voter = RegisteredVoter.objects.get()
+        self.assertFalse(voter.verified)
+        email = OutboundEmail.objects.get()
+        self.assertIn(voter.verify_url, email.message)
+
+
+    def test_verified_anonymous_voters_are_emailed_passwords(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            import_voters(
+                self.anon_election, ['one@test.com', 'two@test.com'],
+                verified=True
+            )
+        self.assertTrue(all(
+            voter.verified for voter in RegisteredVoter.objects.all()
+        ))
+        self.assertEqual(AnonymousVoter.objects.count(), 2)
+        for email in OutboundEmail.objects.all():
+            self.assertTrue(email.sensitive)
+            password = email.message.split('<b>')[1]
+            self.assertTrue(AnonymousVoter.objects.filter(
+                password=AnonymousVoter.hash_password(password)
+            ).exists())
+
+
+    def test_command_reads_csv(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as csv_file:
+            csv_file.write('name,email\nOne,one@test.com\nTwo,bad@other.com\n')
+        self.addCleanup(os.remove, path)
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'import_voters', path, election=self.election.pk, verified=True,
+            stdout=stdout, stderr=stderr
+        )
+        self.assertEqual(
+            list(RegisteredVoter.objects.values_list('email', flat=True)),
+            ['one@test.com']
+        )
+        self.assertIn('Line 3', stderr.getvalue())
+
+
+    def test_verified_anonymous_voters_without_emails_rejected(self):
+        with self.assertRaises(ValueError):
+            import_voters(
+                self.anon_election, ['one@test.com'], verified=True,
+                send_emails=False
+            )
+        with self.assertRaises(CommandError):
+            call_command(
+                'import_voters', '-', election=self.anon_election.pk,
+                verified=True, no_email=True, stdout=StringIO()
+            )
+        self.assertFalse(RegisteredVoter.objects.exists())
@@ -0,0 +1,250 @@
+"""Module to test the stv module of society_elections, and ranked voting
+
+The engine is compared against a naive reference count, which keeps a Python
+object per ballot and recounts every ballot in every round.
+"""
+import random
+import time
+from typing import Dict, List, Sequence
+
+from django.test import TestCase
+
+from ..models import ElectionPosition, Vote
+from ..results import calculate_results
+from ..stv import EPSILON, count_stv, droop_quota, pack_ballots
+from ..voting import VotingError, cast_vote, replace_ballot
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position, create_voter)
+
+
+def naive_stv(
+    ballots: List[Sequence[int]], candidates: Sequence[int], seats: int
+) -> List[int]:
+    """Count ballots with the same rules as stv.count_stv, one ballot at a
+    time
+    """
+    indices = {pk: index for index, pk in enumerate(candidates)}
+    papers = []
+    for ballot in ballots:
+        preferences = []
+        for pk in ballot:
+            if pk in indices and pk not in preferences:
+                preferences.append(pk)
+        if preferences:
+            papers.append({
+                'preferences': preferences, 'at': 0, 'weight': 1.0
+            })
+    quota = droop_quota(len(papers), seats)
+    hopeful = list(candidates)
+    elected = []
+    history: List[Dict[int, float]] = []
+    capped: Dict[int, float] = {}
+
+    def next_preference(paper: dict) -> None:
+        paper['at'] += 1
+        while (paper['at'] < len(paper['preferences'])
+               and paper['preferences'][paper['at']] not in hopeful):
+            paper['at'] += 1
+
+    def holder(paper: dict):
+        if paper['at'] < len(paper['preferences']):
+            return paper['preferences'][paper['at']]
+        return None
+
+    while len(elected) < seats and hopeful:
+        votes = {pk: 0.0 for pk in candidates}
+        for paper in papers:
+            pk = holder(paper)
+            if pk is not None and paper['weight'] > 0:
+                votes[pk] += paper['weight']
+        votes.update(capped)
+        history.append(votes)
+        if len(hopeful) <= seats - len(elected):
+            elected.extend(sorted(
+                hopeful, key=lambda pk: (-votes[pk], indices[pk])
+            ))
+            break
+        reached = sorted(
+            (pk for pk in hopeful if votes[pk] >= quota - EPSILON),
+            key=lambda pk: (-votes[pk], indices[pk])
+        )[:seats - len(elected)]
+        if reached:
+            for pk in reached:
+                hopeful.remove(pk)
+                elected.append(pk)
+            for pk in reached:
+                factor = max(votes[pk] - quota, 0) / votes[pk]
+                for paper in papers:
+                    if holder(paper) == pk and paper['weight'] > 0:
+                        paper['weight'] *= factor
+                        if paper['weight'] > 0:
+                            next_preference(paper)
+                capped[pk] = min(votes[pk], quota)
+            continue
+        excluded = min(hopeful, key=lambda pk: (
+            [votes[pk] for votes in reversed(history)], -indices[pk]
+        ))
+        hopeful.remove(excluded)
+        for paper in papers:
+            if holder(paper) == excluded:
+                next_preference(paper)
+    return elected
+
+
+def random_ballots(
+    rng: random.Random, candidates: List[int], count: int
+) -> List[List[int]]:
+    """Generate ballots ranking a random number of candidates, chosen with
+    Zipf distributed popularity
+    """
+    weights = [1 / (rank + 1) for rank in range(len(candidates))]
+    ballots = []
+    for _ in range(count):
+        length = rng.randint(1, len(candidates))
+        ballot = []
+        while len(ballot) < length:
+            pk = rng.choices(candidates, weights)[0]
+            if pk not in ballot:
+                ballot.append(pk)
+        ballots.append(ballot)
+    return ballots
+
+
+class CountStvTestCase(TestCase):
+    """Tests the stv.count_stv function against a naive reference count"""
+    def test_pack_ballots_merges_identical_ballots(self):
+        packed = pack_ballots(
+            [[1, 2], [1, 2], [3, 9, 3], [9], [2]], [1, 2, 3]
+        )
+        self.assertEqual(len(packed), 3)
+        self.assertEqual(sorted(packed.copies), [1, 1, 2])
+        self.assertEqual(list(packed.preferences), [0, 1, 2, 1])
+
+
+    def test_instant_runoff(self):
+        # C is excluded first, and their ballots elect B
+        ballots = [[1]] * 4 + [[2]] * 3 + [[3, 2]] * 2
+        result = count_stv(pack_ballots(ballots, [1, 2, 3]), 1)
+        self.assertEqual(result.elected, [2])
+        self.assertEqual(result.quota, 5)
+        self.assertEqual(result.rounds[0].excluded, 3)
+        self.assertEqual(result.first_preferences, {1: 4, 2: 3, 3: 2})
+
+
+    def test_surplus_is_transferred(self):
+        # A's surplus of 3 elects B, rather than C
+        ballots = [[1, 2]] * 8 + [[2]] * 1 + [[3]] * 3
+        result = count_stv(pack_ballots(ballots, [1, 2, 3]), 2)
+        self.assertEqual(result.quota, 5)
+        self.assertEqual(result.elected, [1, 2])
+        self.assertAlmostEqual(result.rounds[1].votes[2], 4)
+
+
+    def test_remaining_candidates_fill_remaining_seats(self):
+        result = count_stv(pack_ballots([[1]] * 3, [1, 2, 3]), 2)
+        self.assertEqual(result.elected, [1, 2])
+
+
+    def test_exclusion_tie_excludes_last_nominated(self):
+        result = count_stv(pack_ballots([[1], [2], [3, 1]], [1, 2, 3]), 1)
+        self.assertEqual(result.rounds[0].excluded, 3)
+        self.assertEqual(result.elected, [1])
+
+
+    def test_matches_naive_count(self):
+        rng = random.Random(0)
+        for trial in range(50):
+            candidates = list(range(100, 100 + rng.randint(2, 8)))
+            seats = rng.randint(1, len(candidates))
+            ballots = random_ballots(rng, candidates, rng.randint(1, 60))
+            with self.subTest(trial=trial):
+                self.assertEqual(
+                    count_stv(pack_ballots(ballots, candidates), seats).elected,
+                    naive_stv(ballots, candidates, seats)
+                )
+
+
+    def test_large_count_benchmark(self):
+        rng = random.Random(1)
+        candidates = list(range(1, 21))
+        ballots = random_ballots(rng, candidates, 50000)
+
+        start = time.perf_counter()
+        result = count_stv(pack_ballots(ballots, candidates), 3)
+        engine_time = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = naive_stv(ballots, candidates, 3)
+        naive_time = time.perf_counter() - start
+
+        self.assertEqual(result.elected, expected)
+        self.assertLess(
+            engine_time, 1,
+            f'Counting 50000 ballots took {engine_time:.2f}s (naive '
+            f'{naive_time:.2f}s)'
+        )
+        self.assertLess(engine_time, naive_time)
+
+
+class RankedVotingTestCase(TestCase):
+    """Tests casting, replacing, and counting votes in ranked positions"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(anonymous=False)
+        cls.voter = create_voter(cls.election)
+        cls.position = create_election_position(
+            cls.election, create_position(admin_title='Ranked'),
+            positions_available=1, voting_system=ElectionPosition.STV
+        )
+        cls.candidates = [create_candidate(cls.position) for _ in range(3)]
+
+
+    def ranking(self) -> List[int]:
+        return list(Vote.objects.filter(
+            registered_voter=self.voter
+        ).order_by('seat').values_list('candidate_id', flat=True))
+
+
+    def test_cast_vote_ranks_below_existing_preferences(self):
+        first, second, _ = self.candidates
+        cast_vote(self.election, self.voter.pk, self.position, first)
+        result = cast_vote(self.election, self.voter.pk, self.position, second)
+        self.assertIsNone(result.old_candidate_pk)
+        self.assertEqual(self.ranking(), [first.pk, second.pk])
+        with self.assertRaises(VotingError):
+            cast_vote(self.election, self.voter.pk, self.position, first)
+
+
+    def test_replace_ballot_reranks_candidates(self):
+        first, second, third = self.candidates
+        ranked = {self.position.pk}
+        replace_ballot(self.election, self.voter.pk, {
+            first.pk: self.position.pk, second.pk: self.position.pk
+        }, ranked)
+        self.assertEqual(self.ranking(), [first.pk, second.pk])
+
+        changes = replace_ballot(self.election, self.voter.pk, {
+            third.pk: self.position.pk, second.pk: self.position.pk,
+            first.pk: self.position.pk
+        }, ranked)
+        self.assertEqual(self.ranking(), [third.pk, second.pk, first.pk])
+        self.assertEqual(changes, {'added': 2, 'removed': 1})
+        for candidate in self.candidates:
+            self.assertEqual(
+                sum(candidate.tallies.values_list('votes', flat=True)), 1
+            )
+
+
+    def test_results_are_counted_with_stv(self):
+        first, second, third = self.candidates
+        rankings = [[first, second]] * 4 + [[second]] * 3 + [[third, second]] * 2
+        for ranking in rankings:
+            voter = create_voter(self.election)
+            for candidate in ranking:
+                cast_vote(self.election, voter.pk, self.position, candidate)
+
+        result, = calculate_results(self.election)
+        self.assertEqual(result.winners, [second])
+        self.assertEqual(result.seats_reopened, 0)
+        self.assertEqual(result.candidates[0].candidate, first)
+        self.assertEqual(result.candidates[0].votes, 4)
+        self.assertEqual(result.count.rounds[0].excluded, third.pk)
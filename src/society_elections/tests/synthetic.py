@@ -0,0 +1,184 @@
+"""Module to test the synthetic module and generate_election_fixture command
+of society_elections"""
+import random
+from collections import Counter
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Sum
+from django.test import TestCase
+
+from ..models import (AnonymousVoter, Candidate, Election, RegisteredVoter,
+                      Vote, VoteTally)
+from ..results import calculate_results
+from ..synthetic import (UNIFORM, anonymous_password, choose_distinct,
+                         generate_election)
+from .helpers import create_user
+
+
+class GenerateElectionTestCase(TestCase):
+    """Tests the synthetic.generate_election function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_user()
+
+
+    def votes_by_rank(self, generated) -> list:
+        """Get the votes of the candidates of the first position, most
+        popular first
+        """
+        position = generated.positions[0]
+        candidates = [
+            c for c in generated.candidates if c.position_id == position.pk
+        ]
+        votes = Counter(Vote.objects.filter(position=position).values_list(
+            'candidate_id', flat=True
+        ))
+        return [votes[candidate.pk] for candidate in candidates]
+
+
+    def test_creates_election_of_size(self):
+        generated = generate_election(
+            positions=3, candidates=4, voters=20, created_by=self.user,
+            batch_size=7
+        )
+        election = generated.election
+        self.assertEqual(election.current_period, Election.VOTING)
+        self.assertEqual(election.positions.count(), 3)
+        # With RON and Abstain
+        self.assertEqual(
+            Candidate.objects.filter(position__election=election).count(),
+            3 * 6
+        )
+        self.assertEqual(election.registered_voters.count(), 20)
+        self.assertEqual(generated.votes, 3 * 20)
+        self.assertEqual(Vote.objects.count(), 3 * 20)
+        self.assertEqual(election.votes.count(), 3 * 20)
+        self.assertEqual(VoteTally.objects.filter(
+            position__election=election
+        ).aggregate(votes=Sum('votes'))['votes'], 3 * 20)
+
+
+    def test_ranked_voters_rank_at_least_seats(self):
+        generated = generate_election(
+            positions=2, candidates=5, voters=20, seats=2, ranked=True,
+            seed=3, created_by=self.user
+        )
+        ballots = Vote.objects.filter(
+            position__election=generated.election
+        ).values('position', 'registered_voter').annotate(
+            count=Count('pk')
+        ).order_by()
+        self.assertEqual(len(ballots), 2 * 20)
+        for ballot in ballots:
+            self.assertGreaterEqual(ballot['count'], 2)
+        results = calculate_results(generated.election, save=False)
+        for result in results:
+            self.assertIsNotNone(result.count)
+
+
+    def test_choose_distinct_is_weighted(self):
+        rng = random.Random(1)
+        firsts = Counter()
+        for _ in range(2000):
+            chosen = choose_distinct(rng, ['a', 'b', 'c'], [8, 1, 1], 2)
+            self.assertEqual(len(set(chosen)), 2)
+            firsts[chosen[0]] += 1
+        self.assertAlmostEqual(firsts['a'] / 2000, 0.8, delta=0.05)
+        # Every item is chosen, however unlikely
+        self.assertCountEqual(
+            choose_distinct(rng, ['a', 'b'], [1, 1e-12], 2), ['a', 'b']
+        )
+
+
+    def test_seed_is_repeatable(self):
+        first = generate_election(voters=30, seed=1, created_by=self.user)
+        second = generate_election(voters=30, seed=1, created_by=self.user)
+        self.assertEqual(self.votes_by_rank(first), self.votes_by_rank(second))
+        self.assertEqual(
+            [c.full_name for c in first.candidates],
+            [c.full_name for c in second.candidates]
+        )
+
+
+    def test_zipf_favours_most_popular(self):
+        generated = generate_election(
+            positions=1, candidates=5, voters=500, seed=1,
+            created_by=self.user
+        )
+        votes = self.votes_by_rank(generated)
+        self.assertGreater(votes[0], 2 * votes[-1])
+        self.assertGreater(votes[0], 500 / 5)
+
+
+    def test_uniform_distribution(self):
+        generated = generate_election(
+            positions=1, candidates=2, voters=500, seed=1,
+            distribution=UNIFORM, created_by=self.user
+        )
+        votes = self.votes_by_rank(generated)
+        self.assertLess(abs(votes[0] - votes[1]), 100)
+
+
+    def test_voters_fill_every_seat_once(self):
+        generated = generate_election(
+            positions=2, candidates=4, voters=25, seats=3, seed=2,
+            created_by=self.user
+        )
+        self.assertEqual(generated.votes, 2 * 25 * 3)
+        self.assertFalse(Vote.objects.values(
+            'registered_voter', 'position', 'candidate'
+        ).annotate(n=Count('pk')).filter(n__gt=1).exists())
+        self.assertEqual(
+            set(Vote.objects.values_list('seat', flat=True)), {0, 1, 2}
+        )
+
+
+    def test_turnout(self):
+        generated = generate_election(
+            positions=1, voters=200, turnout=0.5, seed=3,
+            created_by=self.user
+        )
+        self.assertEqual(RegisteredVoter.objects.count(), 200)
+        self.assertGreater(generated.votes, 50)
+        self.assertLess(generated.votes, 150)
+
+
+    def test_anonymous_voters_cast_votes(self):
+        generated = generate_election(
+            positions=2, voters=5, anonymous=True, created_by=self.user
+        )
+        self.assertEqual(generated.election.anonymous_voters.count(), 5)
+        self.assertFalse(Vote.objects.filter(
+            registered_voter__isnull=False
+        ).exists())
+        self.assertTrue(AnonymousVoter.objects.filter(
+            password=AnonymousVoter.hash_password(
+                anonymous_password(generated.election, 4)
+            ), vote__isnull=False
+        ).exists())
+
+
+    def test_invalid_seats(self):
+        with self.assertRaises(ValueError):
+            generate_election(candidates=2, seats=3, created_by=self.user)
+
+
+    def test_command(self):
+        self.user.is_superuser = True
+        self.user.save()
+        stdout = StringIO()
+        call_command(
+            'generate_election_fixture', positions=2, candidates=3, voters=10,
+            seed=1, stdout=stdout
+        )
+        self.assertIn('10 voters, and 20 votes', stdout.getvalue())
+        self.assertEqual(Election.objects.get().created_by, self.user)
+
+
+    def test_command_without_superuser(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'generate_election_fixture', voters=1, stdout=StringIO()
+            )
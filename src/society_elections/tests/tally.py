@@ -0,0 +1,59 @@
+"""Module to test the VoteTally model of society_elections"""
+from django.db.models import Sum
+from django.test import TestCase
+
+from ..models import Vote, VoteTally
+from ..results import count_live_votes
+from .helpers import (create_anon_voter, create_candidate, create_election,
+                      create_election_position, create_position)
+
+
+class VoteTallyTestCase(TestCase):
+    """Tests the VoteTally model"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election()
+        cls.position = create_election_position(
+            cls.election, create_position()
+        )
+        cls.candidate = create_candidate(cls.position)
+
+
+    def test_increment_sums_over_shards(self):
+        for _ in range(20):
+            VoteTally.increment(self.position.pk, self.candidate.pk)
+        VoteTally.increment(self.position.pk, self.candidate.pk, -1)
+        self.assertEqual(
+            VoteTally.objects.aggregate(votes=Sum('votes'))['votes'], 19
+        )
+        self.assertEqual(
+            count_live_votes(self.election),
+            {self.position.pk: {self.candidate.pk: 19}}
+        )
+
+
+    def test_rebuild_counts_votes(self):
+        VoteTally.increment(self.position.pk, self.candidate.pk, 5)
+        Vote.objects.create(
+            anonymous_voter=create_anon_voter(self.election),
+            candidate=self.candidate,
+            position=self.position
+        )
+        VoteTally.rebuild(self.election)
+        self.assertEqual(
+            count_live_votes(self.election),
+            {self.position.pk: {self.candidate.pk: 1}}
+        )
+
+
+    def test_increment_many_counts_every_candidate(self):
+        other = create_candidate(self.position, full_name='Other')
+        for _ in range(10):
+            VoteTally.increment_many({
+                (self.position.pk, self.candidate.pk): 2,
+                (self.position.pk, other.pk): -1,
+            })
+        self.assertEqual(
+            count_live_votes(self.election),
+            {self.position.pk: {self.candidate.pk: 20, other.pk: -10}}
+        )
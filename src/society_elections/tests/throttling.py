@@ -0,0 +1,184 @@
+"""Module to test the throttling module of society_elections"""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.http import HttpResponse
+from django.test import (AsyncRequestFactory, RequestFactory, TestCase,
+                         override_settings)
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import app_settings
+from ..caching import get_cache, invalidate_latest_election
+from ..throttling import Rate, Throttle, parse_rate, take_token
+from ..views.decorators import throttle
+from ..views.helpers import create_voter_token
+from .helpers import create_election, create_voter
+from .loadtest import TEMPLATES
+
+
+@throttle('test', json=True)
+def throttled_view(req):
+    return HttpResponse()
+
+
+@throttle('test')
+async def async_throttled_view(req):
+    return HttpResponse()
+
+
+@patch.dict(app_settings.THROTTLE_RATES, {
+    'test': {'ip': '3/min', 'voter': '2/hour'},
+    'voter_resend_verification': {'ip': '10/hour', 'voter': '2/hour'},
+})
+@override_settings(TEMPLATES=TEMPLATES)
+class ThrottleTestCase(TestCase):
+    """Tests the throttling.Throttle class and views.decorators.throttle"""
+    # Each test sends requests from its own address
+    addresses = iter(range(1, 255))
+
+    def setUp(self) -> None:
+        self.remote_addr = f'203.0.113.{next(self.addresses)}'
+        self.factory = RequestFactory(REMOTE_ADDR=self.remote_addr)
+        invalidate_latest_election()
+
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/min'), Rate(10, 60))
+        self.assertEqual(parse_rate('3/hour'), Rate(3, 3600))
+        with self.assertRaises(ValueError):
+            parse_rate('10/fortnight')
+        with self.assertRaises(ValueError):
+            parse_rate('0/s')
+
+
+    def test_bucket_refills(self):
+        rate = Rate(2, 60)
+        state, wait = take_token(None, rate, 0)
+        self.assertEqual(wait, 0)
+        state, wait = take_token(state, rate, 0)
+        self.assertEqual(wait, 0)
+        state, wait = take_token(state, rate, 0)
+        self.assertEqual(wait, 30)
+        # Half a token refilled after 15 seconds
+        _, wait = take_token(state, rate, 15)
+        self.assertEqual(wait, 15)
+        _, wait = take_token(state, rate, 30)
+        self.assertEqual(wait, 0)
+
+
+    def test_ip_throttled_after_burst(self):
+        for _ in range(3):
+            self.assertEqual(throttled_view(self.factory.get('/')).status_code, 200)
+        res = throttled_view(self.factory.get('/'))
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res['Retry-After'], '20')
+        self.assertIn(b'error', res.content)
+
+        other = RequestFactory(REMOTE_ADDR='198.51.100.1').get('/')
+        self.assertEqual(throttled_view(other).status_code, 200)
+
+
+    def test_voter_throttled_across_addresses(self):
+        for i in range(3):
+            req = RequestFactory(REMOTE_ADDR=f'198.51.100.{10 + i}').post(
+                '/', {'uuid': self.remote_addr}
+            )
+            res = throttled_view(req)
+        self.assertEqual(res.status_code, 429)
+
+
+    def voter_statuses(self, requests) -> list:
+        """Send each request to the throttled view from its own address"""
+        statuses = []
+        for i, (path, data) in enumerate(requests):
+            req = RequestFactory(REMOTE_ADDR=f'198.51.100.{100 + i}').post(
+                path, data
+            )
+            statuses.append(throttled_view(req).status_code)
+        return statuses
+
+
+    def test_extra_credentials_do_not_avoid_voter_limit(self):
+        self.assertEqual(self.voter_statuses([
+            ('/', {'email': 'voter@test.com', 'uuid': str(uuid4())})
+            for _ in range(3)
+        ]), [200, 200, 429])
+
+
+    def test_query_string_does_not_avoid_voter_limit(self):
+        self.assertEqual(self.voter_statuses([
+            (f'/?uuid={uuid4()}', {'password': 'password'}) for _ in range(3)
+        ]), [200, 200, 429])
+
+
+    def test_token_shares_limit_of_uuid(self):
+        election = create_election()
+        voter = create_voter(election)
+        token = create_voter_token(election, voter.pk)
+        self.assertEqual(self.voter_statuses([
+            ('/', {'uuid': str(voter.pk)}),
+            ('/', {'token': token}),
+            ('/', {'token': token + 'a', 'uuid': str(voter.pk).upper()}),
+        ]), [200, 200, 429])
+
+
+    def test_throttled_client_rejected_in_process(self):
+        scope_throttle = Throttle('test')
+        for _ in range(4):
+            scope_throttle.wait_time(self.factory.get('/'))
+        with patch.object(get_cache(), 'get_many') as get_many:
+            self.assertGreater(scope_throttle.wait_time(self.factory.get('/')), 0)
+        get_many.assert_not_called()
+
+
+    def test_async_view(self):
+        self.assertTrue(asyncio.iscoroutinefunction(async_throttled_view))
+        factory = AsyncRequestFactory(REMOTE_ADDR=self.remote_addr)
+        statuses = [
+            asyncio.run(async_throttled_view(factory.get('/'))).status_code
+            for _ in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+
+    def test_resend_verification_throttled_per_voter(self):
+        election = create_election(
+            anonymous=False,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        voter = create_voter(election)
+        url = reverse('society_elections:voter_resend_verification')
+        statuses = [
+            self.client.post(
+                url, {'uuid': voter.pk}, REMOTE_ADDR=self.remote_addr
+            ).status_code for _ in range(3)
+        ]
+        self.assertNotEqual(statuses[1], 429)
+        self.assertEqual(statuses[2], 429)
+
+
+    def test_resend_verification_throttled_per_email_across_addresses(self):
+        election = create_election(
+            anonymous=False,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        voter = create_voter(election, email='voter@test.com')
+        url = reverse('society_elections:voter_resend_verification')
+        statuses = [
+            self.client.post(
+                url, {'email': email}, REMOTE_ADDR=f'198.51.100.{50 + i}'
+            ).status_code for i, email in enumerate([
+                voter.email, 'VOTER@test.com', ' Voter@Test.com'
+            ])
+        ]
+        self.assertNotEqual(statuses[1], 429)
+        self.assertEqual(statuses[2], 429)
@@ -0,0 +1,11 @@
+"""Mocks a URL conf in a project with this app and the admin site installed
+
+Used with override_settings(ROOT_URLCONF=...) by tests of the admin interface
+"""
+from django.contrib import admin
+from django.urls import include, path
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('society_elections.urls')),
+]
@@ -0,0 +1,105 @@
+"""Module to test the views.decorators module of society_elections"""
+import asyncio
+from datetime import timedelta
+
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+from django.utils import timezone
+
+from ..caching import invalidate_latest_election
+from ..models import Election
+from ..views.decorators import require_POST, validate_election_period
+from ..views.helpers import (aget_request_election, get_request_election,
+                             get_template)
+from .helpers import create_election
+
+
+@validate_election_period(Election.VOTING)
+def election_view(req):
+    return HttpResponse(str(get_request_election(req).pk))
+
+
+class ValidateElectionPeriodTestCase(TestCase):
+    """Tests the views.decorators.validate_election_period decorator"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        invalidate_latest_election()
+
+
+    def test_election_attached_to_request(self):
+        req = self.factory.get('/')
+        res = election_view(req)
+        self.assertEqual(req.election, self.election)
+        self.assertEqual(res.content.decode(), str(self.election.pk))
+
+
+    def test_election_resolved_once_per_request(self):
+        with self.assertNumQueries(1):
+            election_view(self.factory.get('/'))
+
+
+@validate_election_period(Election.VOTING)
+async def async_election_view(req):
+    return HttpResponse(str((await aget_request_election(req)).pk))
+
+
+@require_POST
+async def async_post_view(req):
+    return HttpResponse()
+
+
+class AsyncDecoratorsTestCase(TestCase):
+    """Tests the views.decorators decorators with async views"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+
+
+    def setUp(self) -> None:
+        self.factory = AsyncRequestFactory()
+        invalidate_latest_election()
+
+
+    def test_wrapped_views_are_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(async_election_view))
+        self.assertTrue(asyncio.iscoroutinefunction(async_post_view))
+
+
+    async def test_election_attached_to_request(self):
+        req = self.factory.get('/')
+        res = await async_election_view(req)
+        self.assertEqual(req.election, self.election)
+        self.assertEqual(res.content.decode(), str(self.election.pk))
+
+
+    async def test_wrong_period(self):
+        await Election.objects.filter(pk=self.election.pk).aupdate(
+            voting_start=timezone.now()+timedelta(days=1),
+            voting_end=timezone.now()+timedelta(days=2),
+        )
+        with self.assertTemplateUsed(get_template('election_wrong_period')):
+            res = await async_election_view(self.factory.get('/'))
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.content.decode(), str(self.election.pk))
+
+
+    async def test_require_post(self):
+        res = await async_post_view(self.factory.get('/'))
+        self.assertEqual(res.status_code, 405)
+        res = await async_post_view(self.factory.post('/'))
+        self.assertEqual(res.status_code, 200)
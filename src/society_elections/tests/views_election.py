@@ -0,0 +1,209 @@
+"""Module to test the caching headers of the election pages, and the results
+page, of society_elections"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import app_settings
+from ..caching import invalidate_latest_election, invalidate_results_page
+from ..models import Election, ElectionResults
+from ..results import freeze_results
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position, create_user)
+from .loadtest import TEMPLATES
+
+
+@override_settings(TEMPLATES=TEMPLATES)
+class ElectionPageCachingTestCase(TestCase):
+    """Tests the views.decorators.cache_election_page decorator on the
+    election pages
+    """
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=1),
+            nominations_end=timezone.now()+timedelta(minutes=10),
+            voting_start=timezone.now()+timedelta(days=1),
+            voting_end=timezone.now()+timedelta(days=2),
+        )
+
+
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    def get_cache_control(self) -> dict:
+        """Get the Cache-Control directives of the index page"""
+        res = self.client.get(reverse('society_elections:index'))
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('Cookie', res['Vary'])
+        self.assertIn('ETag', res)
+        return dict(
+            (directive.strip().split('=') + [None])[:2]
+            for directive in res['Cache-Control'].split(',')
+        )
+
+
+    def test_index_cached_briefly_by_shared_caches(self):
+        cache_control = self.get_cache_control()
+        self.assertIn('public', cache_control)
+        self.assertIn('must-revalidate', cache_control)
+        self.assertEqual(cache_control['max-age'], '0')
+        self.assertEqual(
+            int(cache_control['s-maxage']), app_settings.ELECTION_PAGE_MAX_AGE
+        )
+
+
+    @patch.object(app_settings, 'ELECTION_PAGE_MAX_AGE', 3600)
+    def test_index_cached_until_period_changes(self):
+        s_maxage = int(self.get_cache_control()['s-maxage'])
+        self.assertGreater(s_maxage, 500)
+        self.assertLessEqual(s_maxage, 600)
+
+
+    def test_matching_etag_returns_304_without_queries(self):
+        url = reverse('society_elections:index')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+
+    def test_etag_changes_with_election(self):
+        url = reverse('society_elections:index')
+        etag = self.client.get(url)['ETag']
+        self.election.title = 'Renamed Election'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.election.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res['ETag'], etag)
+
+
+    def test_etag_changes_with_period(self):
+        url = reverse('society_elections:index')
+        etag = self.client.get(url)['ETag']
+        Election.objects.filter(pk=self.election.pk).update(
+            nominations_end=timezone.now()-timedelta(minutes=1)
+        )
+        invalidate_latest_election()
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+
+    def test_success_pages_are_cached(self):
+        for name in ('nomination_success', 'vote_submitted'):
+            with self.subTest(name=name):
+                res = self.client.get(reverse(f'society_elections:{name}'))
+                self.assertIn('ETag', res)
+
+
+    def test_wrong_period_page_is_cached(self):
+        res = self.client.get(reverse('society_elections:vote'))
+        self.assertIn('ETag', res)
+        res = self.client.get(
+            reverse('society_elections:vote'), HTTP_IF_NONE_MATCH=res['ETag']
+        )
+        self.assertEqual(res.status_code, 304)
+
+
+    def test_posts_are_not_cached(self):
+        res = self.client.post(
+            reverse('society_elections:voter_create'), {'email': 'a@test.com'}
+        )
+        self.assertNotIn('ETag', res)
+        self.assertNotIn('public', res.get('Cache-Control', ''))
+
+
+@override_settings(TEMPLATES=TEMPLATES)
+class ResultsViewTestCase(TestCase):
+    """Tests the views.election.results_view view"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            nominations_start=timezone.now()-timedelta(days=4),
+            nominations_end=timezone.now()-timedelta(days=3),
+            voting_start=timezone.now()-timedelta(days=2),
+            voting_end=timezone.now()-timedelta(days=1),
+            ended_at=timezone.now(),
+            ended_by=create_user()
+        )
+        position = create_election_position(
+            cls.election, create_position(title='Treasurer')
+        )
+        create_candidate(position, full_name='Only Candidate')
+
+
+    def setUp(self) -> None:
+        invalidate_latest_election()
+        invalidate_results_page(self.election.pk)
+
+
+    def test_results_served_from_snapshot(self):
+        freeze_results(self.election)
+        res = self.client.get(reverse('society_elections:results'))
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, 'Treasurer')
+        self.assertContains(res, 'Only Candidate')
+        self.assertIn('public', res['Cache-Control'])
+
+
+    def test_cached_page_does_not_query(self):
+        freeze_results(self.election)
+        url = reverse('society_elections:results')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+
+    def test_page_changes_when_results_frozen_again(self):
+        freeze_results(self.election)
+        url = reverse('society_elections:results')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            ElectionResults.objects.all().delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            freeze_results(self.election)
+        self.assertEqual(self.client.get(url)['ETag'], etag)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+    def test_unfinished_election_shows_wrong_period(self):
+        Election.objects.filter(pk=self.election.pk).update(
+            ended_at=None, ended_by=None
+        )
+        invalidate_latest_election()
+        with self.assertTemplateUsed(
+            'society_elections/election_wrong_period.html'
+        ):
+            self.client.get(reverse('society_elections:results'))
+
+
+    @override_settings(ROOT_URLCONF='society_elections.tests.urls')
+    def test_end_election_freezes_results(self):
+        Election.objects.filter(pk=self.election.pk).update(
+            ended_at=None, ended_by=None
+        )
+        user = User.objects.create_superuser(
+            'admin', 'admin@test.com', 'Test1234!'
+        )
+        self.client.force_login(user)
+        self.client.post(
+            reverse('admin:society_elections_election_changelist'), {
+                'action': 'end_election',
+                '_selected_action': [self.election.pk]
+            }
+        )
+        snapshot = ElectionResults.objects.get(election=self.election)
+        self.assertEqual(
+            snapshot.results['positions'][0]['candidates'][0]['full_name'],
+            'Only Candidate'
+        )
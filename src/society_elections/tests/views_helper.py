@@ -1,14 +1,20 @@
 """Module to test the functions in the views.helpers module"""
 
+from datetime import timedelta
+from unittest.mock import patch
 from uuid import uuid4
 
 from django.http import Http404
 from django.http.request import HttpRequest
 from django.test import TestCase
+from django.utils import timezone
 
+from .. import app_settings
 from ..models import RegisteredVoter
-from ..views.helpers import is_request_authenticated
-from .helpers import PASSWORD, create_anon_voter, create_election, create_voter
+from ..views.helpers import (create_voter_token, get_token_voter_pk,
+                             is_request_authenticated)
+from .helpers import (PASSWORD, create_anon_voter, create_election,
+                      create_user, create_voter)
 
 
 class IsRequestAuthenticatedTestCase(TestCase):
@@ -185,3 +191,44 @@ class IsRequestAuthenticatedTestCase(TestCase):
         self.assertFalse(
             is_request_authenticated(self.reg_election, self.request)
         )
+
+
+class VoterTokenTestCase(TestCase):
+    """Tests the create_voter_token and get_token_voter_pk functions"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=False,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        cls.voter = create_voter(cls.election)
+
+
+    def test_valid_token_returns_voter_pk(self):
+        token = create_voter_token(self.election, self.voter.pk)
+        with self.assertNumQueries(0):
+            voter_pk = get_token_voter_pk(self.election, token)
+        self.assertEqual(voter_pk, str(self.voter.pk))
+
+    def test_tampered_token_returns_none(self):
+        token = create_voter_token(self.election, self.voter.pk)
+        self.assertIsNone(get_token_voter_pk(self.election, token + 'a'))
+
+    def test_token_for_other_election_returns_none(self):
+        token = create_voter_token(self.election, self.voter.pk)
+        other_election = create_election(admin_title='Other Election')
+        self.assertIsNone(get_token_voter_pk(other_election, token))
+
+    def test_expired_token_returns_none(self):
+        token = create_voter_token(self.election, self.voter.pk)
+        with patch.object(app_settings, 'VOTER_TOKEN_AGE', -1):
+            self.assertIsNone(get_token_voter_pk(self.election, token))
+
+    def test_token_revoked_when_election_ends(self):
+        token = create_voter_token(self.election, self.voter.pk)
+        self.election.ended_at = timezone.now()
+        self.election.ended_by = create_user()
+        self.assertIsNone(get_token_voter_pk(self.election, token))
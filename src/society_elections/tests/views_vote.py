@@ -2,12 +2,14 @@
 from unittest.mock import Mock, patch
 
 from django.http.response import Http404
-from django.test import Client, TestCase
+from django.db.models import Sum
+from django.test import Client, TestCase, override_settings
 from django.urls.base import reverse
 from django.utils import timezone
 from datetime import timedelta
 
-from ..models import Vote
+from ..caching import invalidate_latest_election
+from ..models import Vote, VoteTally
 from ..views.helpers import get_template
 from .helpers import (PASSWORD, create_anon_voter, create_candidate,
                       create_election, create_election_position,
@@ -66,14 +68,14 @@ class VoteViewTestCase(TestCase):
     #== Regular election
     @patch('society_elections.views.vote.is_request_authenticated', Mock(side_effect=Http404))
     def test_reg_election_no_voter_returns_401(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.get(reverse('society_elections:vote'), {'uuid': self.voter_uuid})
         self.assertEqual(res.status_code, 401)
 
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=False))
     def test_reg_election_not_authenticated_returns_401(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.get(reverse('society_elections:vote'), {'uuid': self.voter_uuid})
         self.assertEqual(res.status_code, 401)
         self.assertTemplateUsed(res, get_template('voter_not_verified'))
@@ -81,7 +83,7 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_reg_election_GET_req_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.get(reverse('society_elections:vote'), {'uuid': self.voter_uuid})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, get_template('vote'))
@@ -89,14 +91,14 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_reg_election_POST_req_no_submit_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote'), {'uuid': self.voter_uuid})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, get_template('vote'))
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_reg_election_POST_req_empty_submit_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote'), {'uuid': self.voter_uuid, 'submit': ''}) 
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, get_template('vote'))
@@ -104,7 +106,7 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_reg_election_no_votes_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote'), {'uuid': self.voter_uuid, 'submit': True})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, get_template('vote'))
@@ -117,7 +119,7 @@ class VoteViewTestCase(TestCase):
             candidate=self.reg_candidate1,
             position=self.reg_election_position1
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote'), {'uuid': self.voter_uuid, 'submit': True})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(res, get_template('vote'))
@@ -135,7 +137,7 @@ class VoteViewTestCase(TestCase):
             candidate=self.reg_candidate2,
             position=self.reg_election_position2
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote'), {'uuid': self.voter_uuid, 'submit': True})
         self.assertRedirects(res, reverse('society_elections:vote_submitted'))
         
@@ -143,7 +145,7 @@ class VoteViewTestCase(TestCase):
     #== Anonymous Election
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=False))
     def test_anon_election_not_authenticated_returns_401(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password})
         self.assertEqual(res.status_code, 401)
         self.assertTemplateUsed(res, get_template('password_entry'))
@@ -151,7 +153,7 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_anon_election_POST_req_no_submit_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(get_template('vote'))
@@ -159,7 +161,7 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_anon_election_POST_req_empty_submit_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password, 'submit': ''})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(get_template('vote'))
@@ -167,7 +169,7 @@ class VoteViewTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_anon_election_no_votes_returns_vote_template(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password, 'submit': True})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(get_template('vote'))
@@ -180,7 +182,7 @@ class VoteViewTestCase(TestCase):
             candidate=self.anon_candidate1,
             position=self.anon_election_position1
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password, 'submit': True})
         self.assertEqual(res.status_code, 200)
         self.assertTemplateUsed(get_template('vote'))
@@ -198,7 +200,7 @@ class VoteViewTestCase(TestCase):
             candidate=self.anon_candidate2,
             position=self.anon_election_position2
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote'), {'password': self.voter_password, 'submit': True})
         self.assertRedirects(res, reverse('society_elections:vote_submitted'))
 
@@ -273,21 +275,21 @@ class CreateVoteAjaxTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_no_position_returns_404(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {'position': 100})
         self.assertEqual(res.json().get('error'), 'Position does not exist')
 
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_malformed_position_returns_404(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {'position': 'hello'})
         self.assertEqual(res.json().get('error'), 'Position does not exist')
 
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_no_candidate_returns_404(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_single_position.pk, 'candidate': 100
             })
@@ -296,7 +298,7 @@ class CreateVoteAjaxTestCase(TestCase):
 
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_malformed_candidate_returns_404(self):
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_single_position.pk, 'candidate': 'hello'
             })
@@ -311,7 +313,7 @@ class CreateVoteAjaxTestCase(TestCase):
             position=self.reg_election_single_position
         )
         new_candidate = create_candidate(self.reg_election_single_position)
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_single_position.pk, 'uuid': self.reg_voter.pk, 'candidate': new_candidate.pk
             })
@@ -328,7 +330,7 @@ class CreateVoteAjaxTestCase(TestCase):
             position=self.anon_election_single_position
         )
         new_candidate = create_candidate(self.anon_election_single_position)
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.anon_election_single_position.pk, 'password': self.voter_password, 'candidate': new_candidate.pk
             })
@@ -351,7 +353,7 @@ class CreateVoteAjaxTestCase(TestCase):
             candidate=new_candidate_1,
             position=self.reg_election_multiple_position,
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_multiple_position.pk, 'uuid': self.reg_voter.pk, 'candidate': new_candidate_2.pk
             })
@@ -365,7 +367,7 @@ class CreateVoteAjaxTestCase(TestCase):
             candidate=self.reg_candidate2,
             position=self.reg_election_multiple_position,
         )
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_multiple_position.pk,
                 'candidate': self.reg_candidate2.pk,
@@ -377,7 +379,7 @@ class CreateVoteAjaxTestCase(TestCase):
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_regular_voter_new_vote_creates_new_vote(self):
         self.assertEqual(Vote.objects.count(), 0)
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.reg_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.reg_election_single_position.pk,
                 'candidate': self.reg_candidate1.pk,
@@ -390,11 +392,313 @@ class CreateVoteAjaxTestCase(TestCase):
     @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
     def test_anon_voter_new_vote_creates_new_vote(self):
         self.assertEqual(Vote.objects.count(), 0)
-        with patch('society_elections.views.vote.get_latest_election', Mock(return_value=self.anon_election)):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.anon_election)):
             res = self.client.post(reverse('society_elections:vote_create'), {
                 'position': self.anon_election_multiple_position.pk,
                 'candidate': self.anon_candidate1.pk,
                 'password': self.voter_password
             })
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(Vote.objects.count(), 1)
\ No newline at end of file
+        self.assertEqual(Vote.objects.count(), 1)
+
+    @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
+    def test_new_vote_increments_tally(self):
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
+            self.client.post(reverse('society_elections:vote_create'), {
+                'position': self.reg_election_single_position.pk,
+                'candidate': self.reg_candidate1.pk,
+                'uuid': self.reg_voter.pk
+            })
+        self.assertEqual(
+            self.reg_candidate1.tallies.aggregate(votes=Sum('votes'))['votes'], 1
+        )
+
+
+    @patch('society_elections.views.vote.is_request_authenticated', Mock(return_value=True))
+    def test_changed_vote_moves_tally(self):
+        Vote.objects.create(
+            registered_voter=self.reg_voter,
+            candidate=self.reg_candidate1,
+            position=self.reg_election_single_position
+        )
+        VoteTally.increment(self.reg_election_single_position.pk, self.reg_candidate1.pk)
+        new_candidate = create_candidate(self.reg_election_single_position)
+        with patch('society_elections.views.decorators.get_latest_election', Mock(return_value=self.reg_election)):
+            self.client.post(reverse('society_elections:vote_create'), {
+                'position': self.reg_election_single_position.pk, 'uuid': self.reg_voter.pk, 'candidate': new_candidate.pk
+            })
+        self.assertEqual(
+            self.reg_candidate1.tallies.aggregate(votes=Sum('votes'))['votes'], 0
+        )
+        self.assertEqual(
+            new_candidate.tallies.aggregate(votes=Sum('votes'))['votes'], 1
+        )
+
+
+class VoterLoginAjaxTestCase(TestCase):
+    """Tests the views.vote.voter_login_ajax function and voting with tokens"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=True,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        cls.anon_voter = create_anon_voter(cls.election)
+        cls.position = create_election_position(cls.election, create_position())
+        cls.candidate = create_candidate(cls.position)
+
+
+    def setUp(self) -> None:
+        self.client = Client()
+        invalidate_latest_election()
+
+
+    def test_bad_password_returns_error(self):
+        res = self.client.post(reverse('society_elections:voter_login'), {
+            'password': 'badpass'
+        })
+        self.assertEqual(res.json().get('error'), 'Not authorized to vote')
+
+
+    def test_good_password_returns_token(self):
+        res = self.client.post(reverse('society_elections:voter_login'), {
+            'password': PASSWORD
+        })
+        self.assertIn('token', res.json())
+
+
+    def test_vote_with_token_does_not_authenticate_password(self):
+        token = self.client.post(reverse('society_elections:voter_login'), {
+            'password': PASSWORD
+        }).json()['token']
+        with patch('society_elections.views.vote.is_request_authenticated') as mock:
+            res = self.client.post(reverse('society_elections:vote_create'), {
+                'position': self.position.pk,
+                'candidate': self.candidate.pk,
+                'token': token
+            })
+        mock.assert_not_called()
+        self.assertIn('vote', res.json())
+        self.assertEqual(
+            Vote.objects.get().anonymous_voter_id, self.anon_voter.pk
+        )
+
+
+    def test_vote_with_bad_token_returns_error(self):
+        res = self.client.post(reverse('society_elections:vote_create'), {
+            'position': self.position.pk,
+            'candidate': self.candidate.pk,
+            'token': 'bad-token'
+        })
+        self.assertEqual(res.json().get('error'), 'Not authorized to vote')
+
+
+class SubmitBallotAjaxTestCase(TestCase):
+    """Tests the views.vote.submit_ballot_ajax function"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=True,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        cls.anon_voter = create_anon_voter(cls.election)
+        cls.single_position = create_election_position(
+            cls.election, create_position(admin_title='Single')
+        )
+        cls.multiple_position = create_election_position(
+            cls.election, create_position(admin_title='Multiple'),
+            positions_available=2
+        )
+        cls.single_candidate1 = create_candidate(cls.single_position)
+        cls.single_candidate2 = create_candidate(cls.single_position)
+        cls.multiple_candidates = [
+            create_candidate(cls.multiple_position) for _ in range(3)
+        ]
+
+
+    def setUp(self) -> None:
+        self.client = Client()
+        invalidate_latest_election()
+
+
+    def submit(self, *candidates):
+        return self.client.post(reverse('society_elections:ballot_submit'), {
+            'password': PASSWORD,
+            'candidate': [candidate.pk for candidate in candidates]
+        })
+
+
+    def test_ballot_creates_votes(self):
+        res = self.submit(
+            self.single_candidate1, *self.multiple_candidates[:2]
+        )
+        self.assertEqual(res.json().get('missing_positions'), [])
+        self.assertEqual(Vote.objects.count(), 3)
+        self.assertEqual(
+            VoteTally.objects.aggregate(votes=Sum('votes'))['votes'], 3
+        )
+
+
+    def test_ballot_replaces_votes(self):
+        self.submit(self.single_candidate1, self.multiple_candidates[0])
+        res = self.submit(self.single_candidate2)
+        self.assertEqual(
+            res.json().get('missing_positions'), [self.multiple_position.pk]
+        )
+        self.assertEqual(Vote.objects.get().candidate, self.single_candidate2)
+        self.assertEqual(
+            self.single_candidate1.tallies.aggregate(votes=Sum('votes'))['votes'],
+            0
+        )
+
+
+    def test_too_many_votes_for_position_returns_error(self):
+        res = self.submit(self.single_candidate1, self.single_candidate2)
+        self.assertEqual(
+            res.json().get('error'), 'Too many votes submitted for a position'
+        )
+        self.assertEqual(Vote.objects.count(), 0)
+
+
+    def test_candidate_from_other_election_returns_error(self):
+        other_position = create_election_position(
+            create_election(
+                admin_title='Other Election',
+                nominations_start=timezone.now()-timedelta(days=10)
+            ),
+            create_position()
+        )
+        res = self.submit(create_candidate(other_position))
+        self.assertEqual(res.json().get('error'), 'Candidate does not exist')
+
+
+    def test_duplicate_candidate_returns_error(self):
+        res = self.submit(self.single_candidate1, self.single_candidate1)
+        self.assertEqual(
+            res.json().get('error'), 'Ballot contains duplicate candidates'
+        )
+
+
+    def test_unchanged_votes_are_kept(self):
+        self.submit(self.single_candidate1, self.multiple_candidates[0])
+        kept_vote = Vote.objects.get(candidate=self.single_candidate1)
+        self.submit(self.single_candidate1, self.multiple_candidates[1])
+        self.assertEqual(
+            Vote.objects.get(candidate=self.single_candidate1).pk, kept_vote.pk
+        )
+        self.assertEqual(Vote.objects.count(), 2)
+
+
+@override_settings(ROOT_URLCONF='society_elections.tests.async_urls')
+class AsyncVoteViewsTestCase(TestCase):
+    """Tests the async versions of the voting views"""
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(
+            anonymous=False,
+            nominations_start=timezone.now()-timedelta(days=2),
+            nominations_end=timezone.now()-timedelta(days=1),
+            voting_start=timezone.now(),
+            voting_end=timezone.now()+timedelta(days=1),
+        )
+        cls.voter = create_voter(cls.election)
+        cls.single_position = create_election_position(
+            cls.election, create_position(admin_title='Test Position 1')
+        )
+        cls.multiple_position = create_election_position(
+            cls.election, create_position(admin_title='Test Position 2'),
+            positions_available=2
+        )
+        cls.candidate1 = create_candidate(cls.single_position)
+        cls.candidate2 = create_candidate(cls.single_position)
+        cls.candidate3 = create_candidate(cls.multiple_position)
+
+
+    def setUp(self) -> None:
+        invalidate_latest_election()
+
+
+    async def test_get_request_returns_405(self):
+        res = await self.async_client.get(
+            reverse('society_elections:vote_create')
+        )
+        self.assertEqual(res.status_code, 405)
+
+
+    async def test_vote_page_lists_votes(self):
+        await Vote.objects.acreate(
+            registered_voter=self.voter, candidate=self.candidate1,
+            position=self.single_position
+        )
+        res = await self.async_client.get(
+            reverse('society_elections:vote'), {'uuid': self.voter.pk}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertTemplateUsed(res, get_template('vote'))
+        self.assertEqual(res.context['candidates_voted'], [self.candidate1])
+
+
+    async def test_unknown_voter_returns_401(self):
+        res = await self.async_client.get(
+            reverse('society_elections:vote'),
+            {'uuid': '00000000-0000-4000-8000-000000000000'}
+        )
+        self.assertEqual(res.status_code, 401)
+
+
+    async def test_incomplete_ballot_returns_vote_page(self):
+        res = await self.async_client.post(reverse('society_elections:vote'), {
+            'uuid': self.voter.pk, 'submit': True
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertTemplateUsed(res, get_template('vote'))
+
+
+    async def test_create_and_change_vote(self):
+        url = reverse('society_elections:vote_create')
+        res = await self.async_client.post(url, {
+            'uuid': self.voter.pk,
+            'position': self.single_position.pk,
+            'candidate': self.candidate1.pk
+        })
+        self.assertEqual(res.json()['new_candidate'], self.candidate1.pk)
+        res = await self.async_client.post(url, {
+            'uuid': self.voter.pk,
+            'position': self.single_position.pk,
+            'candidate': self.candidate2.pk
+        })
+        self.assertEqual(res.json()['old_candidate'], self.candidate1.pk)
+        self.assertEqual(await Vote.objects.acount(), 1)
+
+
+    async def test_missing_candidate_returns_error(self):
+        res = await self.async_client.post(
+            reverse('society_elections:vote_create'), {
+                'uuid': self.voter.pk,
+                'position': self.single_position.pk,
+                'candidate': 'x'
+            }
+        )
+        self.assertEqual(res.json()['error'], 'Candidate does not exist')
+
+
+    async def test_delete_vote(self):
+        vote = await Vote.objects.acreate(
+            registered_voter=self.voter, candidate=self.candidate3,
+            position=self.multiple_position
+        )
+        res = await self.async_client.post(
+            reverse('society_elections:vote_delete'), {
+                'uuid': self.voter.pk,
+                'position': self.multiple_position.pk,
+                'candidate': self.candidate3.pk
+            }
+        )
+        self.assertEqual(res.json()['vote'], vote.pk)
+        self.assertFalse(await Vote.objects.aexists())
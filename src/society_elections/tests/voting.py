@@ -0,0 +1,260 @@
+"""Module to test the voting module of society_elections"""
+import threading
+
+from django.db import (IntegrityError, OperationalError, connection,
+                       transaction)
+from django.db.models import Count, Sum
+from django.test import TestCase, TransactionTestCase
+
+from ..models import Vote, VoteTally
+from ..voting import VotingError, cast_vote, replace_ballot, retract_vote
+from .helpers import (create_candidate, create_election,
+                      create_election_position, create_position, create_voter)
+
+
+class CastVoteTestCase(TestCase):
+    """Tests the voting.cast_vote, retract_vote, and replace_ballot
+    functions
+    """
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.election = create_election(anonymous=False)
+        cls.voter = create_voter(cls.election)
+        cls.single_position = create_election_position(
+            cls.election, create_position(admin_title='Single')
+        )
+        cls.multiple_position = create_election_position(
+            cls.election, create_position(admin_title='Multiple'),
+            positions_available=2
+        )
+        cls.single_candidates = [
+            create_candidate(cls.single_position) for _ in range(2)
+        ]
+        cls.multiple_candidates = [
+            create_candidate(cls.multiple_position) for _ in range(3)
+        ]
+
+
+    def tally(self, candidate) -> int:
+        return candidate.tallies.aggregate(votes=Sum('votes'))['votes'] or 0
+
+
+    def test_single_seat_vote_is_replaced(self):
+        first, second = self.single_candidates
+        cast_vote(self.election, self.voter.pk, self.single_position, first)
+        _, old_candidate_pk = cast_vote(
+            self.election, self.voter.pk, self.single_position, second
+        )
+        self.assertEqual(old_candidate_pk, first.pk)
+        self.assertEqual(
+            list(Vote.objects.values_list('candidate_id', 'seat')),
+            [(second.pk, 0)]
+        )
+        self.assertEqual(self.tally(first), 0)
+        self.assertEqual(self.tally(second), 1)
+
+
+    def test_multiple_seats_are_filled_in_order(self):
+        for candidate in self.multiple_candidates[:2]:
+            cast_vote(
+                self.election, self.voter.pk, self.multiple_position, candidate
+            )
+        self.assertEqual(
+            sorted(Vote.objects.values_list('seat', flat=True)), [0, 1]
+        )
+
+
+    def test_no_free_seats_raises(self):
+        for candidate in self.multiple_candidates[:2]:
+            cast_vote(
+                self.election, self.voter.pk, self.multiple_position, candidate
+            )
+        with self.assertRaises(VotingError):
+            cast_vote(
+                self.election, self.voter.pk, self.multiple_position,
+                self.multiple_candidates[2]
+            )
+
+
+    def test_duplicate_candidate_raises(self):
+        candidate = self.multiple_candidates[0]
+        cast_vote(self.election, self.voter.pk, self.multiple_position, candidate)
+        with self.assertRaises(VotingError):
+            cast_vote(
+                self.election, self.voter.pk, self.multiple_position, candidate
+            )
+
+
+    def test_unknown_voter_raises(self):
+        other_voter = create_voter(
+            create_election(admin_title='Other', anonymous=False)
+        )
+        with self.assertRaises(VotingError):
+            cast_vote(
+                self.election, other_voter.pk, self.single_position,
+                self.single_candidates[0]
+            )
+
+
+    def test_retract_vote_frees_seat(self):
+        first, second, third = self.multiple_candidates
+        cast_vote(self.election, self.voter.pk, self.multiple_position, first)
+        cast_vote(self.election, self.voter.pk, self.multiple_position, second)
+        retract_vote(
+            self.election, self.voter.pk, self.multiple_position.pk, first.pk
+        )
+        cast_vote(self.election, self.voter.pk, self.multiple_position, third)
+        self.assertEqual(
+            dict(Vote.objects.values_list('candidate_id', 'seat')),
+            {second.pk: 1, third.pk: 0}
+        )
+        self.assertEqual(self.tally(first), 0)
+
+
+    def test_retract_missing_vote_raises(self):
+        with self.assertRaises(VotingError):
+            retract_vote(
+                self.election, self.voter.pk, self.single_position.pk,
+                self.single_candidates[0].pk
+            )
+
+
+    def test_replace_ballot_keeps_seats_of_unchanged_votes(self):
+        first, second, third = self.multiple_candidates
+        cast_vote(self.election, self.voter.pk, self.multiple_position, first)
+        cast_vote(self.election, self.voter.pk, self.multiple_position, second)
+        changes = replace_ballot(self.election, self.voter.pk, {
+            second.pk: self.multiple_position.pk,
+            third.pk: self.multiple_position.pk,
+        })
+        self.assertEqual(changes, {'added': 1, 'removed': 1})
+        self.assertEqual(
+            dict(Vote.objects.values_list('candidate_id', 'seat')),
+            {second.pk: 1, third.pk: 0}
+        )
+
+
+    def test_every_write_path_sets_election(self):
+        first, second, third = self.multiple_candidates
+        cast_vote(
+            self.election, self.voter.pk, self.single_position,
+            self.single_candidates[0]
+        )
+        cast_vote(self.election, self.voter.pk, self.multiple_position, first)
+        replace_ballot(self.election, self.voter.pk, {
+            second.pk: self.multiple_position.pk,
+            third.pk: self.multiple_position.pk,
+        })
+        Vote.objects.create(
+            registered_voter=create_voter(self.election),
+            position=self.single_position,
+            candidate=self.single_candidates[1]
+        )
+        self.assertEqual(
+            set(Vote.objects.values_list('election_id', flat=True)),
+            {self.election.pk}
+        )
+
+
+    def test_constraints_reject_extra_seat(self):
+        Vote.objects.create(
+            registered_voter=self.voter,
+            position=self.single_position,
+            candidate=self.single_candidates[0]
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Vote.objects.create(
+                registered_voter=self.voter,
+                position=self.single_position,
+                candidate=self.single_candidates[1],
+                seat=0
+            )
+
+
+    def test_constraints_reject_vote_without_voter(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Vote.objects.create(
+                position=self.single_position,
+                candidate=self.single_candidates[0]
+            )
+
+
+class ConcurrentVotingTestCase(TransactionTestCase):
+    """Tests that votes cast concurrently by the same voter keep the
+    invariants of the voting module
+    """
+    def setUp(self) -> None:
+        self.election = create_election(anonymous=False)
+        self.voter = create_voter(self.election)
+        self.position = create_election_position(
+            self.election, create_position(), positions_available=2
+        )
+        self.candidates = [
+            create_candidate(self.position) for _ in range(4)
+        ]
+
+
+    def cast_votes(
+        self, candidate, cast: list, refused: list, errors: list
+    ) -> None:
+        try:
+            for _ in range(5):
+                try:
+                    cast_vote(
+                        self.election, self.voter.pk, self.position, candidate
+                    )
+                    cast.append(candidate.pk)
+                    retract_vote(
+                        self.election, self.voter.pk, self.position.pk,
+                        candidate.pk
+                    )
+                except VotingError:
+                    pass
+            try:
+                cast_vote(
+                    self.election, self.voter.pk, self.position, candidate
+                )
+                cast.append(candidate.pk)
+            except VotingError:
+                pass
+        except OperationalError as e:
+            # SQLite may refuse concurrent writers outright
+            if connection.vendor == 'sqlite':
+                refused.append(e)
+            else:
+                errors.append(e)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+
+    def test_concurrent_votes_keep_invariants(self):
+        cast, refused, errors = [], [], []
+        threads = [
+            threading.Thread(
+                target=self.cast_votes,
+                args=(candidate, cast, refused, errors)
+            ) for candidate in self.candidates
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        if not cast and refused:
+            self.skipTest('SQLite refused every concurrent write')
+        self.assertGreater(len(cast), 0)
+
+        votes = Vote.objects.filter(registered_voter=self.voter)
+        self.assertLessEqual(votes.count(), self.position.positions_available)
+        self.assertFalse(
+            votes.values('candidate').annotate(
+                count=Count('pk')
+            ).filter(count__gt=1).exists()
+        )
+        tallied = VoteTally.objects.filter(
+            position=self.position
+        ).aggregate(votes=Sum('votes'))['votes'] or 0
+        self.assertEqual(tallied, votes.count())
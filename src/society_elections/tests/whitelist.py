@@ -0,0 +1,77 @@
+"""Module to test the whitelist module of society_elections"""
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from ..forms import NominationForm
+from ..roll import validate_voter_email
+from ..validators import domain_whitelist_validator
+from ..whitelist import compile_whitelist
+from .helpers import create_election, create_election_position, create_position
+
+
+class DomainWhitelistTestCase(TestCase):
+    """Tests the whitelist.compile_whitelist function and its uses"""
+    def test_exact_domains(self):
+        whitelist = compile_whitelist('example.com\nexample.org')
+        self.assertTrue(whitelist.matches('example.com'))
+        self.assertTrue(whitelist.matches('Example.ORG'))
+        self.assertFalse(whitelist.matches('cs.example.com'))
+        self.assertFalse(whitelist.matches('example.net'))
+
+
+    def test_wildcard_matches_subdomains(self):
+        whitelist = compile_whitelist('*.example.ac.uk')
+        self.assertTrue(whitelist.matches('cs.example.ac.uk'))
+        self.assertTrue(whitelist.matches('maths.dept.example.ac.uk'))
+        self.assertFalse(whitelist.matches('example.ac.uk'))
+        self.assertFalse(whitelist.matches('badexample.ac.uk'))
+        self.assertFalse(whitelist.matches('ac.uk'))
+
+
+    def test_emails(self):
+        whitelist = compile_whitelist('example.com\n*.example.ac.uk')
+        self.assertTrue(whitelist.matches_email('a@example.com'))
+        self.assertTrue(whitelist.matches_email('a@cs.example.ac.uk'))
+        self.assertFalse(whitelist.matches_email('example.com'))
+
+
+    def test_empty_whitelist_matches_nothing(self):
+        for text in (None, '', '\n'):
+            self.assertFalse(compile_whitelist(text).matches('example.com'))
+
+
+    def test_whitelist_compiled_once(self):
+        self.assertIs(
+            compile_whitelist('example.com'), compile_whitelist('example.com')
+        )
+
+
+    def test_validator(self):
+        domain_whitelist_validator('example.com\n*.example.ac.uk')
+        for entry in ('*example.com', 'a@example.com', 'cs.*.example.com'):
+            with self.subTest(entry=entry):
+                with self.assertRaises(ValidationError):
+                    domain_whitelist_validator(entry)
+
+
+    def test_election_whitelists(self):
+        election = create_election(
+            voter_email_domain_whitelist='*.example.ac.uk',
+            candidate_email_domain_whitelist='example.ac.uk\n*.example.ac.uk'
+        )
+        validate_voter_email(election, 'voter@cs.example.ac.uk')
+        with self.assertRaises(ValidationError):
+            validate_voter_email(election, 'voter@example.ac.uk')
+
+        position = create_election_position(election, create_position())
+        for email, valid in (
+            ('candidate@example.ac.uk', True),
+            ('candidate@cs.example.ac.uk', True),
+            ('candidate@example.com', False),
+        ):
+            with self.subTest(email=email):
+                form = NominationForm({
+                    'full_name': 'Candidate', 'email': email,
+                    'position': position.pk, 'manifesto': 'Manifesto'
+                })
+                self.assertEqual(form.is_valid(), valid)
@@ -0,0 +1,260 @@
+"""Rate limits requests with token buckets stored in Django's cache
+
+Each throttled view has a scope, named after its URL, with rates for the IP
+address of the client and for the voter it identifies, configured with
+SOCIETY_ELECTIONS_THROTTLE_RATES. A bucket holds as many tokens as the number
+of requests allowed in a period, and refills continuously, so clients may
+burst up to the rate and are then limited to it.
+
+Buckets are read and written without locking, so concurrent requests may
+occasionally take the same token. Once a client has been throttled, the
+process remembers when its bucket next has a token, and rejects its requests
+until then without reading the cache.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.http import HttpRequest
+from ipware import get_client_ip
+
+from . import app_settings
+from .caching import get_cache
+from .tokens import load_voter_token
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_KEY = 'society_elections:throttle:{scope}:{kind}:{ident}'
+
+PERIODS = {
+    's': 1, 'sec': 1, 'second': 1,
+    'm': 60, 'min': 60, 'minute': 60,
+    'h': 3600, 'hour': 3600,
+    'd': 86400, 'day': 86400,
+}
+
+# Largest number of throttled clients remembered by each process
+MAX_BLOCKED = 10000
+
+BucketState = Tuple[float, float]
+
+
+class Rate(NamedTuple):
+    """Number of requests allowed in a period
+
+    Attributes:
+        requests (int): Requests allowed, and the capacity of the bucket
+        seconds (int): Length of the period
+    """
+    requests: int
+    seconds: int
+
+
+def parse_rate(rate: str) -> Rate:
+    """Parse a rate such as '10/min' or '3/hour'
+
+    Args:
+        rate (str): Number of requests, and a period of s, min, hour, or day
+
+    Raises:
+        ValueError: Rate is malformed
+
+    Returns:
+        Rate: The rate
+    """
+    requests, _, period = rate.partition('/')
+    if period not in PERIODS or int(requests) < 1:
+        raise ValueError(f'Malformed throttle rate "{rate}"')
+    return Rate(int(requests), PERIODS[period])
+
+
+def get_rates(scope: str) -> Dict[str, Rate]:
+    """Get the rates of a scope
+
+    Args:
+        scope (str): Scope of the throttled view
+
+    Returns:
+        dict: Rate of each kind of client, i.e. 'ip' or 'voter'
+    """
+    return {
+        kind: parse_rate(rate)
+        for kind, rate in app_settings.THROTTLE_RATES.get(scope, {}).items()
+        if rate is not None
+    }
+
+
+def take_token(
+    state: Optional[BucketState], rate: Rate, now: float
+) -> Tuple[BucketState, float]:
+    """Take a token from a bucket
+
+    Args:
+        state (tuple): Tokens in the bucket and when it was last updated, or
+            None if the bucket is new
+        rate (Rate): Rate the bucket refills at
+        now (float): Current timestamp
+
+    Returns:
+        tuple: New state of the bucket, and the seconds until a token is
+            available if the bucket was empty, or 0 if a token was taken
+    """
+    tokens, updated = state if state is not None else (rate.requests, now)
+    tokens = min(
+        rate.requests,
+        tokens + (now - updated) * rate.requests / rate.seconds
+    )
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) * rate.seconds / rate.requests
+
+
+def get_voter_idents(req: HttpRequest) -> List[str]:
+    """Identify the voter sending a request from its credentials
+
+    Credentials are read from where the views read them: a token, password,
+    or email from the POST data, and a uuid from the POST data, or the query
+    string of a GET request. A request is identified by every credential it
+    sends, so sending another credential alongside the one the view uses
+    does not avoid its limit.
+
+    A valid token and a uuid both identify a registered voter by their
+    primary key, so logging in again for a new token does not avoid the
+    limit either. Invalid tokens are ignored, as the views reject them.
+    Emails are lowercased, so that a voter cannot be emailed more often by
+    changing the case of their address. Credentials are hashed, so that
+    passwords are not stored in the cache.
+
+    Args:
+        req (HttpRequest): Request sent by the voter
+
+    Returns:
+        list: Identifiers of the voter, empty if no credentials were sent
+    """
+    credentials = []
+    token = req.POST.get('token')
+    if token:
+        payload = load_voter_token(token)
+        if payload is not None:
+            credentials.append(f'voter:{payload.get("v")}')
+    voter_uuid = (req.POST if req.method == 'POST' else req.GET).get('uuid')
+    if voter_uuid:
+        try:
+            voter_uuid = str(uuid.UUID(voter_uuid))
+        except ValueError:
+            pass
+        credentials.append(f'voter:{voter_uuid}')
+    password = req.POST.get('password')
+    if password:
+        credentials.append(f'password:{password}')
+    email = req.POST.get('email')
+    if email:
+        credentials.append(f'email:{email.strip().lower()}')
+    return [
+        hashlib.sha256(credential.encode()).hexdigest()[:32]
+        for credential in dict.fromkeys(credentials)
+    ]
+
+
+class Throttle:
+    """Throttles requests to the views of a scope
+
+    Args:
+        scope (str): Scope of the views, a key of THROTTLE_RATES
+    """
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._blocked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_buckets(self, req: HttpRequest) -> Dict[str, Rate]:
+        """Get the buckets a request takes a token from
+
+        Args:
+            req (HttpRequest): Request to throttle
+
+        Returns:
+            dict: Rate of each bucket, by cache key
+        """
+        buckets = {}
+        for kind, rate in get_rates(self.scope).items():
+            if kind == 'ip':
+                ip, _ = get_client_ip(req)
+                idents = [] if ip is None else [ip]
+            elif kind == 'voter':
+                idents = get_voter_idents(req)
+            else:
+                raise ValueError(f'Unknown throttle "{kind}" for {self.scope}')
+            for ident in idents:
+                buckets[THROTTLE_KEY.format(
+                    scope=self.scope, kind=kind, ident=ident
+                )] = rate
+        return buckets
+
+    def blocked_for(self, keys, now: float) -> float:
+        """Seconds until the process lets requests to any bucket through"""
+        return max(
+            (self._blocked.get(key, 0) - now for key in keys), default=0
+        )
+
+    def block(self, key: str, until: float) -> None:
+        """Remember a bucket is empty until a timestamp"""
+        with self._lock:
+            if len(self._blocked) >= MAX_BLOCKED:
+                self._blocked.clear()
+            self._blocked[key] = until
+
+    def wait_time(self, req: HttpRequest) -> float:
+        """Take a token from each bucket of a request
+
+        Args:
+            req (HttpRequest): Request to throttle
+
+        Returns:
+            float: Seconds to wait before retrying, or 0 if the request may
+                be handled
+        """
+        now = time.time()
+        buckets = self.get_buckets(req)
+        blocked = self.blocked_for(buckets, now)
+        if blocked > 0:
+            return blocked
+
+        cache = get_cache()
+        states = cache.get_many(buckets.keys())
+        wait = 0
+        for key, rate in buckets.items():
+            state, key_wait = take_token(states.get(key), rate, now)
+            cache.set(key, state, rate.seconds)
+            if key_wait > 0:
+                self.block(key, now + key_wait)
+                wait = max(wait, key_wait)
+        return wait
+
+    async def await_time(self, req: HttpRequest) -> float:
+        """Asynchronous version of wait_time"""
+        now = time.time()
+        buckets = self.get_buckets(req)
+        blocked = self.blocked_for(buckets, now)
+        if blocked > 0:
+            return blocked
+
+        cache = get_cache()
+        states = await cache.aget_many(buckets.keys())
+        wait = 0
+        for key, rate in buckets.items():
+            state, key_wait = take_token(states.get(key), rate, now)
+            await cache.aset(key, state, rate.seconds)
+            if key_wait > 0:
+                self.block(key, now + key_wait)
+                wait = max(wait, key_wait)
+        return wait
+
+
+def retry_after(wait: float) -> str:
+    """Format seconds to wait as a Retry-After header"""
+    return str(max(1, math.ceil(wait)))
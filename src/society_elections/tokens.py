@@ -0,0 +1,35 @@
+"""Verifies the signed tokens voters send in place of their uuid or password
+
+Tokens are created by views.helpers.create_voter_token once a voter logs in.
+They are read here, rather than in the views, so that throttling can identify
+the voter sending a token without importing the views.
+"""
+from typing import Optional
+
+from django.core import signing
+
+from . import app_settings
+
+VOTER_TOKEN_SALT = 'society_elections.views.helpers.voter_token'
+
+
+def load_voter_token(token: str) -> Optional[dict]:
+    """Load the payload of a voter token, checking its signature and age
+
+    The database is not queried, and the election the token was created for
+    is not checked.
+
+    Args:
+        token (str): Token to load
+
+    Returns:
+        dict: Payload of the token, with the election PK as 'e' and the voter
+            PK as 'v', or None if the token is not valid or has expired
+    """
+    try:
+        payload = signing.loads(
+            token, salt=VOTER_TOKEN_SALT, max_age=app_settings.VOTER_TOKEN_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return payload if isinstance(payload, dict) else None
@@ -1,11 +1,18 @@
 from django.urls import path
 
-from society_elections.views.vote import delete_vote_ajax
-
+from . import app_settings
 from .views import (NominationFormView, NominationSuccessView,
-                    VoteSubmittedView, create_vote_ajax, create_voter_view,
-                    delete_vote_ajax, index_view, resend_voter_verification,
-                    verify_candidate_view, verify_voter_view, vote_view)
+                    VoteSubmittedView, acreate_vote_ajax, adelete_vote_ajax,
+                    avote_view, ballot_view, create_vote_ajax,
+                    create_voter_view, delete_vote_ajax, index_view,
+                    resend_voter_verification, results_view,
+                    submit_ballot_ajax, verify_candidate_view,
+                    verify_voter_view, vote_view, voter_login_ajax)
+
+if app_settings.ASYNC_VIEWS:
+    vote_view = avote_view
+    create_vote_ajax = acreate_vote_ajax
+    delete_vote_ajax = adelete_vote_ajax
 
 app_name = 'society_elections'
 urlpatterns = [
@@ -26,12 +33,20 @@ urlpatterns = [
     # Voting
     path('vote/', vote_view, name='vote'),
     path('vote/submitted', VoteSubmittedView.as_view(), name='vote_submitted'),
+    path('vote/ballot/', ballot_view, name='ballot'),
+    path(
+        'vote/ajax/login', voter_login_ajax, name='voter_login'
+    ),
     path(
         'vote/ajax/create', create_vote_ajax, name='vote_create'
     ),
     path(
         'vote/ajax/delete', delete_vote_ajax, name='vote_delete'
     ),
+    path(
+        'vote/ajax/ballot', submit_ballot_ajax, name='ballot_submit'
+    ),
     # Elections
+    path('results/', results_view, name='results'),
     path('', index_view, name='index')
 ]
@@ -35,4 +35,23 @@ def email_user_validator(email: str):
             raise ValidationError(
                 'Email contains invalid character, only alphanumeric '
                 'characters, dashes, and dots are allowed'
-            )
\ No newline at end of file
+            )
+
+
+def domain_whitelist_validator(whitelist: str):
+    """Ensures each entry of an email domain whitelist is a domain, or a 
+    wildcard of the form *.example.com
+
+    Args:
+        whitelist (str): Newline-delimited list of domains
+
+    Raises:
+        ValidationError: whitelist contains an invalid entry
+    """
+    for entry in whitelist.split():
+        domain = entry[2:] if entry.startswith('*.') else entry
+        if '@' in domain or '*' in domain or not domain.strip('.'):
+            raise ValidationError(
+                f'"{entry}" is not a domain, or a wildcard such as '
+                '*.example.com'
+            )
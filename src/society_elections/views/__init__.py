@@ -1,7 +1,8 @@
-from .election import index_view
+from .election import index_view, results_view
 from .nomination import (NominationFormView, NominationSuccessView,
                          verify_candidate_view)
-from .vote import (VoteSubmittedView, create_vote_ajax, delete_vote_ajax,
-                   vote_view)
+from .vote import (VoteSubmittedView, acreate_vote_ajax, adelete_vote_ajax,
+                   avote_view, ballot_view, create_vote_ajax, delete_vote_ajax,
+                   submit_ballot_ajax, vote_view, voter_login_ajax)
 from .voter import (create_voter_view, resend_voter_verification,
                     verify_voter_view)
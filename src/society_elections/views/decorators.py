@@ -1,40 +1,92 @@
+import asyncio
 import functools
+import logging
+from typing import Callable
 
-from django.http import HttpRequest
+from django.http import (Http404, HttpRequest, HttpResponse,
+                         HttpResponseNotAllowed, JsonResponse)
 from django.shortcuts import get_object_or_404, render
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.views.decorators import http
 
+from .. import app_settings
+from ..caching import election_cache_timeout, election_etag
 from ..models import Election
-from .helpers import get_latest_election, get_template
+from ..throttling import Throttle, retry_after
+from .helpers import (aget_latest_election, get_latest_election,
+                      get_request_election, get_template)
+
+logger = logging.getLogger('django.request')
 
 
 def validate_election_period(target_election_period: str):
     """Validates that the target election is currently in the given period
 
+    Works with both synchronous and asynchronous views. The election is
+    resolved with the async ORM for asynchronous views.
+
     Args:
         target_election_period (str): Election period the election should be in
 
     Returns:
-        HttpResponse: The expected response if the election is in the target 
-            election period, or a page stating it isn't in the target election 
+        HttpResponse: The expected response if the election is in the target
+            election period, or a page stating it isn't in the target election
             period otherwise.
     """
     if target_election_period not in Election.ELECTION_PERIODS:
         raise ValueError(
             f'target_election_period must be one of {Election.ELECTION_PERIODS}'
         )
+
+    def wrong_period(req: HttpRequest, target_election: Election):
+        return election_page_response(
+            req, target_election, lambda: render(
+                req, get_template('election_wrong_period'), {
+                    'election': target_election,
+                    'period': target_election_period
+                }
+            )
+        )
+
     def validate_election_period_wrapper(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(
+                req: HttpRequest, election: int=None, *args, **kwargs
+            ):
+                if election is None:
+                    target_election = await aget_latest_election()
+                else:
+                    try:
+                        target_election = await Election.objects.aget(
+                            pk=election
+                        )
+                    except Election.DoesNotExist:
+                        raise Http404
+                req.election = target_election
+
+                if target_election.current_period != target_election_period:
+                    return wrong_period(req, target_election)
+                elif election is None:
+                    return await func(req, *args, **kwargs)
+                else:
+                    return await func(req, election, *args, **kwargs)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(req: HttpRequest, election: int=None, *args, **kwargs):
             if election is None:
                 target_election = get_latest_election()
             else:
                 target_election = get_object_or_404(Election, pk=election)
-            
+
+            # Resolve the election once per request, views should use
+            # get_request_election to retrieve it
+            req.election = target_election
+
             if target_election.current_period != target_election_period:
-                return render(req, get_template('election_wrong_period'), {
-                    'election': target_election,
-                    'period': target_election_period
-                })
+                return wrong_period(req, target_election)
             elif election is None:
                 return func(req, *args, **kwargs)
             else:
@@ -42,3 +94,142 @@ def validate_election_period(target_election_period: str):
         return wrapper
     return validate_election_period_wrapper
 
+
+def election_page_response(
+    req: HttpRequest,
+    election: Election,
+    get_response: Callable[[], HttpResponse]
+) -> HttpResponse:
+    """Respond with a page which depends only on an election and its period
+
+    GET and HEAD responses can be cached publicly, e.g. by a reverse proxy,
+    for app_settings.ELECTION_PAGE_MAX_AGE seconds, or until the election
+    next changes period if sooner. Browsers revalidate on every request.
+    Clients revalidating with the ETag of the page receive a 304 Not
+    Modified without it being rendered.
+
+    Args:
+        req (HttpRequest): Request for the page
+        election (Election): Election displayed by the page
+        get_response (Callable): Function rendering the page
+
+    Returns:
+        HttpResponse: The page, or 304 Not Modified
+    """
+    if req.method not in ('GET', 'HEAD'):
+        return get_response()
+
+    etag = election_etag(election)
+    response = get_conditional_response(req, etag=etag)
+    if response is None:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    patch_cache_control(
+        response, public=True, max_age=0, must_revalidate=True,
+        s_maxage=min(
+            app_settings.ELECTION_PAGE_MAX_AGE,
+            election_cache_timeout(election)
+        )
+    )
+    # Pages may display messages stored in the session or a cookie
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def cache_election_page(func):
+    """Send caching headers with a view depending only on the latest election
+    and its period
+
+    Args:
+        func (Callable): View to decorate
+
+    Returns:
+        Callable: View responding with election_page_response
+    """
+    @functools.wraps(func)
+    def wrapper(req: HttpRequest, *args, **kwargs):
+        return election_page_response(
+            req, get_request_election(req), lambda: func(req, *args, **kwargs)
+        )
+    return wrapper
+
+
+def require_POST(func):
+    """Only allow POST requests to a view, which may be asynchronous
+
+    django.views.decorators.http.require_POST only supports asynchronous views
+    from Django 5.0.
+
+    Args:
+        func (Callable): View to decorate
+
+    Returns:
+        Callable: View returning 405 Method Not Allowed to other requests
+    """
+    if not asyncio.iscoroutinefunction(func):
+        return http.require_POST(func)
+
+    @functools.wraps(func)
+    async def wrapper(req: HttpRequest, *args, **kwargs):
+        if req.method != 'POST':
+            logger.warning(
+                f'Method Not Allowed ({req.method}): {req.path}',
+                extra={'status_code': 405, 'request': req}
+            )
+            return HttpResponseNotAllowed(['POST'])
+        return await func(req, *args, **kwargs)
+    return wrapper
+
+
+def throttle(scope: str, json: bool=False):
+    """Limit the rate of requests to a view, which may be asynchronous
+
+    Throttled requests receive a 429 Too Many Requests, with a Retry-After 
+    header giving the seconds to wait.
+
+    Args:
+        scope (str): Key of app_settings.THROTTLE_RATES giving the rates
+        json (bool, optional): Respond with an error as JSON, for views 
+            requested with AJAX. Defaults to False.
+
+    Returns:
+        Callable: Decorator throttling a view
+    """
+    scope_throttle = Throttle(scope)
+
+    def throttled(req: HttpRequest, wait: float) -> HttpResponse:
+        logger.warning(
+            f'Too Many Requests ({scope}): {req.path}',
+            extra={'status_code': 429, 'request': req}
+        )
+        if json:
+            response = JsonResponse(
+                {'error': 'Too many requests, try again later'}, status=429
+            )
+        else:
+            response = HttpResponse(
+                'Too many requests, try again later', status=429
+            )
+        response['Retry-After'] = retry_after(wait)
+        return response
+
+    def throttle_wrapper(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(req: HttpRequest, *args, **kwargs):
+                wait = await scope_throttle.await_time(req)
+                if wait > 0:
+                    return throttled(req, wait)
+                return await func(req, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(req: HttpRequest, *args, **kwargs):
+            wait = scope_throttle.wait_time(req)
+            if wait > 0:
+                return throttled(req, wait)
+            return func(req, *args, **kwargs)
+        return wrapper
+    return throttle_wrapper
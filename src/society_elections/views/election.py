@@ -1,13 +1,22 @@
-from django.http import HttpRequest
+import hashlib
+
+from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
 
-from ..models import Election
-from .helpers import get_latest_election, get_template
+from ..caching import (RESULTS_PAGE_KEY, election_cache_timeout, election_etag,
+                       get_cache)
+from ..models import Election, ElectionResults
+from .decorators import cache_election_page, validate_election_period
+from .helpers import get_request_election, get_template
 
 
+@cache_election_page
 def index_view(req: HttpRequest):
     # Get latest election
-    election = get_latest_election()
+    election = get_request_election(req)
     if election.current_period in (Election.POSTVOTING, Election.FINISHED):
         return render(req, get_template('election_finished'), {
             'election': election
@@ -17,3 +26,51 @@ def index_view(req: HttpRequest):
         'election': election,
         'election_period': election.current_period
     })
+
+
+@require_safe
+@validate_election_period(Election.FINISHED)
+def results_view(req: HttpRequest) -> HttpResponse:
+    """The frozen results of the latest election
+
+    The page is rendered once from the ElectionResults snapshot, without the
+    request, and cached whole until the election or its results change. Hits
+    only read the cache, never the votes or the snapshot.
+
+    Args:
+        req (HttpRequest): Request for the results
+
+    Raises:
+        Http404: The results of the election have not been frozen
+
+    Returns:
+        HttpResponse: The results page, or 304 Not Modified
+    """
+    election = get_request_election(req)
+    election_version = election_etag(election)
+    key = RESULTS_PAGE_KEY.format(pk=election.pk)
+    page = get_cache().get(key)
+    if page is None or page[0] != election_version:
+        snapshot = ElectionResults.objects.filter(election=election).first()
+        if snapshot is None:
+            raise Http404('Results have not been published')
+        content = render_to_string(get_template('election_results'), {
+            'election': election,
+            'results': snapshot,
+            'positions': snapshot.results['positions'],
+        })
+        digest = hashlib.sha256(
+            f'{election_version}:{snapshot.version}'.encode()
+        ).hexdigest()[:32]
+        page = (election_version, f'"{digest}"', content)
+        get_cache().set(key, page, election_cache_timeout(election))
+
+    _, etag, content = page
+    response = get_conditional_response(req, etag=etag)
+    if response is None:
+        response = HttpResponse(content)
+    response['ETag'] = etag
+    patch_cache_control(
+        response, public=True, max_age=election_cache_timeout(election)
+    )
+    return response
@@ -1,16 +1,21 @@
 """General purpose helpers for the views module"""
 import logging
+from typing import Optional, Union
 from uuid import UUID
 
+from django.core import signing
 from django.http import Http404
 from django.http.request import HttpRequest
 from django.shortcuts import get_object_or_404
 
 from .. import app_settings
+from ..caching import aget_cached_latest_election, get_cached_latest_election
 from ..models import AnonymousVoter, Election, RegisteredVoter
+from ..tokens import VOTER_TOKEN_SALT, load_voter_token
 
 logger = logging.getLogger(__name__)
 
+
 def get_template(name: str) -> str:
     """Retrieves the target template with the given name
 
@@ -30,6 +35,8 @@ def get_template(name: str) -> str:
 
 def get_latest_election() -> Election:
     """Get the latest election or raise 404
+
+    The election is retrieved from the cache where possible.
     
     Raises:
         Http404: No election found
@@ -38,7 +45,7 @@ def get_latest_election() -> Election:
         Election: The election with the latest nomination start
     """
     try:
-        election: Election = Election.objects.latest()
+        election: Election = get_cached_latest_election()
         logger.debug(f'Found latest election "{election}"')
     except Election.DoesNotExist:
         logger.warning('No election found, returning 404')
@@ -46,6 +53,89 @@ def get_latest_election() -> Election:
     return election
 
 
+async def aget_latest_election() -> Election:
+    """Asynchronous version of get_latest_election
+
+    Raises:
+        Http404: No election found
+
+    Returns:
+        Election: The election with the latest nomination start
+    """
+    try:
+        election: Election = await aget_cached_latest_election()
+        logger.debug(f'Found latest election "{election}"')
+    except Election.DoesNotExist:
+        logger.warning('No election found, returning 404')
+        raise Http404
+    return election
+
+
+def get_request_election(req: HttpRequest) -> Election:
+    """Get the election a request is for, resolving it at most once
+
+    The election is attached to the request by validate_election_period, so 
+    that views do not need to query for it again. If the election has not yet 
+    been resolved for this request, the latest election is used.
+
+    Args:
+        req (HttpRequest): Request to get the election of
+
+    Raises:
+        Http404: No election found
+
+    Returns:
+        Election: The election the request is for
+    """
+    election = getattr(req, 'election', None)
+    if election is None:
+        election = get_latest_election()
+        req.election = election
+    return election
+
+
+async def aget_request_election(req: HttpRequest) -> Election:
+    """Asynchronous version of get_request_election
+
+    Args:
+        req (HttpRequest): Request to get the election of
+
+    Raises:
+        Http404: No election found
+
+    Returns:
+        Election: The election the request is for
+    """
+    election = getattr(req, 'election', None)
+    if election is None:
+        election = await aget_latest_election()
+        req.election = election
+    return election
+
+
+def get_request_uuid(req: HttpRequest) -> Optional[str]:
+    """Get the uuid of the voter sending a request to a non-anonymous election
+
+    Raises:
+        Http404: The uuid sent is not a UUID
+
+    Returns:
+        str: UUID of the RegisteredVoter, or None if not sent
+    """
+    if req.method == 'POST':
+        uuid = req.POST.get('uuid')
+    else:
+        uuid = req.GET.get('uuid')
+
+    # No user if uuid is not a UUID - None will work with the query
+    if type(uuid) != UUID and uuid is not None:
+        try:
+            UUID(uuid)
+        except ValueError:
+            raise Http404
+    return uuid
+
+
 def is_request_authenticated(election: Election, req: HttpRequest) -> bool:
     """Verify that a given request is authenticated to vote in an election
 
@@ -74,21 +164,143 @@ def is_request_authenticated(election: Election, req: HttpRequest) -> bool:
             return False
         return True
     else: # Get voter for non-anonymous election
-        if req.method == 'POST':
-            uuid = req.POST.get('uuid')
-        else:
-            uuid = req.GET.get('uuid')
-
-        # No user if uuid is not a UUID - None will work with the query
-        if type(uuid) != UUID and uuid is not None:
-            try:
-                UUID(uuid)
-            except ValueError:
-                raise Http404
-        
         voter = get_object_or_404(
-            RegisteredVoter, election=election, pk=uuid
+            RegisteredVoter, election=election, pk=get_request_uuid(req)
         )
 
         # Has the voter verified their email?
         return voter.verified
+
+
+async def ais_request_authenticated(
+    election: Election, req: HttpRequest
+) -> bool:
+    """Asynchronous version of is_request_authenticated
+
+    Args:
+        election (Election): Target election
+        req (HttpRequest): Request object to verify
+
+    Raises:
+        Http404: RegisteredVoter cannot be found in a non-anonymized election
+
+    Returns:
+        bool: True if the request is authenticated, False otherwise
+    """
+    if election.anonymous:
+        password = req.POST.get('password')
+        if req.method != 'POST' or password is None:
+            return False
+        return await AnonymousVoter.objects.filter(
+            password=AnonymousVoter.hash_password(password), election=election
+        ).aexists()
+    else:
+        try:
+            voter = await RegisteredVoter.objects.aget(
+                election=election, pk=get_request_uuid(req)
+            )
+        except RegisteredVoter.DoesNotExist:
+            raise Http404
+        return voter.verified
+
+
+def get_voter_pk(election: Election, req: HttpRequest) -> Union[UUID, int]:
+    """Get the primary key of the voter identified by the request credentials
+
+    Should only be called once the request has been authenticated with 
+    is_request_authenticated.
+
+    Args:
+        election (Election): Target election
+        req (HttpRequest): Request containing the uuid or password of a voter
+
+    Raises:
+        AnonymousVoter.DoesNotExist: Voter does not exist in anonymous election
+        RegisteredVoter.DoesNotExist: Voter does not exist in election
+
+    Returns:
+        UUID or int: Primary key of the RegisteredVoter in non-anonymous 
+            elections, or of the AnonymousVoter in anonymous elections
+    """
+    if election.anonymous:
+        return AnonymousVoter.objects.values_list('pk', flat=True).get(
+            election=election,
+            password=AnonymousVoter.hash_password(req.POST.get('password'))
+        )
+    else:
+        return RegisteredVoter.objects.values_list('pk', flat=True).get(
+            election=election, pk=req.POST.get('uuid', req.GET.get('uuid'))
+        )
+
+
+async def aget_voter_pk(
+    election: Election, req: HttpRequest
+) -> Union[UUID, int]:
+    """Asynchronous version of get_voter_pk
+
+    Args:
+        election (Election): Target election
+        req (HttpRequest): Request containing the uuid or password of a voter
+
+    Raises:
+        AnonymousVoter.DoesNotExist: Voter does not exist in anonymous election
+        RegisteredVoter.DoesNotExist: Voter does not exist in election
+
+    Returns:
+        UUID or int: Primary key of the RegisteredVoter in non-anonymous 
+            elections, or of the AnonymousVoter in anonymous elections
+    """
+    if election.anonymous:
+        return await AnonymousVoter.objects.values_list('pk', flat=True).aget(
+            election=election,
+            password=AnonymousVoter.hash_password(req.POST.get('password'))
+        )
+    else:
+        return await RegisteredVoter.objects.values_list(
+            'pk', flat=True
+        ).aget(
+            election=election, pk=req.POST.get('uuid', req.GET.get('uuid'))
+        )
+
+
+def create_voter_token(election: Election, voter_pk: Union[UUID, int]) -> str:
+    """Create a signed token identifying a voter in an election
+
+    The token allows the voter to vote without their uuid or password being 
+    checked against the database on every request.
+
+    Args:
+        election (Election): Election the voter is voting in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or 
+            AnonymousVoter
+
+    Returns:
+        str: Signed token
+    """
+    return signing.dumps(
+        {'e': election.pk, 'v': str(voter_pk)}, salt=VOTER_TOKEN_SALT
+    )
+
+
+def get_token_voter_pk(election: Election, token: str) -> Optional[str]:
+    """Verify a token created with create_voter_token
+
+    Only the signature of the token is checked, the database is not queried. 
+    Tokens are rejected once they are older than app_settings.VOTER_TOKEN_AGE, 
+    or once the election is no longer in its voting period.
+
+    Args:
+        election (Election): Election the token should be valid for
+        token (str): Token to verify
+
+    Returns:
+        str: Primary key of the voter, or None if the token is not valid
+    """
+    payload = load_voter_token(token)
+    if (
+        payload is None or
+        payload.get('e') != election.pk or
+        election.current_period != Election.VOTING
+    ):
+        return None
+    return payload.get('v')
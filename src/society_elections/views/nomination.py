@@ -9,8 +9,8 @@ from django.views.generic.edit import FormView
 
 from ..forms import NominationForm
 from ..models import Candidate, Election, ElectionPosition
-from .decorators import validate_election_period
-from .helpers import get_latest_election, get_template
+from .decorators import cache_election_page, validate_election_period
+from .helpers import get_request_election, get_template
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +32,8 @@ class NominationFormView(FormView):
         form.fields['position'].choices = [
             (position.pk, str(position)) for position
             in ElectionPosition.objects.filter(
-                election=get_latest_election()
-            )
+                election=get_request_election(self.request)
+            ).select_related('position', 'election')
         ]
         return form
 
@@ -47,7 +47,7 @@ class NominationFormView(FormView):
 
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
-        context_data['election'] = get_latest_election()
+        context_data['election'] = get_request_election(self.request)
         return context_data
 
     def get_success_url(self) -> str:
@@ -55,6 +55,7 @@ class NominationFormView(FormView):
 
 
 @method_decorator(validate_election_period(Election.NOMINATIONS), 'dispatch')
+@method_decorator(cache_election_page, 'dispatch')
 class NominationSuccessView(TemplateView):
     """When a nomination has been successful"""
 
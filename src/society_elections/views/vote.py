@@ -1,24 +1,94 @@
 import logging
+from collections import Counter
+from typing import Optional, Tuple
 
 from django.contrib import messages
 from django.http import HttpRequest, HttpResponse
 from django.http.response import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
-from django.views.decorators.http import require_POST
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
 from django.views.generic import TemplateView
 from ipware import get_client_ip
 
+from .. import app_settings
+from ..ballot import get_ballot
 from ..models import (AnonymousVoter, Candidate, Election, ElectionPosition,
                       RegisteredVoter, Vote)
-from .decorators import validate_election_period
-from .helpers import (get_latest_election, get_template,
-                      is_request_authenticated)
+from ..voting import (VotingError, acast_vote, aretract_vote, cast_vote,
+                      replace_ballot, retract_vote)
+from .decorators import (cache_election_page, require_POST, throttle,
+                         validate_election_period)
+from .helpers import (aget_request_election, aget_voter_pk,
+                      ais_request_authenticated, create_voter_token,
+                      get_request_election, get_template, get_token_voter_pk,
+                      get_voter_pk, is_request_authenticated)
 
 logger = logging.getLogger(__name__)
 
 
+def authenticate_vote_request(
+    election: Election, req: HttpRequest
+) -> Tuple[Optional[str], bool]:
+    """Authenticate a voter using a signed token, or their uuid or password
+
+    If the request contains a token created by voter_login_ajax, the voter is 
+    authenticated without querying the database.
+
+    Args:
+        election (Election): Election being voted in
+        req (HttpRequest): Request sent by voter
+
+    Returns:
+        tuple: Primary key of the voter, if known from the token, and whether 
+            or not the request is authenticated
+    """
+    token = req.POST.get('token')
+    if token is not None:
+        voter_pk = get_token_voter_pk(election, token)
+        return voter_pk, voter_pk is not None
+
+    try:
+        return None, is_request_authenticated(election, req)
+    except Http404:
+        ip, _ = get_client_ip(req)
+        logger.info(
+            f'Voter 404 not found: {req.POST.get("uuid")} "{election}" ({ip})'
+        )
+        return None, False
+
+
+async def aauthenticate_vote_request(
+    election: Election, req: HttpRequest
+) -> Tuple[Optional[str], bool]:
+    """Asynchronous version of authenticate_vote_request
+
+    Args:
+        election (Election): Election being voted in
+        req (HttpRequest): Request sent by voter
+
+    Returns:
+        tuple: Primary key of the voter, if known from the token, and whether 
+            or not the request is authenticated
+    """
+    token = req.POST.get('token')
+    if token is not None:
+        voter_pk = get_token_voter_pk(election, token)
+        return voter_pk, voter_pk is not None
+
+    try:
+        return None, await ais_request_authenticated(election, req)
+    except Http404:
+        ip, _ = get_client_ip(req)
+        logger.info(
+            f'Voter 404 not found: {req.POST.get("uuid")} "{election}" ({ip})'
+        )
+        return None, False
+
+
 @validate_election_period(Election.VOTING)
 def vote_view(req: HttpRequest) -> HttpResponse:
     """View to vote in an election
@@ -37,7 +107,7 @@ def vote_view(req: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: Reponse sent to voter
     """
-    election = get_latest_election()
+    election = get_request_election(req)
     uuid = req.POST.get('uuid', req.GET.get('uuid'))
     password = req.POST.get('password')
     ip, _ = get_client_ip(req)
@@ -77,20 +147,24 @@ def vote_view(req: HttpRequest) -> HttpResponse:
     # Voter verified
     verified_candidates = Candidate.objects.filter(
         position__election=election, email_verified=True
-    )
+    ).select_related('position__position')
     if election.anonymous:
         votes = Vote.objects.filter(anonymous_voter=anon_voter)
     else:
         votes = Vote.objects.filter(registered_voter=voter)
+    votes = votes.select_related('candidate__position__position')
     candidates_voted = [vote.candidate for vote in votes]
     context = {
         'election': election,
         'candidates': verified_candidates,
         'candidates_voted': candidates_voted,
-        'positions': election.positions.all(),
+        'positions': election.positions.select_related('position'),
         'voter': voter,
         'password': password,
         'votes': votes,
+        'token': create_voter_token(
+            election, anon_voter.pk if voter is None else voter.pk
+        ),
     }
 
     # Voter has been verified, we can now check if we need to submit votes or 
@@ -100,13 +174,14 @@ def vote_view(req: HttpRequest) -> HttpResponse:
     
     # Method is POST and submit is present
 
-    positions = ElectionPosition.objects.filter(election=election)
-    position_votes = {}
+    positions = ElectionPosition.objects.filter(
+        election=election
+    ).select_related('position')
+    positions_voted = {vote.position_id for vote in votes}
     voting_complete = True
     position: ElectionPosition
     for position in positions:
-        position_votes[position] = votes.filter(position=position)
-        if not position_votes[position].exists():
+        if position.pk not in positions_voted:
             messages.add_message(req, messages.WARNING, 
                 'You have not yet submitted a vote for '
                 f'{position.position.title}'
@@ -127,6 +202,262 @@ def vote_view(req: HttpRequest) -> HttpResponse:
         return redirect(reverse('society_elections:vote_submitted'))
 
 
+@validate_election_period(Election.VOTING)
+async def avote_view(req: HttpRequest) -> HttpResponse:
+    """Asynchronous version of vote_view, for deployments under ASGI
+
+    Args:
+        req (HttpRequest): Request sent by voter
+
+    Returns:
+        HttpResponse: Reponse sent to voter
+    """
+    election = await aget_request_election(req)
+    uuid = req.POST.get('uuid', req.GET.get('uuid'))
+    password = req.POST.get('password')
+    ip, _ = get_client_ip(req)
+    try:
+        authenticated = await ais_request_authenticated(election, req)
+    except Http404:
+        logger.info(f'Voter 404 not found: {uuid} "{election}" ({ip})')
+        return render(req, get_template('voter_404'), {
+            'uuid': uuid
+        }, status=401)
+
+    if not election.anonymous:
+        voter = await RegisteredVoter.objects.aget(election=election, pk=uuid)
+        if not authenticated:
+            logger.warning(
+                f'Voter 401 not authorized: {voter.email} "{election}" ({ip})'
+            )
+            return render(req, get_template('voter_not_verified'), {
+                'voter': voter
+            }, status=401)
+        votes = Vote.objects.filter(registered_voter=voter)
+    elif not authenticated: # and election.anonymous
+        logger.warning(
+            f'Voter 401 not registered: anonymous "{election}" ({ip})'
+        )
+        if password is not None:
+            messages.add_message(req, messages.ERROR,
+                'The password used was either incorrect, or your email has not '
+                'yet been verified.'
+            )
+        return render(req, get_template('password_entry'), status=401)
+    else:
+        voter = await AnonymousVoter.objects.aget(
+            election=election, password=AnonymousVoter.hash_password(password)
+        )
+        votes = Vote.objects.filter(anonymous_voter=voter)
+
+    # Templates cannot query the database from an async view, so every
+    # queryset is evaluated before rendering
+    verified_candidates = [
+        candidate async for candidate in Candidate.objects.filter(
+            position__election=election, email_verified=True
+        ).select_related('position__position')
+    ]
+    votes = [
+        vote async for vote in votes.select_related(
+            'candidate__position__position'
+        )
+    ]
+    positions = [
+        position async for position in election.positions.select_related(
+            'position'
+        )
+    ]
+    context = {
+        'election': election,
+        'candidates': verified_candidates,
+        'candidates_voted': [vote.candidate for vote in votes],
+        'positions': positions,
+        'voter': None if election.anonymous else voter,
+        'password': password,
+        'votes': votes,
+        'token': create_voter_token(election, voter.pk),
+    }
+
+    if req.method != 'POST' or req.POST.get('submit') is None:
+        return render(req, get_template('vote'), context)
+
+    positions_voted = {vote.position_id for vote in votes}
+    voting_complete = True
+    for position in positions:
+        if position.pk not in positions_voted:
+            messages.add_message(req, messages.WARNING, 
+                'You have not yet submitted a vote for '
+                f'{position.position.title}'
+            )
+            voting_complete = False
+
+    if not voting_complete:
+        logger.debug(f'Voting not finished: {voter} "{election}" ({ip})')
+        return render(req, get_template('vote'), context)
+    logger.info(f'Votes submitted: {voter} "{election}" ({ip})')
+    return redirect(reverse('society_elections:vote_submitted'))
+
+
+@require_POST
+@throttle('voter_login', json=True)
+@validate_election_period(Election.VOTING)
+def voter_login_ajax(req: HttpRequest) -> JsonResponse:
+    """Exchange a voter's uuid or password for a signed token
+
+    The token can be sent in place of the uuid or password to the other voting 
+    endpoints, which then do not need to authenticate the voter against the 
+    database.
+
+    Args:
+        req (HttpRequest): Request containing the uuid or password of a voter
+
+    Returns:
+        JsonResponse: Response containing the token and the number of seconds 
+            it is valid for, or an error
+    """
+    election = get_request_election(req)
+    ip, _ = get_client_ip(req)
+    _, authenticated = authenticate_vote_request(election, req)
+    if not authenticated:
+        logger.info(f'Voter not authorized: - "{election}" ({ip})')
+        return JsonResponse({
+            'error': 'Not authorized to vote'
+        })
+
+    voter_pk = get_voter_pk(election, req)
+    logger.debug(f'Voter logged in: {voter_pk} "{election}" ({ip})')
+    return JsonResponse({
+        'token': create_voter_token(election, voter_pk),
+        'expires_in': app_settings.VOTER_TOKEN_AGE
+    })
+
+
+@require_POST
+@throttle('ballot_submit', json=True)
+@validate_election_period(Election.VOTING)
+def submit_ballot_ajax(req: HttpRequest) -> JsonResponse:
+    """Replace all of a voter's votes with the given ballot
+
+    Every selection on the ballot is sent in one request, as a list of 
+    candidate PKs, with the candidates of ranked positions in order of 
+    preference. The ballot is validated against the positions and 
+    candidates of the election as a whole, and then any votes not on the 
+    ballot are removed and any new votes are created in a single transaction. 
+    Votes which are unchanged are kept.
+
+    Args:
+        req (HttpRequest): Request object
+
+    Returns:
+        JsonResponse: Response to user indicating success, and the positions 
+            that have not yet been voted for, or failure and error reason
+    """
+    election = get_request_election(req)
+    ip, _ = get_client_ip(req)
+    voter_pk, authenticated = authenticate_vote_request(election, req)
+    if not authenticated:
+        logger.info(f'Voter not authorized: - "{election}" ({ip})')
+        return JsonResponse({
+            'error': 'Not authorized to vote'
+        })
+
+    try:
+        candidate_pks = [int(pk) for pk in req.POST.getlist('candidate')]
+    except ValueError:
+        return JsonResponse({
+            'error': 'Candidate does not exist'
+        })
+    if len(set(candidate_pks)) != len(candidate_pks):
+        return JsonResponse({
+            'error': 'Ballot contains duplicate candidates'
+        })
+
+    candidate_positions = dict(Candidate.objects.filter(
+        pk__in=candidate_pks, position__election=election, email_verified=True
+    ).values_list('pk', 'position_id'))
+    if len(candidate_positions) != len(candidate_pks):
+        return JsonResponse({
+            'error': 'Candidate does not exist'
+        })
+    # Keep the order of the ballot, which ranks the candidates of ranked
+    # positions
+    candidate_positions = {
+        pk: candidate_positions[pk] for pk in candidate_pks
+    }
+
+    positions_available = {}
+    ranked_positions = set()
+    for position_pk, available, voting_system in ElectionPosition.objects.filter(
+        election=election
+    ).values_list('pk', 'positions_available', 'voting_system'):
+        positions_available[position_pk] = available
+        if voting_system == ElectionPosition.STV:
+            ranked_positions.add(position_pk)
+    ballot = Counter(candidate_positions.values())
+    for position_pk, votes_cast in ballot.items():
+        if (position_pk not in ranked_positions
+                and votes_cast > positions_available[position_pk]):
+            logger.warning(f'Excessive Voting: {voter_pk} "{election}" ({ip})')
+            return JsonResponse({
+                'error': 'Too many votes submitted for a position'
+            })
+
+    if voter_pk is None:
+        voter_pk = get_voter_pk(election, req)
+    try:
+        changes = replace_ballot(
+            election, voter_pk, candidate_positions, ranked_positions
+        )
+    except VotingError as e:
+        logger.warning(f'Ballot rejected: {voter_pk} "{election}" ({ip})')
+        return JsonResponse({
+            'error': str(e)
+        })
+
+    logger.info(
+        f'Ballot submitted: {voter_pk} "{election}" +{changes["added"]} '
+        f'-{changes["removed"]} ({ip})'
+    )
+    return JsonResponse({
+        'candidates': candidate_pks,
+        'missing_positions': [
+            position_pk for position_pk in positions_available
+            if position_pk not in ballot
+        ]
+    })
+
+
+@require_safe
+@validate_election_period(Election.VOTING)
+def ballot_view(req: HttpRequest) -> HttpResponse:
+    """The positions and verified candidates of the election as JSON
+
+    The ballot is served from the snapshot of this process, with an ETag and 
+    Last-Modified so that clients can revalidate their copy, receiving a 304 
+    Not Modified if the ballot has not changed.
+
+    Args:
+        req (HttpRequest): Request sent by voter
+
+    Returns:
+        HttpResponse: Response containing the ballot, or 304 Not Modified
+    """
+    snapshot = get_ballot(get_request_election(req))
+    etag = quote_etag(snapshot.version)
+    response = get_conditional_response(
+        req, etag=etag, last_modified=int(snapshot.last_modified)
+    )
+    if response is None:
+        response = HttpResponse(
+            snapshot.content, content_type='application/json'
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(snapshot.last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@method_decorator(cache_election_page, 'dispatch')
 class VoteSubmittedView(TemplateView):
     """Called when votes have been submitted successfully"""
 
@@ -135,6 +466,7 @@ class VoteSubmittedView(TemplateView):
 
 
 @require_POST
+@throttle('vote_create', json=True)
 @validate_election_period(Election.VOTING)
 def create_vote_ajax(req: HttpRequest) -> JsonResponse:
     """Create a new vote
@@ -150,17 +482,12 @@ def create_vote_ajax(req: HttpRequest) -> JsonResponse:
         JsonResponse: Repsonse to user indicating success and vote PK or 
             failure and error reason
     """
-    election = get_latest_election()
+    election = get_request_election(req)
     uuid = req.POST.get('uuid')
-    password = req.POST.get('password')
     ip, _ = get_client_ip(req)
     candidate_pk = req.POST.get('candidate')
     position_pk = req.POST.get('position')
-    try:
-        authenticated = is_request_authenticated(election, req)
-    except Http404:
-        logger.info(f'Voter 404 not found: {uuid} "{election}" ({ip})')
-        authenticated = False
+    voter_pk, authenticated = authenticate_vote_request(election, req)
     
     if not authenticated:
         logger.info(f'Voter not authorized: - "{election}" ({ip})')
@@ -178,85 +505,47 @@ def create_vote_ajax(req: HttpRequest) -> JsonResponse:
         })
 
     try:
-        candidate = get_object_or_404(
-            Candidate, position__election=election, pk=int(candidate_pk),
+        candidate: Candidate = get_object_or_404(
+            Candidate.objects.select_related('position'),
+            position__election=election, pk=int(candidate_pk),
             email_verified=True
         )
     except (Http404, ValueError):
         return JsonResponse({
             'error': 'Candidate does not exist'
         })
-    
-    # Find clashing votes - change vote if positions available is only 1
-    if election.anonymous:
-        anon_voter = AnonymousVoter.objects.get(
-            election=election, password=AnonymousVoter.hash_password(password)
-        )
-        reg_voter = None
-        voter = anon_voter
-    else:
-        reg_voter = RegisteredVoter.objects.get(
-            election=election, pk=uuid
-        )
-        anon_voter = None
-        voter = reg_voter
-
-    # Change existing vote if only one position available
-    if position.positions_available == 1:
-        try:
-            existing_vote = get_object_or_404(
-                Vote, registered_voter=reg_voter, 
-                anonymous_voter=anon_voter,
-                position=position
-            )
-        except Http404:
-            logger.debug(f'Could not find existing vote for {position}')
-        else:
-            old_candidate_pk = existing_vote.candidate.pk
-            existing_vote.candidate = candidate
-            existing_vote.vote_last_modified_at = timezone.now()
-            logger.info(f'Vote updated: {voter} "{existing_vote}" ({ip})')
-            existing_vote.save()
-            return JsonResponse({
-                'vote': str(existing_vote.pk),
-                'old_candidate': old_candidate_pk,
-                'new_candidate': candidate.pk
-            })
-    else:
-        existing_votes = Vote.objects.filter(
-            position=position, 
-            anonymous_voter=anon_voter,
-            registered_voter=reg_voter
-        )
-        existing_votes_for_candidate = existing_votes.filter(
-            candidate=candidate
+
+    if voter_pk is None:
+        voter_pk = get_voter_pk(election, req)
+    voter = voter_pk
+
+    # Changes the existing vote if only one position is available
+    try:
+        vote_pk, old_candidate_pk = cast_vote(
+            election, voter_pk, candidate.position, candidate
         )
-        if (
-            existing_votes.count() >= position.positions_available or 
-            existing_votes_for_candidate.exists()
-        ):
-            logger.warning(f'Excessive Voting: {voter} "{election}" ({ip})')
-            return JsonResponse({
-                'error': 'Already submitted votes for this position or '
-                         'candidate'
-            }) # 409 = Conflict
-    
-    # Can submit vote - no existing vote, or enough spaces left to vote
-    new_vote = Vote(
-        registered_voter=reg_voter,
-        anonymous_voter=anon_voter,
-        candidate=candidate,
-        position=candidate.position
-    )
-    new_vote.save()
-    logger.info(f'Vote created: {voter} "{new_vote}" ({ip})')
+    except VotingError as e:
+        logger.warning(f'Excessive Voting: {voter} "{election}" ({ip})')
+        return JsonResponse({
+            'error': str(e)
+        }) # 409 = Conflict
+
+    if old_candidate_pk is not None:
+        logger.info(f'Vote updated: {voter} "{vote_pk}" ({ip})')
+        return JsonResponse({
+            'vote': str(vote_pk),
+            'old_candidate': old_candidate_pk,
+            'new_candidate': candidate.pk
+        })
+    logger.info(f'Vote created: {voter} "{vote_pk}" ({ip})')
     return JsonResponse({
-        'vote': str(new_vote.pk),
+        'vote': str(vote_pk),
         'new_candidate': candidate.pk
     })
 
 
 @require_POST
+@throttle('vote_delete', json=True)
 @validate_election_period(Election.VOTING)
 def delete_vote_ajax(req: HttpRequest) -> JsonResponse:
     """Deletes a given vote from the database
@@ -267,55 +556,152 @@ def delete_vote_ajax(req: HttpRequest) -> JsonResponse:
     Returns:
         JsonResponse: Response indicating success or failure
     """
-    election = get_latest_election()
-    uuid = req.POST.get('uuid')
-    password = req.POST.get('password')
+    election = get_request_election(req)
     ip, _ = get_client_ip(req)
     candidate_pk = req.POST.get('candidate')
     position_pk = req.POST.get('position')
+    voter_pk, authenticated = authenticate_vote_request(election, req)
+    
+    if not authenticated:
+        logger.info(f'Voter not authorized: - "{election}" ({ip})')
+        return JsonResponse({
+            'error': 'Not authorized to vote'
+        })
+
+    if voter_pk is None:
+        voter_pk = get_voter_pk(election, req)
+    voter = voter_pk
 
     try:
-        authenticated = is_request_authenticated(election, req)
-    except Http404:
-        logger.info(f'Voter 404 not found: {uuid} "{election}" ({ip})')
-        authenticated = False
-    
+        vote_pk = retract_vote(
+            election, voter_pk, int(position_pk), int(candidate_pk)
+        )
+    except (VotingError, ValueError):
+        logger.warning(
+            f'Voter cannot delete vote: {voter} "{candidate_pk},'
+            f'{position_pk}" ({ip})'
+        )
+        return JsonResponse({
+            'error': 'Vote does not exist'
+        })
+    return JsonResponse({
+        'candidate': candidate_pk,
+        'vote': vote_pk
+    })
+
+
+@require_POST
+@throttle('vote_create', json=True)
+@validate_election_period(Election.VOTING)
+async def acreate_vote_ajax(req: HttpRequest) -> JsonResponse:
+    """Asynchronous version of create_vote_ajax, for deployments under ASGI
+
+    Args:
+        req (HttpRequest): Request object
+
+    Returns:
+        JsonResponse: Repsonse to user indicating success and vote PK or 
+            failure and error reason
+    """
+    election = await aget_request_election(req)
+    ip, _ = get_client_ip(req)
+    candidate_pk = req.POST.get('candidate')
+    position_pk = req.POST.get('position')
+    voter_pk, authenticated = await aauthenticate_vote_request(election, req)
+
     if not authenticated:
         logger.info(f'Voter not authorized: - "{election}" ({ip})')
         return JsonResponse({
             'error': 'Not authorized to vote'
         })
 
-    if election.anonymous:
-        anon_voter = AnonymousVoter.objects.get(
-            election=election, password=AnonymousVoter.hash_password(password)
+    try:
+        await ElectionPosition.objects.aget(
+            election=election, pk=int(position_pk)
         )
-        reg_voter = None
-        voter = anon_voter
-    else:
-        reg_voter = RegisteredVoter.objects.get(election=election, pk=uuid)
-        anon_voter = None
-        voter = reg_voter
-    
+    except (ElectionPosition.DoesNotExist, TypeError, ValueError):
+        return JsonResponse({
+            'error': 'Position does not exist',
+        })
+
     try:
-        # This also checks we can delete a vote
-        vote = get_object_or_404(
-            Vote,
-            registered_voter=reg_voter,
-            anonymous_voter=anon_voter,
-            candidate__pk=int(candidate_pk),
-            position__pk=int(position_pk)
+        candidate: Candidate = await Candidate.objects.select_related(
+            'position'
+        ).aget(
+            position__election=election, pk=int(candidate_pk),
+            email_verified=True
         )
-    except (Http404, ValueError):
+    except (Candidate.DoesNotExist, TypeError, ValueError):
+        return JsonResponse({
+            'error': 'Candidate does not exist'
+        })
+
+    if voter_pk is None:
+        voter_pk = await aget_voter_pk(election, req)
+
+    try:
+        vote_pk, old_candidate_pk = await acast_vote(
+            election, voter_pk, candidate.position, candidate
+        )
+    except VotingError as e:
+        logger.warning(f'Excessive Voting: {voter_pk} "{election}" ({ip})')
+        return JsonResponse({
+            'error': str(e)
+        })
+
+    if old_candidate_pk is not None:
+        logger.info(f'Vote updated: {voter_pk} "{vote_pk}" ({ip})')
+        return JsonResponse({
+            'vote': str(vote_pk),
+            'old_candidate': old_candidate_pk,
+            'new_candidate': candidate.pk
+        })
+    logger.info(f'Vote created: {voter_pk} "{vote_pk}" ({ip})')
+    return JsonResponse({
+        'vote': str(vote_pk),
+        'new_candidate': candidate.pk
+    })
+
+
+@require_POST
+@throttle('vote_delete', json=True)
+@validate_election_period(Election.VOTING)
+async def adelete_vote_ajax(req: HttpRequest) -> JsonResponse:
+    """Asynchronous version of delete_vote_ajax, for deployments under ASGI
+
+    Args:
+        req (HttpRequest): Request sent
+
+    Returns:
+        JsonResponse: Response indicating success or failure
+    """
+    election = await aget_request_election(req)
+    ip, _ = get_client_ip(req)
+    candidate_pk = req.POST.get('candidate')
+    position_pk = req.POST.get('position')
+    voter_pk, authenticated = await aauthenticate_vote_request(election, req)
+
+    if not authenticated:
+        logger.info(f'Voter not authorized: - "{election}" ({ip})')
+        return JsonResponse({
+            'error': 'Not authorized to vote'
+        })
+
+    if voter_pk is None:
+        voter_pk = await aget_voter_pk(election, req)
+
+    try:
+        vote_pk = await aretract_vote(
+            election, voter_pk, int(position_pk), int(candidate_pk)
+        )
+    except (VotingError, TypeError, ValueError):
         logger.warning(
-            f'Voter cannot delete vote: {voter} "{candidate_pk},'
+            f'Voter cannot delete vote: {voter_pk} "{candidate_pk},'
             f'{position_pk}" ({ip})'
         )
         return JsonResponse({
             'error': 'Vote does not exist'
         })
-    vote_pk = vote.pk
-    vote.delete()
     return JsonResponse({
         'candidate': candidate_pk,
         'vote': vote_pk
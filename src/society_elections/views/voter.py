@@ -2,7 +2,7 @@ import logging
 
 from django.contrib import messages
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
 from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -10,15 +10,15 @@ from django.utils import timezone
 from django.views.decorators.http import require_POST
 from ipware.ip import get_client_ip
 
-from .. import app_settings
 from ..forms import RegisteredVoterForm
-from ..models import AnonymousVoter, Election, RegisteredVoter
-from .decorators import validate_election_period
-from .helpers import get_latest_election, get_template
+from ..models import AnonymousVoter, Election, OutboundEmail, RegisteredVoter
+from .decorators import throttle, validate_election_period
+from .helpers import get_request_election, get_template
 
 logger = logging.getLogger(__name__)
 
 
+@throttle('voter_create')
 @validate_election_period(Election.VOTING)
 def create_voter_view(req: HttpRequest) -> HttpResponse:
     """Validates the VoterForm and creates a new voter in the DB
@@ -32,7 +32,7 @@ def create_voter_view(req: HttpRequest) -> HttpResponse:
     Raises:
         Http404: No election currently running
     """
-    election = get_latest_election()
+    election = get_request_election(req)
     if req.method == 'POST':
         form = RegisteredVoterForm(req.POST)
         if form.is_valid():
@@ -42,25 +42,27 @@ def create_voter_view(req: HttpRequest) -> HttpResponse:
                 )
             existing_voter = RegisteredVoter.objects.filter(
                 election=election, email=form.cleaned_data['email']
-            )
-            if existing_voter.exists():
+            ).first()
+            if existing_voter is not None:
                 logger.debug(
-                    f'Voter "{existing_voter[0].email}" found for this election'
+                    f'Voter "{existing_voter.email}" found for this election'
                 )
                 return render(req, get_template('voter_exists'), {
                     'election': election,
-                    'voter': existing_voter.get()
+                    'voter': existing_voter
                 })
             else:
                 # Verify email in correct domain
-                email_domain = form.cleaned_data['email'].split('@')[1]
-                domains = election.voter_email_domain_whitelist.split()
                 logger.debug(
                     f'Verifying email {form.cleaned_data["email"]} has a valid '
-                    f'domain in {domains}'
+                    'domain'
                 )
-                if email_domain not in domains:
-                    logger.debug(f'"{email_domain}" not in {domains}')
+                if not election.voter_whitelist.matches_email(
+                    form.cleaned_data['email']
+                ):
+                    logger.debug(
+                        f'"{form.cleaned_data["email"]}" not in whitelist'
+                    )
                     form.add_error('email', ValidationError(
                         'Email domain not valid for this election'
                     ))
@@ -69,7 +71,18 @@ def create_voter_view(req: HttpRequest) -> HttpResponse:
                     logger.debug(f'Email {form.cleaned_data["email"]} valid!')
                     voter: RegisteredVoter = form.save(commit=False)
                     voter.election = election
-                    voter.save()
+                    try:
+                        with transaction.atomic():
+                            voter.save()
+                    except IntegrityError:
+                        # Registered by a concurrent request since the check
+                        logger.debug(f'Voter "{voter.email}" already exists')
+                        return render(req, get_template('voter_exists'), {
+                            'election': election,
+                            'voter': RegisteredVoter.objects.get(
+                                election=election, email=voter.email
+                            )
+                        })
                     voter.send_verification_email()
                     return render(
                         req, get_template('voter_verification_sent'), {
@@ -99,7 +112,7 @@ def verify_voter_view(req: HttpRequest) -> HttpResponse:
         HttpResponse: response to user
     """
     uuid = req.GET.get('uuid').lower()
-    election = get_latest_election()
+    election = get_request_election(req)
     ip = get_client_ip(req)
     try:
         voter = get_object_or_404(RegisteredVoter, pk=uuid, election=election)
@@ -124,18 +137,10 @@ def verify_voter_view(req: HttpRequest) -> HttpResponse:
             anon_voter.password = AnonymousVoter.hash_password(password)
             anon_voter.save()
             logger.debug('Anonymous voter created, emailing password to user')
-            message = f'''<p>You have successfully verified your email to vote in the election "{voter.election}"". Your password to vote is shown below. Keep it safe and confidential as it identifies you as a voter.<p>
-            <p><b>{password}<b><p>
-            <p><a href="{app_settings.ROOT_URL}{reverse('society_elections:vote')}">Click here</a> to vote, or copy and paste the following link into your browser: <code>{app_settings.ROOT_URL}{reverse('society_elections:vote')}</code></p>
-            '''
-            send_mail(
-                subject=f'Voting password for election {voter.election}',
-                message=message,
-                from_email=None,
-                recipient_list=[voter.email,],
-                html_message=message
-            )
-            logger.debug('Password email sent, returning template')
+            OutboundEmail.queue_many([AnonymousVoter.build_password_email(
+                voter.election, voter.email, password
+            )])
+            logger.debug('Password email queued, returning template')
             return render(req, get_template('voter_verified_anon_election'), {
                 'password': password,
                 'election': election
@@ -161,6 +166,7 @@ def verify_voter_view(req: HttpRequest) -> HttpResponse:
 
 
 @require_POST
+@throttle('voter_resend_verification')
 @validate_election_period(Election.VOTING)
 def resend_voter_verification(req: HttpRequest) -> HttpResponse:
     """Resends the verification email for a given RegisteredVoter
@@ -176,7 +182,7 @@ def resend_voter_verification(req: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse: Response to user
     """
-    election = get_latest_election()
+    election = get_request_election(req)
     email = req.POST.get('email')
     uuid = req.POST.get('uuid')
     ip = get_client_ip(req)
@@ -0,0 +1,315 @@
+"""Casts, changes, and removes votes
+
+Every change to a voter's votes takes place in a transaction which first locks
+the voter's row, so concurrent requests from the same voter are serialized.
+The unique constraints on Vote guarantee that a voter never holds more than
+positions_available seats in a position, or votes for a candidate twice, even
+if the lock is not available (e.g. on SQLite, which locks the whole database
+instead).
+
+The async ORM cannot run transactions, so the asynchronous versions of these
+functions run the synchronous versions in a thread.
+"""
+import logging
+from collections import Counter
+from typing import Collection, Dict, NamedTuple, Optional, Tuple, Union
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+
+from .models import (AnonymousVoter, Candidate, Election, ElectionPosition,
+                     RegisteredVoter, Vote, VoteTally)
+
+logger = logging.getLogger(__name__)
+
+VoterPK = Union[UUID, int, str]
+
+
+class VotingError(Exception):
+    """Raised when a vote cannot be cast, changed, or removed
+
+    The message of the exception is suitable to show to the voter.
+    """
+
+
+class CastVote(NamedTuple):
+    """The result of casting a vote
+
+    Attributes:
+        vote_pk (int): Primary key of the vote cast
+        old_candidate_pk (int): Primary key of the candidate previously voted
+            for, if the vote replaced an existing vote
+    """
+    vote_pk: int
+    old_candidate_pk: Optional[int]
+
+
+def voter_fields(election: Election, voter_pk: VoterPK) -> Dict[str, VoterPK]:
+    """Get the Vote fields identifying a voter in an election
+
+    Args:
+        election (Election): Election the voter is voting in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or
+            AnonymousVoter
+
+    Returns:
+        dict: Values of election_id, registered_voter_id and
+            anonymous_voter_id
+    """
+    if election.anonymous:
+        return {
+            'election_id': election.pk,
+            'registered_voter_id': None,
+            'anonymous_voter_id': voter_pk
+        }
+    else:
+        return {
+            'election_id': election.pk,
+            'registered_voter_id': voter_pk,
+            'anonymous_voter_id': None
+        }
+
+
+def lock_voter(election: Election, voter_pk: VoterPK) -> None:
+    """Lock the row of a voter until the end of the current transaction
+
+    Args:
+        election (Election): Election the voter is voting in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or
+            AnonymousVoter
+
+    Raises:
+        VotingError: The voter does not exist in the election
+    """
+    model = AnonymousVoter if election.anonymous else RegisteredVoter
+    locked = model.objects.select_for_update().filter(
+        election=election, pk=voter_pk
+    ).values_list('pk', flat=True)
+    if not list(locked):
+        raise VotingError('Not authorized to vote')
+
+
+def cast_vote(
+    election: Election,
+    voter_pk: VoterPK,
+    position: ElectionPosition,
+    candidate: Candidate
+) -> CastVote:
+    """Cast a vote for a candidate
+
+    In single seat positions, the voter's existing vote is replaced using an
+    UPSERT on the seat. Otherwise the vote takes the voter's first free seat.
+    In ranked positions, the vote is instead ranked below the voter's existing
+    preferences, and voters may rank any number of candidates.
+
+    Args:
+        election (Election): Election being voted in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or
+            AnonymousVoter voting
+        position (ElectionPosition): Position being voted for
+        candidate (Candidate): Candidate being voted for
+
+    Raises:
+        VotingError: The voter does not exist, or has no seats left to vote
+            with or has already voted for the candidate
+
+    Returns:
+        CastVote: The vote cast, and the candidate it replaced
+    """
+    voter = voter_fields(election, voter_pk)
+    voter_field = 'anonymous_voter' if election.anonymous else 'registered_voter'
+    with transaction.atomic():
+        lock_voter(election, voter_pk)
+        existing = dict(Vote.objects.filter(
+            position=position, **voter
+        ).values_list('seat', 'candidate_id'))
+
+        if position.positions_available == 1 and not position.is_ranked:
+            old_candidate_pk = existing.get(0)
+            Vote.objects.bulk_create([
+                Vote(position=position, candidate=candidate, seat=0, **voter)
+            ],
+                update_conflicts=True,
+                unique_fields=['position', voter_field, 'seat'],
+                update_fields=['candidate', 'vote_last_modified_at']
+            )
+            vote_pk = Vote.objects.values_list('pk', flat=True).get(
+                position=position, seat=0, **voter
+            )
+        else:
+            old_candidate_pk = None
+            if position.is_ranked:
+                seat = max(existing, default=-1) + 1
+            else:
+                free_seats = set(range(position.positions_available)) - set(
+                    existing
+                )
+                seat = min(free_seats, default=None)
+            if candidate.pk in existing.values() or seat is None:
+                raise VotingError(
+                    'Already submitted votes for this position or candidate'
+                )
+            try:
+                with transaction.atomic():
+                    vote_pk = Vote.objects.create(
+                        position=position, candidate=candidate, seat=seat,
+                        **voter
+                    ).pk
+            except IntegrityError:
+                raise VotingError(
+                    'Already submitted votes for this position or candidate'
+                )
+
+        if old_candidate_pk != candidate.pk:
+            if old_candidate_pk is not None:
+                VoteTally.increment(position.pk, old_candidate_pk, -1)
+            VoteTally.increment(position.pk, candidate.pk)
+    return CastVote(vote_pk, old_candidate_pk)
+
+
+async def acast_vote(
+    election: Election,
+    voter_pk: VoterPK,
+    position: ElectionPosition,
+    candidate: Candidate
+) -> CastVote:
+    """Asynchronous version of cast_vote"""
+    return await sync_to_async(cast_vote)(
+        election, voter_pk, position, candidate
+    )
+
+
+def retract_vote(
+    election: Election,
+    voter_pk: VoterPK,
+    position_pk: int,
+    candidate_pk: int
+) -> int:
+    """Remove a voter's vote for a candidate
+
+    Args:
+        election (Election): Election being voted in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or
+            AnonymousVoter voting
+        position_pk (int): Primary key of the position voted for
+        candidate_pk (int): Primary key of the candidate voted for
+
+    Raises:
+        VotingError: The voter or vote does not exist
+
+    Returns:
+        int: Primary key of the vote removed
+    """
+    with transaction.atomic():
+        lock_voter(election, voter_pk)
+        vote = Vote.objects.filter(
+            position_id=position_pk,
+            candidate_id=candidate_pk,
+            **voter_fields(election, voter_pk)
+        ).first()
+        if vote is None:
+            raise VotingError('Vote does not exist')
+        vote_pk = vote.pk
+        vote.delete()
+        VoteTally.increment(position_pk, candidate_pk, -1)
+    return vote_pk
+
+
+async def aretract_vote(
+    election: Election,
+    voter_pk: VoterPK,
+    position_pk: int,
+    candidate_pk: int
+) -> int:
+    """Asynchronous version of retract_vote"""
+    return await sync_to_async(retract_vote)(
+        election, voter_pk, position_pk, candidate_pk
+    )
+
+
+def replace_ballot(
+    election: Election,
+    voter_pk: VoterPK,
+    ballot: Dict[int, int],
+    ranked_positions: Collection[int]=()
+) -> Dict[str, int]:
+    """Replace all of a voter's votes in an election
+
+    Votes which are not on the ballot are removed, and votes on the ballot
+    which the voter has not yet cast are created with a single bulk_create.
+    The ballot must already have been validated against the positions and
+    candidates of the election.
+
+    In ranked positions, the candidates are ranked in the order they appear
+    on the ballot. Votes whose rank has changed are removed and cast again.
+
+    Args:
+        election (Election): Election being voted in
+        voter_pk (UUID or int): Primary key of the RegisteredVoter or
+            AnonymousVoter voting
+        ballot (dict): Mapping of the PK of every candidate voted for to the
+            PK of their position, in order of preference
+        ranked_positions (Collection, optional): PKs of the positions in which
+            candidates are ranked. Defaults to none.
+
+    Raises:
+        VotingError: The voter does not exist, or the ballot conflicts with
+            votes being cast concurrently
+
+    Returns:
+        dict: Number of votes 'added' and 'removed'
+    """
+    ranks: Dict[int, int] = {}
+    ranked = Counter()
+    for candidate_pk, position_pk in ballot.items():
+        if position_pk in ranked_positions:
+            ranks[candidate_pk] = ranked[position_pk]
+            ranked[position_pk] += 1
+
+    voter = voter_fields(election, voter_pk)
+    with transaction.atomic():
+        lock_voter(election, voter_pk)
+        existing_votes = Vote.objects.filter(**voter)
+        existing = {}
+        removed = {}
+        for candidate_pk, position_pk, seat in existing_votes.values_list(
+            'candidate_id', 'position_id', 'seat'
+        ):
+            if candidate_pk in ballot and ranks.get(candidate_pk, seat) == seat:
+                existing[candidate_pk] = (position_pk, seat)
+            else:
+                removed[candidate_pk] = position_pk
+        taken_seats = set(existing.values())
+        added = []
+        for candidate_pk, position_pk in ballot.items():
+            if candidate_pk in existing:
+                continue
+            seat = ranks.get(candidate_pk, 0)
+            while (position_pk, seat) in taken_seats:
+                seat += 1
+            taken_seats.add((position_pk, seat))
+            added.append(Vote(
+                candidate_id=candidate_pk,
+                position_id=position_pk,
+                seat=seat,
+                **voter
+            ))
+
+        if removed:
+            existing_votes.filter(candidate_id__in=removed).delete()
+        try:
+            with transaction.atomic():
+                Vote.objects.bulk_create(added)
+        except IntegrityError:
+            raise VotingError('Ballot conflicts with existing votes')
+        amounts: Dict[Tuple[int, int], int] = {}
+        for candidate_pk, position_pk in removed.items():
+            if candidate_pk is not None:
+                key = (position_pk, candidate_pk)
+                amounts[key] = amounts.get(key, 0) - 1
+        for vote in added:
+            key = (vote.position_id, vote.candidate_id)
+            amounts[key] = amounts.get(key, 0) + 1
+        VoteTally.increment_many(amounts)
+    return {'added': len(added), 'removed': len(removed)}
@@ -0,0 +1,84 @@
+"""Matches email domains against the whitelists of elections
+
+A whitelist is a newline (or whitespace) delimited list of domains. An entry
+matches that domain exactly, unless it starts with "*.", in which case it
+matches any subdomain of the rest of the entry, e.g. "*.example.ac.uk"
+matches "cs.example.ac.uk" and "maths.dept.example.ac.uk", but not
+"example.ac.uk" itself. Domains are matched case-insensitively.
+
+Whitelists are compiled into sets once per process, keyed by their text, so
+a whitelist which has been edited is compiled again on its next use.
+"""
+import functools
+from typing import FrozenSet, NamedTuple, Optional
+
+WILDCARD = '*.'
+
+
+class DomainWhitelist(NamedTuple):
+    """A compiled whitelist
+
+    Attributes:
+        domains (frozenset): Domains matched exactly
+        suffixes (frozenset): Domains whose subdomains are matched
+    """
+    domains: FrozenSet[str]
+    suffixes: FrozenSet[str]
+
+    def matches(self, domain: str) -> bool:
+        """Check whether a domain is whitelisted
+
+        Takes a set lookup for the domain and for each domain it is a
+        subdomain of.
+
+        Args:
+            domain (str): Domain to check
+
+        Returns:
+            bool: True if the domain is whitelisted
+        """
+        domain = domain.lower()
+        if domain in self.domains:
+            return True
+        if not self.suffixes:
+            return False
+        dot = domain.find('.')
+        while dot != -1:
+            if domain[dot + 1:] in self.suffixes:
+                return True
+            dot = domain.find('.', dot + 1)
+        return False
+
+    def matches_email(self, email: str) -> bool:
+        """Check whether the domain of an email is whitelisted
+
+        Args:
+            email (str): Email address to check
+
+        Returns:
+            bool: True if the email has a domain which is whitelisted
+        """
+        _, at, domain = email.rpartition('@')
+        return bool(at) and self.matches(domain)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_whitelist(whitelist: Optional[str]) -> DomainWhitelist:
+    """Compile the text of a whitelist
+
+    An empty whitelist matches no domains.
+
+    Args:
+        whitelist (str): Whitespace delimited domains, or None
+
+    Returns:
+        DomainWhitelist: The compiled whitelist
+    """
+    domains = set()
+    suffixes = set()
+    for entry in (whitelist or '').lower().split():
+        if entry.startswith(WILDCARD):
+            suffixes.add(entry[len(WILDCARD):])
+        else:
+            domains.add(entry)
+    return DomainWhitelist(frozenset(domains), frozenset(suffixes))